@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+# Register your models here.
+from .models import AuditLog
+
+
+@admin.register(AuditLog)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ('id', 'action', 'entity', 'entity_id', 'user', 'ip', 'created_at')
+    list_filter = ('action', 'entity')
+    search_fields = ('entity_id',)
+    raw_id_fields = ('user',)
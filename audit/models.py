@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class AuditLog(models.Model):
+    """
+    One change made from the backoffice (who, what, when and from where).
+
+    `old_data` / `new_data` keep only the fields that changed, e.g.
+    {"price": 1500.0} -> {"price": 1800.0}.
+    """
+    ACTION_PRODUCT_UPDATE = 'product_update'
+    ACTION_PRODUCT_BULK_UPDATE = 'product_bulk_update'
+
+    ACTION_CHOICES = [
+        (ACTION_PRODUCT_UPDATE, 'Product update'),
+        (ACTION_PRODUCT_BULK_UPDATE, 'Product bulk update'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='audit_logs'
+    )
+    action = models.CharField(max_length=32, choices=ACTION_CHOICES)
+    entity = models.CharField(max_length=32, help_text="Audited model, e.g. 'product'.")
+    entity_id = models.BigIntegerField()
+
+    old_data = models.JSONField(null=True, blank=True)
+    new_data = models.JSONField(null=True, blank=True)
+    ip = models.GenericIPAddressField(null=True, blank=True)
+    # hora del evento, no del INSERT (las filas se escriben por lotes, ver audit_buffer)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['entity', 'entity_id', '-created_at']),
+            models.Index(fields=['-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity}:{self.entity_id} by {self.user_id}"
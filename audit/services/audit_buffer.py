@@ -0,0 +1,183 @@
+# audit/services/audit_buffer.py
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+
+from audit.models import AuditLog
+
+logger = logging.getLogger(__name__)
+# filas que no se pueden guardar nunca (datos invalidos): quedan en el log, no se reintentan
+dead_letter_logger = logging.getLogger('audit.dead_letter')
+
+# errores de conexion/base caida: la fila esta bien, se reintenta en el proximo flush
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+class AuditBuffer:
+    """
+    In-process buffer of audit rows, written with `bulk_create` by a
+    background thread every `flush_size` rows or `flush_interval_ms`,
+    whichever comes first. The request that records an event only appends
+    to a list, its latency does not depend on the audit volume.
+
+    - Rows are queued on commit of the surrounding transaction (a rolled
+      back edit is not audited, as with the synchronous INSERT).
+    - On a normal interpreter exit (runserver, gunicorn graceful shutdown,
+      management commands) `atexit` stops the thread and flushes what is
+      left. A hard kill (SIGKILL, OOM) loses at most the last interval.
+    - If the database cannot be reached the rows go back to the buffer and
+      are retried on the next flush; past `max_pending` the oldest are
+      dropped and logged.
+    - Any other INSERT error means bad data: the batch is split in halves
+      until the failing rows are isolated, the rest is written and each
+      failing row goes to the `audit.dead_letter` logger (never re-queued).
+
+    Settings (optional): AUDIT_FLUSH_SIZE, AUDIT_FLUSH_INTERVAL_MS,
+    AUDIT_MAX_PENDING and AUDIT_ASYNC (False = plain bulk_create on commit).
+    """
+
+    FLUSH_SIZE = 500
+    FLUSH_INTERVAL_MS = 500
+    MAX_PENDING = 100_000
+    BATCH_SIZE = 5000   # filas por INSERT
+
+    def __init__(self, *, flush_size: int, flush_interval_ms: int, max_pending: int):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+
+        self._pending: list[AuditLog] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()    # un solo bulk_create a la vez
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._pid = None
+
+    def add(self, logs: list[AuditLog]) -> None:
+        """ Queue the rows once the current transaction commits (right away in autocommit). """
+        if not logs:
+            return
+        if not getattr(settings, 'AUDIT_ASYNC', True):
+            transaction.on_commit(lambda: AuditLog.objects.bulk_create(logs, batch_size=AuditBuffer.BATCH_SIZE))
+        else:
+            transaction.on_commit(lambda: self._append(logs))
+
+    def flush(self) -> int:
+        """
+        Write the pending rows now, from the calling thread.
+
+        Returns:
+            int: Rows written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                logs, self._pending = self._pending, []
+            if not logs:
+                return 0
+
+            written = 0
+            chunks = [logs]   # pila: mitades de los lotes que fallan, en orden
+            while chunks:
+                chunk = chunks.pop()
+                try:
+                    AuditLog.objects.bulk_create(chunk, batch_size=AuditBuffer.BATCH_SIZE)
+                except TRANSIENT_ERRORS:
+                    retry = [log for part in (chunk, *reversed(chunks)) for log in part]
+                    logger.exception("[AUDIT] no se pudieron guardar %s filas, se reintenta", len(retry))
+                    with self._lock:
+                        self._pending = retry + self._pending
+                        self._trim()
+                    break
+                except Exception:
+                    if len(chunk) == 1:
+                        logger.exception("[AUDIT] fila invalida, se descarta (ver audit.dead_letter)")
+                        self._dead_letter(chunk[0])
+                        continue
+                    middle = len(chunk) // 2
+                    chunks += [chunk[middle:], chunk[:middle]]
+                else:
+                    written += len(chunk)
+            return written
+
+    def stop(self) -> None:
+        """ Stop the thread and flush the rows left (registered with atexit). """
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    # -------------------- private methods
+    def _append(self, logs: list[AuditLog]) -> None:
+        self._ensure_thread()
+        with self._lock:
+            self._pending.extend(logs)
+            self._trim()
+            full = len(self._pending) >= self.flush_size
+        if full:
+            self._wakeup.set()
+
+    @staticmethod
+    def _dead_letter(log: AuditLog) -> None:
+        dead_letter_logger.error(json.dumps({
+            "user_id": log.user_id,
+            "action": log.action,
+            "entity": log.entity,
+            "entity_id": log.entity_id,
+            "old_data": log.old_data,
+            "new_data": log.new_data,
+            "ip": log.ip,
+            "created_at": log.created_at,
+        }, default=str))
+
+    def _trim(self) -> None:
+        extra = len(self._pending) - self.max_pending
+        if extra > 0:
+            logger.error("[AUDIT] buffer lleno, se descartan %s filas", extra)
+            del self._pending[:extra]
+
+    def _ensure_thread(self) -> None:
+        # despues de un fork (gunicorn --preload) el hilo del padre no existe en el hijo
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid not in (None, os.getpid()):
+                self._pending = []    # filas del padre: las escribe el padre
+            self._pid = os.getpid()
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audit-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            started = time.monotonic()
+            close_old_connections()
+            try:
+                written = self.flush()
+            finally:
+                close_old_connections()
+            if written:
+                logger.debug("[AUDIT] %s filas en %.1f ms", written, (time.monotonic() - started) * 1000)
+
+
+audit_buffer = AuditBuffer(
+    flush_size=getattr(settings, 'AUDIT_FLUSH_SIZE', AuditBuffer.FLUSH_SIZE),
+    flush_interval_ms=getattr(settings, 'AUDIT_FLUSH_INTERVAL_MS', AuditBuffer.FLUSH_INTERVAL_MS),
+    max_pending=getattr(settings, 'AUDIT_MAX_PENDING', AuditBuffer.MAX_PENDING),
+)
+atexit.register(audit_buffer.stop)
@@ -0,0 +1,78 @@
+# audit/services/audit_service.py
+from typing import Any
+
+from audit.models import AuditLog
+from audit.services.audit_buffer import audit_buffer
+
+
+class AuditService:
+    """
+    Records the audit trail of backoffice changes.
+
+    Rows are not inserted by the caller: they are handed to `audit_buffer`
+    on commit and written with batched INSERTs by a background thread (see
+    audit/services/audit_buffer.py).
+    """
+
+    @staticmethod
+    def log_generic_product_update(
+        *, user, product, old_data: dict | None = None, new_data: dict | None = None, ip: str | None = None
+    ) -> AuditLog:
+        """
+        Log one change of a product (queued, the row is written by the buffer).
+
+        Args:
+            user (CustomUser): User that made the change.
+            product (Product): Changed product (only `id` is used).
+            old_data (dict | None): Previous values of the changed fields.
+            new_data (dict | None): New values.
+            ip (str | None): Client ip.
+        """
+        log = AuditLog(
+            user=user if getattr(user, 'is_authenticated', False) else None,
+            action=AuditLog.ACTION_PRODUCT_UPDATE,
+            entity='product',
+            entity_id=product.id,
+            old_data=old_data,
+            new_data=new_data,
+            ip=ip,
+        )
+        audit_buffer.add([log])
+        return log
+
+    @staticmethod
+    def log_product_bulk_update(
+        *, user, changes: list[tuple[int, dict, dict]], ip: str | None = None
+    ) -> int:
+        """
+        Log the changes of many products; the buffer writes them with batched
+        INSERTs instead of one query per product and field.
+
+        Args:
+            changes (list[tuple[int, dict, dict]]): (product_id, old_data, new_data).
+
+        Returns:
+            int: Rows queued.
+        """
+        user = user if getattr(user, 'is_authenticated', False) else None
+        logs = [
+            AuditLog(
+                user=user,
+                action=AuditLog.ACTION_PRODUCT_BULK_UPDATE,
+                entity='product',
+                entity_id=product_id,
+                old_data=_json_safe(old_data),
+                new_data=_json_safe(new_data),
+                ip=ip,
+            )
+            for product_id, old_data, new_data in changes
+        ]
+        audit_buffer.add(logs)
+        return len(logs)
+
+
+def _json_safe(data: dict | None) -> dict[str, Any] | None:
+    """ Decimal -> float, como los logs individuales ({"price": 1500.0}). """
+    if data is None:
+        return None
+    return {key: float(value) if hasattr(value, 'as_tuple') else value for key, value in data.items()}
@@ -0,0 +1,93 @@
+import json
+import time
+from unittest import mock
+
+from django.db import OperationalError, transaction
+from django.test import TransactionTestCase, override_settings
+
+from audit.models import AuditLog
+from audit.services.audit_buffer import AuditBuffer
+from audit.services.audit_service import AuditService
+
+
+def _log(entity_id: int) -> AuditLog:
+    return AuditLog(action=AuditLog.ACTION_PRODUCT_UPDATE, entity='product', entity_id=entity_id)
+
+
+# TransactionTestCase: on_commit y el hilo de flush necesitan commits reales
+class AuditBufferTest(TransactionTestCase):
+
+    def setUp(self):
+        self.buffer = AuditBuffer(flush_size=3, flush_interval_ms=50, max_pending=10)
+
+    def tearDown(self):
+        self.buffer.stop()
+
+    def test_flush_by_size_and_interval(self):
+        self.buffer.add([_log(1), _log(2), _log(3)])
+        self._wait_for(3)
+
+        self.buffer.add([_log(4)])   # debajo de flush_size: lo escribe el intervalo
+        self._wait_for(4)
+        self.assertEqual(self.buffer.pending(), 0)
+
+    def test_stop_flushes_pending_rows(self):
+        buffer = AuditBuffer(flush_size=100, flush_interval_ms=60_000, max_pending=1000)
+        buffer.add([_log(i) for i in range(5)])
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+        buffer.stop()
+        self.assertEqual(AuditLog.objects.count(), 5)
+
+    def test_rolled_back_changes_are_not_logged(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.buffer.add([_log(1)])
+                raise RuntimeError
+        self.assertEqual(self.buffer.pending(), 0)
+
+    def test_event_time_is_kept(self):
+        log = _log(1)
+        self.buffer.add([log])
+        self._wait_for(1)
+        self.assertEqual(AuditLog.objects.get().created_at, log.created_at)
+
+    @override_settings(AUDIT_ASYNC=False)
+    def test_sync_mode_writes_on_commit(self):
+        with transaction.atomic():
+            AuditService.log_product_bulk_update(user=None, changes=[(1, {"price": 1}, {"price": 2})])
+            self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(AuditLog.objects.get().new_data, {"price": 2})
+
+    def test_bad_rows_are_isolated_and_dead_lettered(self):
+        buffer = AuditBuffer(flush_size=100, flush_interval_ms=60_000, max_pending=1000)
+        bad = _log(3)
+        bad.entity = "x" * 40   # no entra en la columna: DataError en cada intento
+        buffer.add([_log(1), _log(2), bad, _log(4), _log(5)])
+
+        with self.assertLogs("audit.dead_letter", level="ERROR") as dead:
+            written = buffer.flush()
+        buffer.stop()
+
+        self.assertEqual(written, 4)
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(sorted(AuditLog.objects.values_list("entity_id", flat=True)), [1, 2, 4, 5])
+        self.assertEqual(len(dead.records), 1)
+        self.assertEqual(json.loads(dead.records[0].getMessage())["entity_id"], 3)
+
+    def test_unreachable_database_requeues_the_rows(self):
+        buffer = AuditBuffer(flush_size=100, flush_interval_ms=60_000, max_pending=1000)
+        buffer.add([_log(i) for i in range(3)])
+
+        with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=OperationalError):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.pending(), 3)
+
+        buffer.stop()
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def _wait_for(self, count: int, timeout: float = 2.0):
+        deadline = time.monotonic() + timeout
+        while AuditLog.objects.count() < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(AuditLog.objects.count(), count)
@@ -1,3 +1,11 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import StoredImage
+
+
+@admin.register(StoredImage)
+class StoredImageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'content_hash', 'url', 'ext', 'size', 'variants_ready', 'created_at')
+    search_fields = ('content_hash', 'url')
+    readonly_fields = ('content_hash', 'path', 'ext', 'size', 'created_at')
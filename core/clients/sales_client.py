@@ -0,0 +1,34 @@
+
+from typing import Iterable
+
+
+class SalesClient:
+    """
+    Client for interacting with the sales dashboard module (dashboard_sales).
+    Lets the orders app keep the sales rollups in sync without depending on it.
+    Delegates the actual work to SalesRollupService.
+    """
+
+    @staticmethod
+    def on_orders_status_change(order_ids: Iterable[int], status_id: int) -> None:
+        """
+        Moves the rolled up sales of the given orders to their new status.
+
+        Must be called inside the transaction that updates `Order.status_id`,
+        before the UPDATE runs.
+
+        Args:
+            order_ids (Iterable[int]): Orders that are changing status.
+            status_id (int): New StatusOrder id.
+        """
+        try:
+            # Lazy import to avoid circular dependencies and optional dependency
+            from dashboard_sales.services.rollups import SalesRollupService
+        except ImportError as e:
+            # Log module unavailability for debugging purposes
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning(f"Sales dashboard module not available: {e}")
+            return
+
+        SalesRollupService.move_orders_status(order_ids=order_ids, status_id=status_id)
@@ -0,0 +1,80 @@
+import random
+import time
+
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from core.utils.utils_image import validate_and_prepare_image
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de la validacion de imagenes: compara el camino anterior "
+        "(verify() + reabrir + re-encodear) contra la validacion por header. "
+        "Genera las imagenes en memoria, no usa la base de datos ni el storage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--width', type=int, default=4000)
+        parser.add_argument('--height', type=int, default=3000)
+        parser.add_argument('--rounds', type=int, default=5, help="Validaciones por formato.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        size = (options['width'], options['height'])
+        rounds = options['rounds']
+        samples = _make_samples(size, options['seed'])
+
+        self.stdout.write(f"{size[0]}x{size[1]} px, {rounds} validaciones por formato")
+        for ext, data in samples.items():
+            # content_type generico: es el caso que antes forzaba decode + encode
+            def upload():
+                return SimpleUploadedFile(f"foto.{ext}", data, content_type="application/octet-stream")
+
+            legacy = self._run(lambda: _legacy_validate(upload()), rounds)
+            header = self._run(lambda: validate_and_prepare_image(upload()), rounds)
+            decode = self._run(lambda: Image.open(BytesIO(data)).load(), rounds)
+
+            self.stdout.write(f"  {ext} ({len(data) / 1024 / 1024:.1f} MB)")
+            self.stdout.write(f"    legacy (verify + re-encode)    : {legacy * 1000 / rounds:9.2f} ms")
+            self.stdout.write(f"    header                         : {header * 1000 / rounds:9.2f} ms")
+            self.stdout.write(f"    decode (variantes, background) : {decode * 1000 / rounds:9.2f} ms")
+            self.stdout.write(self.style.SUCCESS(f"    speedup en el request: {legacy / header:.0f}x"))
+
+    @staticmethod
+    def _run(func, rounds: int) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return time.perf_counter() - start
+
+
+def _make_samples(size: tuple[int, int], seed: int) -> dict[str, bytes]:
+    """ PNG y JPEG 'fotograficos': ruido sobre un degradado (no comprimen trivialmente). """
+    rng = random.Random(seed)
+    noise = Image.frombytes("L", size, rng.randbytes(size[0] * size[1]))
+    gradient = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", (gradient, noise, Image.blend(gradient, noise, 0.5)))
+
+    samples = {}
+    for ext, pil_format in (("png", "PNG"), ("jpg", "JPEG")):
+        buffer = BytesIO()
+        image.save(buffer, format=pil_format, **({"quality": 90} if pil_format == "JPEG" else {}))
+        samples[ext] = buffer.getvalue()
+    return samples
+
+
+def _legacy_validate(file):
+    """ Camino previo de validate_and_prepare_image para content_type no 'image/*'. """
+    ext = file.name.rsplit('.', 1)[-1].lower()
+    img = Image.open(file)
+    img.verify()
+    output = BytesIO()
+    file.seek(0)
+    img = Image.open(file)
+    img.save(output, format='JPEG' if ext in ('jpg', 'jpeg') else ext.upper())
+    output.seek(0)
+    return output, f"image/{ext}"
@@ -0,0 +1,64 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.models import StoredImage
+from core.utils.image_variants import generate_variants, mark_variants_ready
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera las variantes (thumb, card, detail en webp + jpg) de las imagenes subidas "
+        "que todavia no las tienen (variants_ready=False) y las marca como listas. "
+        "Sirve para las subidas anteriores al flag y para reintentar las que fallaron. "
+        "Las imagenes externas (ImgBB) no tienen variantes y se ignoran."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help="Imagenes por consulta.")
+        parser.add_argument('--workers', type=int, default=2, help="Hilos generando variantes.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo cuenta las imagenes pendientes.")
+
+    def handle(self, *args, **options):
+        pending = StoredImage.objects.filter(variants_ready=False).exclude(path='')
+        total = pending.count()
+        if options['dry_run'] or not total:
+            self.stdout.write(f"{total} imagenes sin variantes.")
+            return
+
+        started = time.perf_counter()
+        done = failed = 0
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                batch = list(
+                    pending.filter(id__gt=last_id).order_by('id').values_list('id', 'path')[:options['batch_size']]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1][0]
+
+                # Pillow en los hilos, el UPDATE del flag en el hilo principal
+                for path, error in pool.map(self._generate, [path for _, path in batch]):
+                    if error:
+                        failed += 1
+                        self.stderr.write(f"{path}: {error!r}")
+                        continue
+                    mark_variants_ready(path)
+                    done += 1
+
+                self.stdout.write(f"{done + failed}/{total} ({done / (time.perf_counter() - started):.1f} img/s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{done} imagenes con variantes, {failed} con error, en {time.perf_counter() - started:.1f}s"
+        ))
+
+    @staticmethod
+    def _generate(path: str) -> tuple[str, Exception | None]:
+        try:
+            generate_variants(path)
+            return path, None
+        except Exception as e:   # archivo borrado, imagen corrupta, etc: se sigue con el resto
+            return path, e
@@ -0,0 +1,498 @@
+import random
+import time
+
+from array import array
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from django.utils.text import slugify
+
+from cart.models import Cart, CartItem
+from favorites.models import FavoriteProduct
+from orders.enums import StatusOrderEnum
+from orders.models import ItemOrder, Order, PaymentMethod, ShipmentMethod, ShipmentOrder, StatusOrder
+from orders.services.pricing import OrderPricingService
+from orders.services.snapshots import OrderSnapshotService
+from orders.services.status_transitions import OrderStatusTransitionService
+from products.data.load_orders import load_orders_init
+from products.models.brand import Brand
+from products.models.category import Category
+from products.models.product import Product
+from products.models.subcategory import Subcategory
+from products.services.search_index import SearchIndexService
+from users.models import CustomUser
+
+from core.utils.utils_basic import normalize_or_None
+
+
+SKU_PREFIX = 'SYN-'
+SLUG_PREFIX = 'syn-'
+EMAIL_DOMAIN = 'synthetic.test'
+CENT = Decimal('0.01')
+POOL_SIZE = 50_000      # productos que se venden en las órdenes (los más "populares")
+
+# categoría -> [(subcategoría, sustantivo del producto)]
+CATALOG = {
+    'Periféricos': [('Mouses', 'Mouse'), ('Teclados', 'Teclado'), ('Mousepads', 'Mousepad'), ('Joysticks', 'Joystick')],
+    'Audio': [('Auriculares', 'Auricular'), ('Parlantes', 'Parlante'), ('Micrófonos', 'Micrófono')],
+    'Monitores': [('Monitores Gamer', 'Monitor'), ('Soportes', 'Soporte'), ('Proyectores', 'Proyector')],
+    'Componentes': [('Placas de Video', 'Placa de Video'), ('Procesadores', 'Procesador'),
+                    ('Motherboards', 'Motherboard'), ('Memorias RAM', 'Memoria RAM'), ('Fuentes', 'Fuente')],
+    'Almacenamiento': [('Discos SSD', 'Disco SSD'), ('Discos Rígidos', 'Disco Rígido'), ('Pendrives', 'Pendrive')],
+    'Redes': [('Routers', 'Router'), ('Placas WiFi', 'Placa WiFi'), ('Switches', 'Switch')],
+    'Sillas Gamer': [('Sillas', 'Silla'), ('Escritorios', 'Escritorio')],
+    'Consolas': [('Consolas', 'Consola'), ('Controles', 'Control'), ('Juegos', 'Juego')],
+    'Notebooks': [('Notebooks Gamer', 'Notebook'), ('Fundas', 'Funda'), ('Bases Cooler', 'Base Cooler')],
+    'Streaming': [('Webcams', 'Webcam'), ('Capturadoras', 'Capturadora'), ('Iluminación', 'Aro de Luz')],
+    'Gabinetes': [('Gabinetes', 'Gabinete'), ('Coolers', 'Cooler'), ('Watercooling', 'Watercooler')],
+    'Accesorios': [('Cables', 'Cable'), ('Adaptadores', 'Adaptador'), ('Hubs USB', 'Hub USB')],
+}
+BRANDS = (
+    'Redragon', 'Logitech', 'Razer', 'HyperX', 'Corsair', 'SteelSeries', 'Genius', 'Noga', 'Kingston',
+    'ASUS', 'MSI', 'Gigabyte', 'Samsung', 'LG', 'AOC', 'Seagate', 'TP-Link', 'Sony', 'Microsoft',
+    'Xiaomi', 'Lenovo', 'Cooler Master', 'Thermaltake', 'NZXT', 'Trust', 'Patriot', 'ADATA', 'Crucial',
+)
+BRAND_SYLLABLES = ('Vex', 'Tron', 'Kai', 'Zen', 'Nor', 'Lux', 'Qua', 'Dra', 'Mek', 'Tor', 'Vo', 'Rix')
+SERIES = (
+    'Cobra', 'Viper', 'Kraken', 'Titan', 'Nova', 'Storm', 'Phantom', 'Falcon', 'Raptor', 'Orion',
+    'Zeus', 'Pulse', 'Vortex', 'Blade', 'Shadow', 'Neon', 'Apex', 'Fury', 'Hydra', 'Lynx',
+)
+VARIANTS = ('', '', '', 'Pro', 'RGB', 'Inalámbrico', 'Lite', 'Ultra', 'Plus', 'Gen 2')
+MODEL_LETTERS = 'ABGKMPSTXZ'
+DISCOUNTS = (0, 0, 0, 0, 5, 10, 10, 15, 20, 30)
+
+FIRST_NAMES = (
+    'Lucas', 'Ariana', 'Sofía', 'Mateo', 'Valentina', 'Martín', 'Camila', 'Joaquín', 'Lucía', 'Tomás',
+    'Julieta', 'Benjamín', 'Martina', 'Agustín', 'Catalina', 'Nicolás', 'Florencia', 'Santiago', 'Abril', 'Facundo',
+)
+LAST_NAMES = (
+    'Martinez', 'Romero', 'Sarasola', 'González', 'Rodríguez', 'Fernández', 'López', 'Díaz', 'Pérez', 'Gómez',
+    'Sánchez', 'Álvarez', 'Torres', 'Ruiz', 'Ramírez', 'Flores', 'Acosta', 'Benítez', 'Medina', 'Herrera',
+)
+PROVINCES = (
+    ('Córdoba', 'Córdoba Capital', '5000'), ('Córdoba', 'Villa Carlos Paz', '5152'),
+    ('Buenos Aires', 'La Plata', '1900'), ('CABA', 'Palermo', '1425'), ('Santa Fe', 'Rosario', '2000'),
+    ('Mendoza', 'Mendoza', '5500'), ('Tucumán', 'San Miguel de Tucumán', '4000'), ('Salta', 'Salta', '4400'),
+)
+STREETS = ('Av. Colón', 'Bv. San Juan', 'Av. Rivadavia', 'Belgrano', 'San Martín', 'Sarmiento', 'Av. Vélez Sarsfield')
+
+# estado -> peso (la mayoría de las órdenes históricas están completadas)
+STATUS_WEIGHTS = {
+    StatusOrderEnum.COMPLETED: 55,
+    StatusOrderEnum.CANCELLED: 10,
+    StatusOrderEnum.PAYMENT_CONFIRMED: 10,
+    StatusOrderEnum.SHIPPED: 10,
+    StatusOrderEnum.PENDING: 5,
+    StatusOrderEnum.PAYMENT_PENDING: 5,
+    StatusOrderEnum.RETURNED: 5,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos para pruebas de escala: categorías, subcategorías, marcas, "
+        "productos (100k a millones, con su search_vector), usuarios, favoritos, carritos y órdenes con items "
+        "(las pendientes reservan stock). "
+        "Todo se inserta con bulk_create por lotes; con la misma --seed se obtienen los mismos datos "
+        "(sobre una base vacía). Los datos quedan marcados: sku 'SYN-', slugs 'syn-' y emails @synthetic.test."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--categories', type=int, default=len(CATALOG))
+        parser.add_argument('--subcategories', type=int, default=4, help="Subcategorías por categoría.")
+        parser.add_argument('--brands', type=int, default=40)
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--favorites', type=float, default=4, help="Favoritos promedio por usuario.")
+        parser.add_argument('--carts', type=float, default=0.3, help="Fracción de usuarios con carrito guardado.")
+        parser.add_argument('--orders', type=int, default=50_000)
+        parser.add_argument('--days', type=int, default=365, help="Las órdenes se reparten en los últimos N días.")
+        parser.add_argument('--password', default='1234', help="Contraseña de todos los usuarios generados.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if Product.objects.filter(sku__startswith=SKU_PREFIX).exists() or \
+                CustomUser.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").exists():
+            raise CommandError(
+                "Ya hay datos sintéticos en la base. Use una base vacía (ej: manage.py flush) "
+                "para que la --seed reproduzca los mismos datos."
+            )
+        if not StatusOrder.objects.exists():
+            load_orders_init()
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        start = time.perf_counter()
+
+        subcategories = self._step("subcategorías", lambda: self._categories(
+            options['categories'], options['subcategories']
+        ))
+        brands = self._step("marcas", lambda: self._brands(options['brands']))
+        product_ids, pool = self._step("productos", lambda: self._products(
+            options['products'], subcategories, brands
+        ))
+        users = self._step("usuarios", lambda: self._users(options['users'], options['password']))
+        self._step("favoritos", lambda: self._favorites(users, product_ids, options['favorites']))
+        self._step("carritos", lambda: self._carts(users, product_ids, options['carts']))
+        self._step("órdenes", lambda: self._orders(options['orders'], users, pool, options['days']))
+        self._step("búsqueda", lambda: self._search_index(product_ids))
+
+        self.stdout.write(self.style.SUCCESS(f"listo en {time.perf_counter() - start:.1f}s"))
+        self.stdout.write("Para el dashboard de ventas: python manage.py rollup_sales --rebuild")
+
+    def _step(self, label: str, func):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if isinstance(result, int):
+            rows = result
+        else:
+            rows = len(result[0] if isinstance(result, tuple) else result)
+        self.stdout.write(f"  {label:<12} {rows:>10} filas  {elapsed:7.1f}s  {rows / max(elapsed, 1e-6):9.0f} filas/s")
+        return result
+
+    # -------------------- catálogo
+    def _categories(self, count: int, per_category: int) -> list[tuple[Subcategory, str]]:
+        """ Categories and their subcategories; returns [(subcategory, product noun)]. """
+        bases = list(CATALOG.items())
+        taken = set(Category.objects.values_list('name', flat=True))
+        names = _unique_names((bases[i % len(bases)][0] for i in range(count)), taken, 32)
+
+        categories = Category.objects.bulk_create([
+            Category(name=name, slug=f"{SLUG_PREFIX}c{i}-{slugify(name)}"[:32])
+            for i, name in enumerate(names, start=1)
+        ])
+
+        subcategories, nouns = [], []
+        for i, category in enumerate(categories):
+            options = bases[i % len(bases)][1]
+            picked = [options[j % len(options)] for j in range(per_category)]
+            sub_names = _unique_names((name for name, _ in picked), set(), 32)
+            for name, (_, noun) in zip(sub_names, picked):
+                number = len(subcategories) + 1
+                subcategories.append(Subcategory(
+                    name=name, slug=f"{SLUG_PREFIX}s{number}-{slugify(name)}"[:32], category=category,
+                ))
+                nouns.append(noun)
+
+        Subcategory.objects.bulk_create(subcategories, batch_size=self.batch_size)
+        return list(zip(subcategories, nouns))
+
+    def _brands(self, count: int) -> list[Brand]:
+        def candidates():
+            for i in range(count):
+                if i < len(BRANDS):
+                    yield BRANDS[i]
+                else:
+                    yield ''.join(self.rng.sample(BRAND_SYLLABLES, 2))
+
+        taken = set(Brand.objects.values_list('name', flat=True))
+        names = _unique_names(candidates(), taken, 32)
+        return Brand.objects.bulk_create([
+            Brand(name=name, slug=f"{SLUG_PREFIX}b{i}-{slugify(name)}"[:32])
+            for i, name in enumerate(names, start=1)
+        ])
+
+    def _products(self, count: int, subcategories: list, brands: list) -> tuple[array, list[Product]]:
+        """
+        Insert the products in batches.
+
+        Returns:
+            tuple: (ids of every product, sample of up to POOL_SIZE products kept in
+                memory for the orders, with their subcategory and category loaded)
+        """
+        ids = array('q')
+        pool = []
+        step = max(1, count // POOL_SIZE)
+        for batch in _batched(self._iter_products(count, subcategories, brands), self.batch_size):
+            with transaction.atomic():
+                Product.objects.bulk_create(batch)
+            ids.extend(product.id for product in batch)
+            pool.extend(batch[::step])
+        return ids, pool[:POOL_SIZE]
+
+    def _iter_products(self, count: int, subcategories: list, brands: list):
+        rng = self.rng
+        # name, slug y normalized_name se arman con las piezas ya normalizadas:
+        # normalizar cada producto por separado es lo más caro de la generación
+        pieces = {}
+
+        def piece(text):
+            if text not in pieces:
+                pieces[text] = (slugify(text), normalize_or_None(text))
+            return pieces[text]
+
+        for i in range(1, count + 1):
+            subcategory, noun = rng.choice(subcategories)
+            brand = rng.choice(brands)
+            series = rng.choice(SERIES)
+            variant = rng.choice(VARIANTS)
+            model = f"{rng.choice(MODEL_LETTERS)}{i}"    # el indice hace unico al nombre
+
+            words = [noun, brand.name, series, variant, model] if variant else [noun, brand.name, series, model]
+            parts = [piece(word) for word in words]
+
+            price = Decimal(max(round(rng.lognormvariate(10.5, 1.0), -1), 10)).quantize(CENT)
+            stock = 0 if rng.random() < 0.1 else rng.randint(1, 200)
+            yield Product(
+                name=' '.join(words),
+                slug='-'.join(slug for slug, _ in parts)[:120],
+                sku=f"{SKU_PREFIX}{i:08d}",
+                normalized_name=' '.join(norm for _, norm in parts),
+                price=price,
+                price_list=(price * Decimal('1.15')).quantize(CENT) if rng.random() < 0.5 else None,
+                discount=rng.choice(DISCOUNTS),
+                stock=stock,
+                available=stock > 0,
+                description=f"{noun} {brand.name} de la línea {series}. Garantía oficial de {rng.choice((6, 12, 24))} meses.",
+                subcategory=subcategory,
+                brand_id=brand.id,
+            )
+
+    # -------------------- usuarios
+    def _users(self, count: int, password: str) -> list[tuple]:
+        """ Returns [(id, full name, email, cellphone, province, city, postal code, address)]. """
+        rng = self.rng
+        hashed = make_password(password)    # un solo hash: hashear por usuario tarda ~100 ms cada uno
+        now = timezone.now()
+        users = []
+
+        def iter_users():
+            for i in range(1, count + 1):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                province, city, postal_code = rng.choice(PROVINCES)
+                yield CustomUser(
+                    email=f"{slugify(first)}.{slugify(last)}{i}@{EMAIL_DOMAIN}",
+                    password=hashed,
+                    first_name=first,
+                    last_name=last,
+                    cellphone=f"351{rng.randint(1_000_000, 9_999_999)}",
+                    province=province,
+                    address=f"{rng.choice(STREETS)} {rng.randint(1, 3000)}",
+                    date_joined=now - timedelta(days=rng.randint(0, 3 * 365)),
+                    is_active=True,
+                    role='buyer',
+                ), city, postal_code
+
+        for batch in _batched(iter_users(), self.batch_size):
+            with transaction.atomic():
+                CustomUser.objects.bulk_create([user for user, _, _ in batch])
+            users.extend(
+                (user.id, f"{user.first_name} {user.last_name}", user.email, user.cellphone,
+                 user.province, city, postal_code, user.address)
+                for user, city, postal_code in batch
+            )
+        return users
+
+    def _favorites(self, users: list, product_ids: array, average: float) -> int:
+        rng = self.rng
+
+        def iter_favorites():
+            for user in users:
+                count = min(int(rng.expovariate(1 / average)) if average else 0, len(product_ids))
+                for index in rng.sample(range(len(product_ids)), count):
+                    yield FavoriteProduct(user_id=user[0], product_id=product_ids[index])
+
+        total = 0
+        for batch in _batched(iter_favorites(), self.batch_size):
+            with transaction.atomic():
+                FavoriteProduct.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def _carts(self, users: list, product_ids: array, ratio: float) -> int:
+        """ Saved carts (1 to 5 products) for a fraction of the users; returns the cart items. """
+        rng = self.rng
+        total = 0
+        owners = [user[0] for user in users if rng.random() < ratio]
+        for batch in _batched(owners, self.batch_size):
+            with transaction.atomic():
+                carts = Cart.objects.bulk_create([Cart(user_id=user_id) for user_id in batch])
+                items = [
+                    CartItem(cart=cart, product_id=product_ids[index], quantity=rng.choice((1, 1, 1, 2, 3)))
+                    for cart in carts
+                    for index in rng.sample(range(len(product_ids)), min(rng.randint(1, 5), len(product_ids)))
+                ]
+                CartItem.objects.bulk_create(items, batch_size=self.batch_size)
+            total += len(items)
+        return total
+
+    # -------------------- órdenes
+    def _orders(self, count: int, users: list, pool: list, days: int) -> int:
+        """
+        Orders with shipment, items and snapshot, priced with OrderPricingService
+        (same totals and snapshot as a real checkout). Dates are spread over the
+        last `days` days in id order. The items of PENDING / PAYMENT_PENDING
+        orders are added to `Product.stock_reserved`, as a checkout does.
+        """
+        if not count or not users or not pool:
+            return 0
+
+        rng = self.rng
+        statuses = {row['id']: row for row in StatusOrder.objects.values('id', 'name')}
+        status_ids = [status for status in STATUS_WEIGHTS if status in statuses]
+        status_weights = [STATUS_WEIGHTS[status] for status in status_ids]
+        payments = list(PaymentMethod.objects.filter(is_active=True).values('id', 'name', 'time')) or \
+            list(PaymentMethod.objects.values('id', 'name', 'time'))
+        shipments = list(ShipmentMethod.objects.values('id', 'name', 'price'))
+        if not status_ids or not payments or not shipments:
+            raise CommandError("Faltan estados, métodos de pago o de envío (ver products/data/load_orders.py).")
+
+        end = timezone.now()
+        span = timedelta(days=days).total_seconds()
+        total_items = 0
+
+        for numbers in _batched(range(count), self.batch_size):
+            rows = []
+            for n in numbers:
+                user = rng.choice(users)
+                method = rng.choice(shipments)
+                province, city, postal_code = (user[4], user[5], user[6])
+                pickup = method['price'] == 0
+                shipment = ShipmentOrder(
+                    method_id=method['id'],
+                    name_pickup=user[1] if pickup else '',
+                    dni_pickup=str(rng.randint(20_000_000, 45_000_000)) if pickup else '',
+                    address='' if pickup else user[7],
+                    province='' if pickup else province,
+                    city='' if pickup else city,
+                    postal_code='' if pickup else postal_code,
+                    detail='',
+                )
+                # popularidad sesgada: pocos productos concentran la mayoría de las ventas
+                picked = {}
+                for _ in range(min(1 + int(rng.expovariate(0.8)), 8)):
+                    product = pool[int(len(pool) * rng.random() ** 2.5)]
+                    picked[product.id] = product
+                quantities = {product_id: rng.choice((1, 1, 1, 1, 2, 2, 3)) for product_id in picked}
+                created_at = end - timedelta(seconds=span * (1 - (n + rng.random()) / count))
+                rows.append((user, method, rng.choice(payments), rng.choices(status_ids, status_weights)[0],
+                             shipment, picked, quantities, created_at))
+
+            with transaction.atomic(), _explicit_dates(Order, 'created_at', 'updated_at'):
+                ShipmentOrder.objects.bulk_create([row[4] for row in rows])
+                orders, items = [], []
+                for user, method, payment, status, shipment, products, quantities, created_at in rows:
+                    pricing = OrderPricingService.price_order(
+                        products=products, products_ids_qty=quantities, shipment_cost=method['price'],
+                    )
+                    order = Order(
+                        user_id=user[0],
+                        status_id=status,
+                        payment_id=payment['id'],
+                        shipment=shipment,
+                        name=user[1],
+                        email=user[2],
+                        cellphone=user[3],
+                        dni=str(rng.randint(20_000_000, 45_000_000)),
+                        detail_order='',
+                        created_at=created_at,
+                        updated_at=created_at,
+                        expire_at=created_at + timedelta(hours=payment['time']),
+                        shipment_cost=pricing["shipment_cost"],
+                        discount_coupon=pricing["discount_coupon"],
+                        total=pricing["total"],
+                    )
+                    order.snapshot = OrderSnapshotService.build(
+                        order=order,
+                        shipping_method=method,
+                        payment_method=payment,
+                        status=statuses[status],
+                        items=pricing["items"],
+                        subtotal=pricing["subtotal"],
+                    )
+                    orders.append(order)
+                    items.append(pricing["items"])
+
+                Order.objects.bulk_create(orders)
+                for order, order_items in zip(orders, items):
+                    for item in order_items:
+                        item.order = order
+                flat = [item for order_items in items for item in order_items]
+                ItemOrder.objects.bulk_create(flat, batch_size=self.batch_size)
+
+                reserved = Counter()
+                for order, order_items in zip(orders, items):
+                    if order.status_id in OrderStatusTransitionService.RESERVED:
+                        for item in order_items:
+                            reserved[item.product_id] += item.quantity
+                self._reserve(reserved)
+            total_items += len(flat)
+
+        self.stdout.write(f"  {'items':<12} {total_items:>10} filas")
+        return count
+
+    @staticmethod
+    def _reserve(quantities: Counter) -> None:
+        """ stock_reserved += quantity, one UPDATE for the whole batch (CASE/WHEN per product). """
+        if not quantities:
+            return
+        # el stock generado es el disponible: la reserva solo suma a stock_reserved
+        delta = Case(
+            *(When(id=product_id, then=Value(qty)) for product_id, qty in quantities.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        Product.objects.filter(id__in=quantities.keys()).update(stock_reserved=F('stock_reserved') + delta)
+
+    # -------------------- índice de búsqueda
+    def _search_index(self, product_ids: array) -> int:
+        """ search_vector of the new products (bulk_create skips the pre_save signal that fills it). """
+        if not product_ids:
+            return 0
+        try:
+            SearchIndexService.check_backend()
+        except RuntimeError:
+            self.stdout.write(self.style.WARNING(
+                "Los productos quedaron sin search_vector: ejecutar python manage.py reindex_search"
+            ))
+            return 0
+
+        first, last = min(product_ids), max(product_ids)
+        total = 0
+        for start in range(first, last + 1, SearchIndexService.BATCH_SIZE):
+            total += SearchIndexService.reindex_range(start, start + SearchIndexService.BATCH_SIZE)
+        return total
+
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _unique_names(candidates, taken: set, max_length: int) -> list[str]:
+    """ Names not in `taken` nor repeated: 'Audio', 'Audio 2', 'Audio 3'... """
+    names = []
+    for name in candidates:
+        unique, n = name[:max_length], 1
+        while unique in taken:
+            n += 1
+            suffix = f" {n}"
+            unique = f"{name[:max_length - len(suffix)]}{suffix}"
+        taken.add(unique)
+        names.append(unique)
+    return names
+
+
+@contextmanager
+def _explicit_dates(model, *fields):
+    """ Keep the given dates on bulk_create (auto_now / auto_now_add would overwrite them). """
+    model_fields = [model._meta.get_field(name) for name in fields]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in model_fields]
+    for field in model_fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class StoredImage(models.Model):
+    """
+    A unique image file, addressed by the hash of its content.
+
+    Every upload is hashed (BLAKE2b) while it is read; if the hash already
+    exists the stored url is reused and nothing is written or uploaded again.
+    `ProductImage` and `StoreImage` rows point to the shared object, so the
+    same picture used by several products is a single file (and a single CDN
+    cache entry).
+    """
+    content_hash = models.CharField(
+        max_length=64, unique=True, help_text="BLAKE2b (32 bytes) hex digest of the file.")
+
+    url = models.CharField(
+        max_length=500, db_index=True, help_text="Public url (default_storage or external service).")
+
+    path = models.CharField(
+        max_length=255, blank=True, help_text="Key in default_storage, empty for external services (ImgBB).")
+
+    ext = models.CharField(max_length=5)
+    size = models.PositiveIntegerField()
+    variants_ready = models.BooleanField(
+        default=False, help_text="Every resized variant (core.utils.image_variants) exists in default_storage.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} | {self.url}"
@@ -5,6 +5,8 @@ from django.utils.html import escapejs
 from django.utils.safestring import mark_safe
 import json
 
+from core.utils.image_variants import VARIANTS, variant_urls
+
 register = template.Library()
 
 @register.filter
@@ -96,4 +98,20 @@ def short_date(value):
         month = MONTHS_ABBR.get(value.month, '')
         return f"{day} {month} {value.year}"
     except AttributeError:
-        return ''
\ No newline at end of file
+        return ''
+
+@register.filter
+def image_srcset(url, ready_names):
+    """
+        srcset con las variantes webp de una imagen propia: "{thumb} 160w, {card} 400w, {detail} 1200w".
+        `ready_names` es ready_variant_names() de todas las imagenes de la pagina, calculado una vez
+        en la vista (una query); con None devuelve '' (nunca una query por imagen).
+        Para urls externas (ImgBB) o variantes aun no generadas devuelve '' y queda solo el src original.
+        uso: <img src="{{ product.main_image }}" srcset="{{ product.main_image|image_srcset:variant_names }}">
+    """
+    if ready_names is None:
+        return ''
+    urls = variant_urls(url, ready_names)
+    if not urls:
+        return ''
+    return ", ".join(f"{urls[name]['webp']} {VARIANTS[name][0]}w" for name in VARIANTS)
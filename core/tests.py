@@ -1,7 +1,36 @@
 
 # Create your tests here.
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.db import connection
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from core.models import StoredImage
+from core.utils import image_variants
+from core.utils.image_store import store_upload, store_upload_with
+from core.utils.image_variants import VARIANTS, generate_variants, variant_path, variant_urls
+from core.utils.utils_image import read_image_header, sniff_image_type, validate_upload_first_chunk
+
+
+class TempMediaRootMixin:
+    """ Each test writes to its own MEDIA_ROOT (default_storage), removed afterwards. """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.addCleanup(override.disable)
+
 
 class PgTrgmTest(TestCase):
     """
@@ -29,3 +58,169 @@ class PgTrgmTest(TestCase):
 
         # Assert that the similarity is greater than zero (indicating a match)
         self.assertGreater(result, 0)
+
+
+class ImageVariantsTest(TempMediaRootMixin, TestCase):
+    """
+    Resized WebP/JPEG variants are written next to the original under
+    deterministic keys; their urls are only sent once every variant exists,
+    and external urls (ImgBB) have none.
+    """
+
+    def setUp(self):
+        super().setUp()
+        image_variants._ready_names.clear()
+
+    def _save_photo(self, name="products/photo.png"):
+        buffer = BytesIO()
+        Image.new("RGBA", (3000, 2000), (200, 10, 10, 128)).save(buffer, "PNG")
+        return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    def test_generate_variants(self):
+        name = self._save_photo()
+
+        written = generate_variants(name)
+
+        self.assertEqual(len(written), len(VARIANTS) * 2)
+        with default_storage.open(variant_path(name, "card", "webp")) as f:
+            self.assertEqual(Image.open(f).size, (400, 267))
+
+        # segunda pasada: ya existen, no se vuelven a escribir
+        self.assertEqual(generate_variants(name), [])
+
+    def test_variant_urls_only_when_ready(self):
+        url = default_storage.url("products/photo.png")
+        stored = StoredImage.objects.create(
+            content_hash="a" * 64, url=url, path="products/photo.png", ext="png", size=1
+        )
+        self.assertIsNone(variant_urls(url))
+
+        stored.variants_ready = True
+        stored.save(update_fields=["variants_ready"])
+        urls = variant_urls(url)
+
+        self.assertTrue(urls["thumb"]["webp"].endswith("products/photo__thumb.webp"))
+        self.assertTrue(urls["detail"]["jpg"].endswith("products/photo__detail.jpg"))
+        self.assertIsNone(variant_urls("https://i.ibb.co/abc/photo.png"))
+        self.assertIsNone(variant_urls(None))
+
+    def test_srcset_filter_uses_the_precomputed_names(self):
+        url = default_storage.url("products/photo.png")
+        StoredImage.objects.create(
+            content_hash="d" * 64, url=url, path="products/photo.png", ext="png", size=1, variants_ready=True
+        )
+        template = Template("{% load custom_filters %}{{ url|image_srcset:variant_names }}")
+
+        names = image_variants.ready_variant_names([url])
+        with self.assertNumQueries(0):
+            srcset = template.render(Context({"url": url, "variant_names": names}))
+            missing = template.render(Context({"url": url, "variant_names": None}))
+
+        self.assertIn("products/photo__card.webp 400w", srcset)
+        self.assertEqual(missing, "")
+
+    def test_backfill_command(self):
+        name = self._save_photo()
+        stored = StoredImage.objects.create(
+            content_hash="b" * 64, url=default_storage.url(name), path=name, ext="png", size=1
+        )
+        external = StoredImage.objects.create(
+            content_hash="c" * 64, url="https://i.ibb.co/abc/photo.png", path="", ext="png", size=1
+        )
+
+        call_command("generate_image_variants", stdout=StringIO())
+
+        stored.refresh_from_db()
+        external.refresh_from_db()
+        self.assertTrue(stored.variants_ready)
+        self.assertFalse(external.variants_ready)
+        self.assertTrue(default_storage.exists(variant_path(name, "thumb", "jpg")))
+        self.assertIsNotNone(variant_urls(stored.url))
+
+
+class UploadValidationTest(SimpleTestCase):
+    """
+    Uploads are validated with their first chunk and header, without
+    decoding the image.
+    """
+
+    def test_rejects_non_images_and_oversized(self):
+        with self.assertRaises(ValueError):
+            validate_upload_first_chunk(SimpleUploadedFile("x.png", b"<?php echo 1; ?>"))
+
+        big = SimpleUploadedFile("big.png", b"\x89PNG\r\n\x1a\n" + b"0" * (21 * 1024 * 1024))
+        with self.assertRaises(ValueError):
+            validate_upload_first_chunk(big)
+
+    def test_header_validation_without_decoding(self):
+        buffer = BytesIO()
+        Image.new("RGB", (300, 200)).save(buffer, "JPEG")
+        upload = SimpleUploadedFile("foto", buffer.getvalue(), content_type="application/octet-stream")
+
+        header = read_image_header(upload)
+        self.assertEqual((header["ext"], header["width"], header["height"]), ("jpg", 300, 200))
+        self.assertEqual(upload.tell(), 0)
+
+        # firma PNG valida con un header roto
+        broken = SimpleUploadedFile("x.png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+        with self.assertRaises(ValueError):
+            read_image_header(broken)
+
+    def test_sniff_image_type(self):
+        self.assertEqual(sniff_image_type(b"\xff\xd8\xff\xe0rest"), "jpg")
+        self.assertEqual(sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 "), "webp")
+        self.assertIsNone(sniff_image_type(b"%PDF-1.7"))
+
+
+class ImageStoreTest(TempMediaRootMixin, TestCase):
+    """
+    Same content -> same StoredImage: nothing is written or uploaded twice.
+    """
+
+    def _png(self, color="red"):
+        buffer = BytesIO()
+        Image.new("RGB", (40, 40), color).save(buffer, "PNG")
+        return buffer.getvalue()
+
+    def test_duplicate_upload_reuses_the_stored_file(self):
+        first, created = store_upload(SimpleUploadedFile("a.png", self._png()), "products")
+        self.assertTrue(created)
+        self.assertEqual(first.path, f"products/{first.content_hash[:2]}/{first.content_hash}.png")
+        self.assertTrue(default_storage.exists(first.path))
+
+        # otro nombre y otra carpeta, mismo contenido
+        second, created = store_upload(SimpleUploadedFile("b.jpg", self._png()), "brands")
+        self.assertFalse(created)
+        self.assertEqual(second.id, first.id)
+        self.assertFalse(default_storage.exists("brands"))
+
+        other, created = store_upload(SimpleUploadedFile("c.png", self._png("blue")), "products")
+        self.assertTrue(created)
+        self.assertEqual(StoredImage.objects.count(), 2)
+
+    def test_saves_with_canonical_extension(self):
+        buffer = BytesIO()
+        Image.new("RGB", (50, 50)).save(buffer, "PNG")
+        # la extension del nombre no importa, manda la firma del archivo
+        upload = SimpleUploadedFile("photo.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+        stored, _ = store_upload(upload, "products")
+
+        self.assertEqual(stored.ext, "png")
+        self.assertTrue(stored.path.startswith("products/") and stored.path.endswith(".png"))
+        with default_storage.open(stored.path) as f:
+            self.assertEqual(f.read(), buffer.getvalue())
+
+    def test_external_uploader_runs_once(self):
+        calls = []
+
+        def uploader(upload):
+            calls.append(upload.name)
+            return "https://i.ibb.co/abc/photo.png"
+
+        for name in ("1.png", "2.png"):
+            stored, _ = store_upload_with(SimpleUploadedFile(name, self._png()), uploader)
+
+        self.assertEqual(calls, ["1.png"])
+        self.assertEqual(stored.url, "https://i.ibb.co/abc/photo.png")
+        self.assertEqual(stored.path, "")
@@ -0,0 +1,114 @@
+import hashlib
+import os
+
+from typing import Callable
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
+from core.models import StoredImage
+from core.utils.utils_image import MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE, validate_upload_first_chunk
+
+
+def hash_upload(upload) -> str:
+    """
+    BLAKE2b hex digest of an UploadedFile, read by chunks (the file is never
+    loaded whole in memory). The cursor is left at the start.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    upload.seek(0)
+    for chunk in upload.chunks(UPLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def content_path(folder: str, content_hash: str, ext: str) -> str:
+    """ 'products/ab/ab12...ef.png': fan-out by the first byte to keep directories small. """
+    return os.path.join(folder, content_hash[:2], f"{content_hash}.{ext}")
+
+
+def store_upload(upload, folder: str) -> tuple[StoredImage, bool]:
+    """
+    Save an upload in default_storage under its content-addressed path.
+
+    Duplicates (same bytes, in any folder) return the existing object without
+    writing anything.
+
+    Returns:
+        tuple[StoredImage, bool]: The stored image and whether the file is new.
+
+    Raises:
+        ValueError: If the file is empty, too big or not an accepted image.
+    """
+    def save(content_hash, ext):
+        path = content_path(folder, content_hash, ext)
+        # el archivo puede existir sin fila (fila borrada a mano): mismo nombre = mismo contenido
+        if not default_storage.exists(path):
+            path = default_storage.save(path, upload)
+        return path, default_storage.url(path)
+
+    return _get_or_store(upload, save, MAX_UPLOAD_SIZE)
+
+
+def store_upload_with(upload, uploader: Callable, max_size: int = MAX_UPLOAD_SIZE) -> tuple[StoredImage, bool]:
+    """
+    Same dedupe for external services: `uploader(upload) -> url` only runs
+    when the content is not known yet (e.g. `get_url_from_imgbb`).
+    """
+    return _get_or_store(upload, lambda content_hash, ext: ("", uploader(upload)), max_size)
+
+
+def find_upload(upload, max_size: int = MAX_UPLOAD_SIZE) -> tuple[str, str, StoredImage | None]:
+    """
+    Validate and hash an upload without storing it.
+
+    Returns:
+        tuple: (content hash, extension, existing StoredImage or None)
+
+    Raises:
+        ValueError: If the file is empty, too big or not an accepted image.
+    """
+    ext = validate_upload_first_chunk(upload, max_size)
+    content_hash = hash_upload(upload)
+    return content_hash, ext, StoredImage.objects.filter(content_hash=content_hash).first()
+
+
+def register_upload(upload, content_hash: str, ext: str, *, path: str, url: str) -> tuple[StoredImage, bool]:
+    """
+    Insert the StoredImage row of an already saved / uploaded file.
+
+    Returns:
+        tuple[StoredImage, bool]: The row and whether it is new; when another
+            request stored the same content first its row wins (and our
+            local copy, if any, is deleted).
+    """
+    try:
+        with transaction.atomic():   # savepoint: el IntegrityError no rompe la transaccion de afuera
+            return StoredImage.objects.create(
+                content_hash=content_hash, url=url, path=path, ext=ext, size=upload.size
+            ), True
+    except IntegrityError:
+        # otro request subio el mismo archivo al mismo tiempo: gana su fila
+        winner = StoredImage.objects.get(content_hash=content_hash)
+        if path and path != winner.path:
+            default_storage.delete(path)
+        return winner, False
+
+
+def stored_image_ids(urls) -> dict[str, int]:
+    """ {url: StoredImage id} of the given urls that belong to a stored image (one query). """
+    urls = [url for url in set(urls) if url]
+    if not urls:
+        return {}
+    return dict(StoredImage.objects.filter(url__in=urls).values_list('url', 'id'))
+
+
+# -------------------- private
+def _get_or_store(upload, save: Callable, max_size: int) -> tuple[StoredImage, bool]:
+    content_hash, ext, existing = find_upload(upload, max_size)
+    if existing:
+        return existing, False
+
+    path, url = save(content_hash, ext)
+    return register_upload(upload, content_hash, ext, path=path, url=url)
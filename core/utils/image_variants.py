@@ -0,0 +1,173 @@
+import logging
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+from core.models import StoredImage
+
+logger = logging.getLogger(__name__)
+
+
+# nombre -> caja maxima (ancho, alto); nunca se agranda la imagen original
+VARIANTS = {
+    "thumb": (160, 160),     # carrito, miniaturas
+    "card": (400, 400),      # cards y carruseles
+    "detail": (1200, 1200),  # pagina de detalle
+}
+
+# (extension, formato de Pillow, opciones); webp principal y jpg como fallback
+FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+# generacion fuera del request: pocos hilos, el trabajo es CPU (Pillow libera el GIL al decodificar)
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-variants")
+
+# storage keys con variants_ready=True; el flag nunca vuelve a False, se cachea por proceso
+_ready_names: set[str] = set()
+
+
+def variant_path(name: str, variant: str, ext: str) -> str:
+    """
+    Deterministic storage key of a variant, next to the original:
+        products/abc123.png -> products/abc123__card.webp
+    """
+    root, _ = os.path.splitext(name)
+    return f"{root}__{variant}.{ext}"
+
+
+def variant_urls(url: str | None, ready_names: set[str] | None = None) -> dict | None:
+    """
+    Urls of the variants of an image stored in `default_storage`, built from the
+    original url. Only images whose variants were all generated
+    (`StoredImage.variants_ready`) have them; external urls (ImgBB, etc) and
+    images still being processed return None, so no srcset points to a missing file.
+
+    Args:
+        url (str | None): Public url of the original image.
+        ready_names (set[str] | None): Result of `ready_variant_names()` for a
+            whole list (one query). If None the image is looked up on its own.
+
+    Returns:
+        dict | None: {"thumb": {"webp": url, "jpg": url}, "card": {...}, "detail": {...}}
+    """
+    name = storage_name_from_url(url)
+    if not name:
+        return None
+    if ready_names is None:
+        ready_names = ready_variant_names([url])
+    if name not in ready_names:
+        return None
+    return {
+        variant: {ext: default_storage.url(variant_path(name, variant, ext)) for ext, _, _ in FORMATS}
+        for variant in VARIANTS
+    }
+
+
+def ready_variant_names(urls) -> set[str]:
+    """
+    Storage keys of the given urls whose variants are ready. At most one query,
+    and none once every key is cached.
+    """
+    names = {name for name in map(storage_name_from_url, urls) if name}
+    missing = names - _ready_names
+    if missing:
+        _ready_names.update(
+            StoredImage.objects
+            .filter(path__in=missing, variants_ready=True)
+            .values_list('path', flat=True)
+        )
+    return names & _ready_names
+
+
+def mark_variants_ready(name: str) -> None:
+    """ Flag the StoredImage of `name` once `generate_variants()` finished. """
+    StoredImage.objects.filter(path=name).update(variants_ready=True)
+
+
+def storage_name_from_url(url: str | None) -> str | None:
+    """ 'products/abc.png' from the public url of a stored file, None if it is not ours. """
+    if not url:
+        return None
+    url = url.split("?", 1)[0]   # urls firmadas (S3)
+    prefix = _storage_prefix()
+    if not prefix or not url.startswith(prefix):
+        return None
+    return url[len(prefix):] or None
+
+
+def schedule_variants(names: list[str]) -> None:
+    """
+    Generate the variants of the stored images in the background pool.
+    """
+    for name in names:
+        _pool.submit(_generate_safe, name)
+
+
+def generate_variants(name: str) -> list[str]:
+    """
+    Create every variant (all sizes, WebP + JPEG) of a stored image.
+
+    The original is decoded once; sizes are produced from the largest to the
+    smallest reusing the previous resize. Existing variants are kept (same
+    key = same content), so running it twice is cheap.
+
+    Returns:
+        list[str]: Storage keys written.
+    """
+    with default_storage.open(name, "rb") as f:
+        image = Image.open(f)
+        # JPEG: decodifica directamente a escala reducida (mucho mas rapido en fotos grandes)
+        image.draft("RGB", max(VARIANTS.values()))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    image = _flatten(image)
+    written = []
+
+    for variant, size in sorted(VARIANTS.items(), key=lambda item: item[1], reverse=True):
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        for ext, pil_format, options in FORMATS:
+            path = variant_path(name, variant, ext)
+            if default_storage.exists(path):
+                continue
+            buffer = BytesIO()
+            image.save(buffer, format=pil_format, **options)
+            written.append(default_storage.save(path, ContentFile(buffer.getvalue())))
+
+    return written
+
+
+# -------------------- private
+def _generate_safe(name: str) -> None:
+    close_old_connections()   # hilo del pool: fuera del ciclo request/response
+    try:
+        generate_variants(name)
+        mark_variants_ready(name)
+    except Exception:
+        logger.exception("Could not generate the variants of %s", name)
+    finally:
+        close_old_connections()
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """ RGB image; transparency goes over a white background (JPEG has no alpha). """
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+@lru_cache(maxsize=1)
+def _storage_prefix() -> str:
+    return default_storage.url("").split("?", 1)[0]
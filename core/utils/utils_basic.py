@@ -1,3 +1,4 @@
+from django.utils.dateparse import parse_date
 
 
 def valid_id_or_None(
@@ -136,3 +137,15 @@ def get_valid_bool(value, field='some field'):
     
     else:
         raise serializers.ValidationError(f"El campo {field} debe ser booleano.")
+
+
+def valid_date_or_None(value):
+    """
+    Parsea un string YYYY-MM-DD (ej: GET params), None si falta o es inválido.
+    """
+    if not value:
+        return None
+    try:
+        return parse_date(value)
+    except ValueError:    # formato correcto pero fecha inexistente (ej: 2025-02-31)
+        return None
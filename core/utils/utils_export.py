@@ -0,0 +1,97 @@
+import csv
+import json
+
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_CHUNK_SIZE = 2000    # filas por fetch del cursor del servidor
+EXPORT_FLUSH_ROWS = 500     # filas por pedazo enviado al cliente
+
+
+class _Echo:
+    """ Pseudo-archivo para csv.writer: devuelve la línea en vez de guardarla. """
+    def write(self, value):
+        return value
+
+
+def iter_rows(qs: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Recorre un queryset de .values() con `.iterator(chunk_size)`: en PostgreSQL
+    usa un cursor del servidor, las filas nunca se cargan todas en memoria.
+    """
+    return qs.iterator(chunk_size=chunk_size)
+
+
+def iter_csv(rows: Iterable[dict], fields: tuple) -> Iterator[str]:
+    """
+    Encabezado + filas en CSV, agrupadas de a EXPORT_FLUSH_ROWS.
+    El encabezado sale antes de ejecutar la consulta (primeros bytes inmediatos).
+    """
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(fields)    # BOM para que Excel detecte utf-8
+
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow([_csv_value(row.get(field)) for field in fields]))
+        if len(buffer) >= EXPORT_FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def iter_jsonl(rows: Iterable[dict], fields: tuple) -> Iterator[str]:
+    """ Un objeto JSON por línea con las claves `fields`, agrupadas de a EXPORT_FLUSH_ROWS. """
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    buffer = []
+    for row in rows:
+        buffer.append(encoder.encode({field: row.get(field) for field in fields}) + '\n')
+        if len(buffer) >= EXPORT_FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def streaming_export_response(rows: Iterable[dict], fields: tuple, fmt: str, name: str) -> StreamingHttpResponse:
+    """
+    Respuesta de descarga en streaming (memoria constante sin importar la cantidad de filas).
+
+    Args:
+        rows: Iterable de dicts (ej: `iter_rows(qs)`), se consume recién al enviar la respuesta.
+        fields: Columnas / claves, en orden.
+        fmt: 'csv' o 'jsonl'.
+        name: Prefijo del nombre del archivo (se agrega la fecha).
+
+    Raises:
+        ValueError: Si el formato no está soportado.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato '{fmt}' no soportado. Use csv o jsonl.")
+
+    content = iter_csv(rows, fields) if fmt == 'csv' else iter_jsonl(rows, fields)
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[fmt])
+    filename = f"{name}_{timezone.localdate():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['X-Accel-Buffering'] = 'no'    # nginx: no acumular la respuesta entera
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
@@ -46,52 +46,28 @@ def get_url_from_imgbb(image_file):
     
 
 import os
-from PIL import Image
-from io import BytesIO
+from PIL import Image, UnidentifiedImageError
 def validate_and_prepare_image(file):
-    """Valida la imagen y la prepara para subida. Retorna (file_obj, content_type)."""
+    """
+    Valida la imagen para subida leyendo solo el header. Retorna (file_obj, content_type).
+
+    El formato sale de los magic bytes + header de Pillow (no de la extension
+    ni del content_type del navegador), asi que no hace falta decodificar ni
+    re-encodear la imagen en el request: el archivo se sube tal cual.
+    """
     # Validación básica: nombre y tamaño
     if not getattr(file, 'name', None):
         raise ValueError("El archivo no tiene nombre")
     if file.size == 0:
         raise ValueError("El archivo está vacío")
 
-    # Obtener extensión y tipo MIME
-    ext = os.path.splitext(file.name)[1][1:].lower() if file.name else 'jpg'
-    content_type = getattr(file, 'content_type', f'image/{ext}' if ext else 'image/jpeg')
-
-    # Validar extensión permitida
-    ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
-    if ext not in ALLOWED_EXTENSIONS:
-        raise ValueError(f"Formato '{ext}' no soportado. Use: {', '.join(ALLOWED_EXTENSIONS)}")
-
     # Validar tamaño máximo (32MB)
     if file.size > 32 * 1024 * 1024:
         raise ValueError("El archivo excede el límite de 32MB")
 
-    # Si el tipo MIME es sospechoso (ej: application/octet-stream), validar con Pillow
-    if not content_type.startswith('image/'):
-        try:
-            # Abrir y verificar integridad de la imagen
-            img = Image.open(file)
-            img.verify()  # Lanza excepción si la imagen está corrupta
-            
-            # Convertir a BytesIO para garantizar compatibilidad
-            output = BytesIO()
-            img = Image.open(file)  # Reabrir porque verify() cierra el archivo
-            img.save(output, format='JPEG' if ext in ('jpg', 'jpeg') else ext.upper())
-            output.seek(0)
-            
-            # Actualizar content_type basado en la extensión
-            content_type = f'image/{ext if ext in ALLOWED_EXTENSIONS else "jpeg"}'
-            return output, content_type
-
-        except Exception as e:
-            raise ValueError(f"Archivo no es una imagen válida: {str(e)}")
-
-    # Si el archivo ya es válido, retornarlo tal cual (reiniciando cursor)
-    file.seek(0)
-    return file, content_type
+    # Formato y dimensiones desde el header (jpg, png, gif, webp)
+    header = read_image_header(file)
+    return file, header["content_type"]
 
 
 def generate_image_name(content_type):
@@ -100,5 +76,111 @@ def generate_image_name(content_type):
     return f"{uuid.uuid4().hex[:13]}.{ext}"
 
 
+# -------------------- uploads a default_storage (core/views/upload_images.py)
+
+# mismo limite que nginx (client_max_body_size 20M)
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# firmas de los formatos aceptados -> extension canonica
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+
+# formato de Pillow -> extension canonica
+IMAGE_FORMATS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+# 50 MP: fotos de camara entran, decompression bombs no
+MAX_IMAGE_PIXELS = 50_000_000
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """
+    Extension canonica ('jpg', 'png', 'gif', 'webp') segun los magic bytes
+    del inicio del archivo, None si no es un formato aceptado.
+    """
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def validate_upload_first_chunk(upload, max_size: int = MAX_UPLOAD_SIZE) -> str:
+    """
+    Valida tamaño y tipo de un UploadedFile leyendo solo su primer chunk.
+    
+    El tamaño lo informa el upload handler (no hace falta leer el archivo) y el
+    tipo se detecta por magic bytes, no por la extension ni el content_type
+    que manda el navegador. Despues se lee el header (dimensiones) sin
+    decodificar la imagen; la decodificacion completa queda para las
+    variantes en segundo plano (core/utils/image_variants.py).
+    
+    Returns:
+        str: extension canonica del archivo.
+    
+    Raises:
+        ValueError: si esta vacio, excede el limite o no es una imagen aceptada.
+    """
+    if not upload.size:
+        raise ValueError("El archivo está vacío")
+    if upload.size > max_size:
+        raise ValueError(f"El archivo excede el límite de {max_size // (1024 * 1024)}MB")
+    
+    upload.seek(0)
+    head = next(upload.chunks(UPLOAD_CHUNK_SIZE), b"")
+    upload.seek(0)
+    
+    if sniff_image_type(head) is None:
+        raise ValueError("El archivo no es una imagen válida (jpg, png, gif o webp)")
+    return read_image_header(upload)["ext"]
+
 
+def read_image_header(file) -> dict:
+    """
+    Formato y dimensiones de una imagen leyendo solo su header.
 
+    `Image.open` es lazy: parsea los primeros bloques del archivo (hasta el
+    SOS en JPEG, el IHDR en PNG) y no decodifica pixeles, el costo no depende
+    del tamaño de la imagen. El formato detectado tiene que coincidir con los
+    magic bytes y se rechazan dimensiones absurdas (decompression bombs).
+
+    Returns:
+        dict: {"ext", "format", "content_type", "width", "height"}
+
+    Raises:
+        ValueError: si no es una imagen aceptada o el header es inválido.
+    """
+    file.seek(0)
+    ext = sniff_image_type(file.read(32))
+    file.seek(0)
+    if ext is None:
+        raise ValueError("El archivo no es una imagen válida (jpg, png, gif o webp)")
+
+    try:
+        with Image.open(file) as img:
+            image_format, (width, height) = img.format, img.size
+    except Image.DecompressionBombError:
+        raise ValueError("La imagen tiene demasiados píxeles")
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise ValueError(f"Archivo no es una imagen válida: {e}")
+    finally:
+        file.seek(0)
+
+    if IMAGE_FORMATS.get(image_format) != ext:
+        raise ValueError("El contenido del archivo no coincide con su formato")
+    if not width or not height or width * height > MAX_IMAGE_PIXELS:
+        raise ValueError(f"Dimensiones inválidas: {width}x{height}")
+
+    return {
+        "ext": ext,
+        "format": image_format,
+        "content_type": f"image/{'jpeg' if ext == 'jpg' else ext}",
+        "width": width,
+        "height": height,
+    }
@@ -0,0 +1,90 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(value: datetime, pk: int) -> str:
+    """
+    Codifica la posición (timestamp, id) de la última fila de una página
+    en un string opaco y seguro para usar en la url (?cursor=...).
+    """
+    raw = f"{value.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """
+    Decodifica un cursor generado por `encode_cursor`.
+
+    Returns:
+        - tuple(datetime, int): posición de la última fila vista.
+        - None: si no hay cursor o es inválido (se interpreta como primera página).
+    """
+    if not cursor:
+        return None
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode()
+        value, pk = raw.rsplit("|", 1)
+        value = parse_datetime(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    if value is None or pk <= 0:
+        return None
+
+    return value, pk
+
+
+def paginate_keyset(
+    qs: QuerySet,
+    *,
+    cursor: str | None = None,
+    page_size: int = 20,
+    field: str = "updated_at",
+) -> tuple[list[dict], str | None]:
+    """
+    Keyset (cursor) pagination over `(field, id)` in descending order.
+
+    Unlike OFFSET pagination (Paginator), the cost of each page does not grow
+    with the page number: the database seeks directly to the last seen
+    `(field, id)` using a composite index and reads `page_size + 1` rows.
+
+    Args:
+        qs (QuerySet): A `.values()` queryset. It must include `id` and `field`
+            in the selected values, ordering is applied here.
+        cursor (str | None): Opaque cursor returned by the previous page.
+        page_size (int): Maximum rows per page.
+        field (str): Datetime field used as the main sort key.
+
+    Returns:
+        tuple:
+            - rows (list[dict]): Rows of the current page.
+            - next_cursor (str | None): Cursor for the next page, None if this is the last one.
+
+    Notes:
+        - The `(field, id)` pair must be backed by a composite index
+          (e.g. `Index(fields=['-updated_at', '-id'])`) to stay fast on large tables.
+    """
+    position = decode_cursor(cursor)
+    if position:
+        value, pk = position
+        qs = qs.filter(
+            Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk})
+        )
+
+    # una fila extra para saber si existe una pagina siguiente sin hacer COUNT(*)
+    rows = list(qs.order_by(f"-{field}", "-id")[:page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[field], last["id"])
+
+    return rows, next_cursor
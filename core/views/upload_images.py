@@ -4,15 +4,10 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 
 from core.permissions import IsAdminOrSuperUser
+from core.utils.image_variants import ready_variant_names, schedule_variants, variant_urls
+from core.utils.image_store import store_upload
 
 
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-
-import uuid
-import os
-from django.conf import settings
-
 
 class GenericUploadImageAPIView(APIView):
     permission_classes = [IsAdminOrSuperUser]
@@ -39,40 +34,49 @@ class GenericUploadImageAPIView(APIView):
         
         
         new_urls = []
+        new_paths = []
+        errors = []
         for img in images:
-            # Aseguramos que el cursor esté al inicio
-            img.seek(0)
-            
-            # 1. Generar nombre único y ruta
-            ext = os.path.splitext(img.name)[1].lower()
-            unique_name = f"{uuid.uuid4().hex[:13]}{ext}"
-            
-            # 2. Construir la ruta relativa: 'products/nombre.webp'
-            relative_path = os.path.join(folder, unique_name)
-            
-            # 3. Guardar físicamente
-            # default_storage detecta automáticamente si es local o AWS S3
-            saved_path = default_storage.save(relative_path, ContentFile(img.read()))
+            # 1-3. Validar con el primer chunk (tamaño y magic bytes), hashear por chunks y guardar
+            # en 'products/ab/<hash>.ext'. Si el contenido ya existe se devuelve la url guardada
+            # sin escribir nada. default_storage detecta automáticamente si es local o AWS S3
+            try:
+                stored, created = store_upload(img, folder)
+            except ValueError as e:
+                errors.append(f"{img.name}: {e}")
+                if not multi:
+                    break
+                continue
             
-            # 4. Generamos la URL inteligente según el entorno
-            # Resultado (Local): Te devuelve /media/banners/archivo.webp.
-            # Resultado (AWS): Te devuelve https://tu-bucket.s3.amazonaws.com/banners/archivo.webp?AWSA..
-            full_url = default_storage.url(saved_path)
-            
-            new_urls.append(full_url)
+            # 4. URL guardada segun el entorno
+            # Resultado (Local): /media/banners/ab/<hash>.webp.
+            # Resultado (AWS): https://tu-bucket.s3.amazonaws.com/banners/ab/<hash>.webp
+            new_urls.append(stored.url)
+            if stored.path and (created or not stored.variants_ready):
+                new_paths.append(stored.path)
         
             # para cortar a la primera ( esto es porque products puede usar 
             # más de una vez este endpoint )
             if not multi:
                 break
-            
+        
+        if not new_urls:
+            return Response({"success": False, "detail": "; ".join(errors)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # 5. Variantes webp/jpg (thumb, card, detail) en segundo plano, el request no espera
+        # (los duplicados ya tienen las suyas, salvo que su generacion haya fallado)
+        schedule_variants(new_paths)
+        ready_names = ready_variant_names(new_urls)
 
         return Response({
             "success": True,
             # Si no es multi, devolvemos un string simple para no romper tu JS viejo
             # o la lista completa si es multi.
             "image_url": new_urls[0] if not multi else None,
-            "images_urls": new_urls if multi else None
+            "images_urls": new_urls if multi else None,
+            # None hasta que las variantes esten generadas (variants_ready)
+            "variants": [variant_urls(url, ready_names) for url in new_urls],
+            "errors": errors or None,
         })
 
 
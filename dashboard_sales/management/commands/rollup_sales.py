@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard_sales.services.rollups import SalesRollupService
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza las tablas de ventas diarias (dashboard) con las órdenes nuevas "
+        "desde el último watermark. Pensado para correr por cron cada pocos minutos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=SalesRollupService.DEFAULT_BATCH_SIZE,
+            help="Cantidad máxima de órdenes por transacción.",
+        )
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="Vacía los rollups y los recalcula desde la primera orden.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+
+        if options['rebuild']:
+            total = SalesRollupService.rebuild(batch_size=batch_size)
+        else:
+            total = SalesRollupService.apply_all(batch_size=batch_size)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} órdenes agregadas a los rollups en {elapsed:.2f}s"
+        ))
@@ -0,0 +1,79 @@
+from django.db import models
+
+
+class BaseSalesRollup(models.Model):
+    """
+    Common fields of the daily sales rollup tables.
+
+    Each row accumulates the sales of one day (order `created_at` in the
+    project TIME_ZONE) for one order status. Rows are never recomputed from
+    scratch on read, they are incremented by `SalesRollupService`:
+      - when new orders are rolled up by the batch job (watermark), and
+      - when an already rolled up order changes its status (its amounts move
+        from the old status bucket to the new one).
+    """
+    day = models.DateField()
+    status = models.ForeignKey('orders.StatusOrder', on_delete=models.CASCADE, related_name='+')
+
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.BigIntegerField(default=0)
+    orders_count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class SalesDaily(BaseSalesRollup):
+    """ Ventas por día y estado. """
+
+    class Meta:
+        verbose_name = "Venta diaria"
+        verbose_name_plural = "Ventas diarias"
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status'], name='sales_daily_day_status_uniq'),
+        ]
+
+
+class SalesDailyCategory(BaseSalesRollup):
+    """ Ventas por día, estado y categoría (categoría actual del producto). """
+    category = models.ForeignKey('products.Category', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        verbose_name = "Venta diaria por categoría"
+        verbose_name_plural = "Ventas diarias por categoría"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'category'], name='sales_daily_cat_uniq'
+            ),
+        ]
+
+
+class SalesDailyBrand(BaseSalesRollup):
+    """ Ventas por día, estado y marca. """
+    brand = models.ForeignKey('products.Brand', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        verbose_name = "Venta diaria por marca"
+        verbose_name_plural = "Ventas diarias por marca"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'brand'], name='sales_daily_brand_uniq'
+            ),
+        ]
+
+
+class SalesRollupWatermark(models.Model):
+    """
+    Position of the rollup batch job.
+
+    `last_order_id` is the highest Order id whose ItemOrder rows are already
+    counted in the rollup tables. Items of an order are inserted in the same
+    transaction as the order, so tracking the order id (instead of the item id)
+    never splits an order between two batches and keeps `orders_count` exact.
+    """
+    name = models.CharField(max_length=32, unique=True)
+    last_order_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} -> {self.last_order_id}"
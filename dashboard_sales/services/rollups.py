@@ -0,0 +1,281 @@
+# dashboard_sales/services/rollups.py
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from datetime import timedelta
+from typing import Iterable
+
+from dashboard_sales.models import (
+    SalesDaily, SalesDailyCategory, SalesDailyBrand, SalesRollupWatermark
+)
+
+# others apps
+from orders.models import Order, ItemOrder
+from products.models.product import Product
+from products.models.subcategory import Subcategory
+
+
+class SalesRollupService:
+    """
+    Incremental maintenance of the daily sales rollup tables.
+
+    The rollups are only ever *incremented* with `INSERT ... SELECT ... GROUP BY
+    ... ON CONFLICT DO UPDATE SET x = x + EXCLUDED.x`, so every operation is a
+    single statement per table that aggregates inside PostgreSQL and the cost
+    depends on the amount of new data, never on the size of `orders_order`.
+
+    Two entry points keep the tables in sync:
+        - `apply_new_orders()`: batch job, rolls up the ItemOrder rows of the
+          orders created after the watermark.
+        - `move_orders_status()`: called on status transitions, moves the
+          amounts of already rolled up orders from the old status to the new one.
+
+    Notes:
+        - Orders newer than the watermark are ignored by `move_orders_status()`,
+          the batch job will count them later with their current status.
+        - The batch job takes an exclusive transaction advisory lock and status
+          changes take it shared, so a status change and the batch job never
+          double count an order, while status changes never wait on each other
+          (only while a batch is running).
+    """
+
+    WATERMARK_NAME = 'sales'
+    # clave de pg_advisory_xact_lock(_shared) (arbitraria, unica en la base)
+    LOCK_KEY = 482_113_001
+    DEFAULT_BATCH_SIZE = 5000
+
+    # Orders younger than this are left for the next run, so a checkout
+    # transaction that is still open when the job runs is not skipped.
+    SAFETY_LAG = timedelta(seconds=60)
+
+    # (model, extra dimension column, SQL expression of the dimension)
+    ROLLUPS = (
+        (SalesDaily, None, None),
+        (SalesDailyCategory, 'category_id', 's.category_id'),
+        (SalesDailyBrand, 'brand_id', 'p.brand_id'),
+    )
+
+    @staticmethod
+    def apply_new_orders(*, batch_size: int | None = None) -> dict:
+        """
+        Roll up the next batch of orders created after the watermark.
+
+        Args:
+            batch_size (int | None): Max number of orders processed in this call.
+
+        Returns:
+            dict: {"from_id", "to_id", "orders"} with the processed id range
+                (`orders` is 0 when there was nothing new to roll up).
+        """
+        batch_size = batch_size or SalesRollupService.DEFAULT_BATCH_SIZE
+
+        with transaction.atomic():
+            watermark = SalesRollupService._lock_watermark()
+            from_id = watermark.last_order_id
+
+            to_id = SalesRollupService._get_batch_upper_id(from_id, batch_size)
+            if to_id is None:
+                return {"from_id": from_id, "to_id": from_id, "orders": 0}
+
+            where = "o.id > %s AND o.id <= %s"
+            for model, dim_column, dim_expr in SalesRollupService.ROLLUPS:
+                SalesRollupService._upsert(
+                    model,
+                    dim_column=dim_column,
+                    dim_expr=dim_expr,
+                    status_expr="o.status_id",
+                    sign=1,
+                    where=where,
+                    params=[from_id, to_id],
+                )
+
+            orders = Order.objects.filter(id__gt=from_id, id__lte=to_id).count()
+
+            watermark.last_order_id = to_id
+            watermark.save(update_fields=['last_order_id', 'updated_at'])
+
+        return {"from_id": from_id, "to_id": to_id, "orders": orders}
+
+    @staticmethod
+    def apply_all(*, batch_size: int | None = None) -> int:
+        """
+        Run `apply_new_orders()` until there is nothing left to roll up.
+
+        Each batch is committed on its own, so a long catch-up never holds
+        a huge transaction.
+
+        Returns:
+            int: Total number of rolled up orders.
+        """
+        total = 0
+        while True:
+            result = SalesRollupService.apply_new_orders(batch_size=batch_size)
+            if not result["orders"]:
+                return total
+            total += result["orders"]
+
+    @staticmethod
+    def move_orders_status(*, order_ids: Iterable[int], status_id: int) -> None:
+        """
+        Move the rolled up amounts of some orders to a new status bucket.
+
+        Must run inside the same transaction and *before* the UPDATE of
+        `Order.status_id`, because the old status is read from the orders table.
+        The caller must hold the row locks of the orders (set_status takes
+        them), otherwise two changes of one order read the same old status.
+
+        Args:
+            order_ids (Iterable[int]): Orders that are changing status.
+            status_id (int): New StatusOrder id.
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return
+
+        # savepoint=False: dentro de set_status no hace falta un savepoint propio
+        with transaction.atomic(savepoint=False):
+            # lock compartido: no bloquea otros cambios de estado, sólo espera al batch
+            SalesRollupService._advisory_lock(shared=True)
+            last_order_id = (
+                SalesRollupWatermark.objects
+                .filter(name=SalesRollupService.WATERMARK_NAME)
+                .values_list('last_order_id', flat=True)
+                .first()
+            )
+            if not last_order_id:
+                return
+
+            where = (
+                "o.id = ANY(%s) AND o.id <= %s "
+                "AND o.status_id IS DISTINCT FROM %s"
+            )
+            params = [order_ids, last_order_id, status_id]
+
+            for model, dim_column, dim_expr in SalesRollupService.ROLLUPS:
+                # restamos del estado anterior ...
+                SalesRollupService._upsert(
+                    model,
+                    dim_column=dim_column,
+                    dim_expr=dim_expr,
+                    status_expr="o.status_id",
+                    sign=-1,
+                    where=where,
+                    params=params,
+                )
+                # ... y sumamos al nuevo
+                SalesRollupService._upsert(
+                    model,
+                    dim_column=dim_column,
+                    dim_expr=dim_expr,
+                    status_expr="%s",
+                    status_params=[status_id],
+                    sign=1,
+                    where=where,
+                    params=params,
+                )
+
+    @staticmethod
+    def rebuild(*, batch_size: int | None = None) -> int:
+        """
+        Empty the rollup tables, reset the watermark and roll up every order again.
+
+        Only needed after manual data fixes; normal operation is incremental.
+
+        Returns:
+            int: Total number of rolled up orders.
+        """
+        with transaction.atomic():
+            watermark = SalesRollupService._lock_watermark()
+            for model, _, _ in SalesRollupService.ROLLUPS:
+                model.objects.all().delete()
+            watermark.last_order_id = 0
+            watermark.save(update_fields=['last_order_id', 'updated_at'])
+
+        return SalesRollupService.apply_all(batch_size=batch_size)
+
+    # -------------------- private methods
+    @staticmethod
+    def _advisory_lock(*, shared: bool) -> None:
+        """ Transaction advisory lock between the batch job (exclusive) and status changes (shared). """
+        function = 'pg_advisory_xact_lock_shared' if shared else 'pg_advisory_xact_lock'
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {function}(%s)", [SalesRollupService.LOCK_KEY])
+
+    @staticmethod
+    def _lock_watermark() -> SalesRollupWatermark:
+        """ Exclusive lock for the batch job / rebuild, then the watermark row. """
+        SalesRollupService._advisory_lock(shared=False)
+        watermark, _ = SalesRollupWatermark.objects.get_or_create(
+            name=SalesRollupService.WATERMARK_NAME
+        )
+        return (
+            SalesRollupWatermark.objects
+            .select_for_update()
+            .get(id=watermark.id)
+        )
+
+    @staticmethod
+    def _get_batch_upper_id(from_id: int, batch_size: int) -> int | None:
+        """
+        Highest order id of the next batch, or None if there are no new orders.
+        """
+        limit = timezone.now() - SalesRollupService.SAFETY_LAG
+        ids = (
+            Order.objects
+            .filter(id__gt=from_id, created_at__lte=limit)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        return ids.aggregate(to_id=Max('id'))['to_id']
+
+    @staticmethod
+    def _upsert(
+        model,
+        *,
+        dim_column: str | None,
+        dim_expr: str | None,
+        status_expr: str,
+        sign: int,
+        where: str,
+        params: list,
+        status_params: list | None = None,
+    ) -> None:
+        """
+        Aggregate ItemOrder rows matching `where` and add them to a rollup table.
+
+        `sign=-1` subtracts the amounts (used when an order leaves a status).
+        """
+        table = model._meta.db_table
+        dim_insert = f", {dim_column}" if dim_column else ""
+        dim_select = f", {dim_expr}" if dim_expr else ""
+        dim_group = ", 3" if dim_column else ""
+        sign = "-" if sign < 0 else ""
+
+        # las categorías / marcas sólo se unen cuando la tabla las necesita
+        joins = ""
+        if dim_column:
+            joins = (
+                f"JOIN {Product._meta.db_table} p ON p.id = i.product_id "
+                f"JOIN {Subcategory._meta.db_table} s ON s.id = p.subcategory_id "
+            )
+
+        sql = (
+            f"INSERT INTO {table} (day, status_id{dim_insert}, revenue, units, orders_count) "
+            f"SELECT (o.created_at AT TIME ZONE %s)::date, {status_expr}{dim_select}, "
+            f"{sign}SUM(i.final_price * i.quantity), {sign}SUM(i.quantity), "
+            f"{sign}COUNT(DISTINCT o.id) "
+            f"FROM {ItemOrder._meta.db_table} i "
+            f"JOIN {Order._meta.db_table} o ON o.id = i.order_id "
+            f"{joins}"
+            f"WHERE o.status_id IS NOT NULL AND {where} "
+            f"GROUP BY 1, 2{dim_group} "
+            f"ON CONFLICT (day, status_id{dim_insert}) DO UPDATE SET "
+            f"revenue = {table}.revenue + EXCLUDED.revenue, "
+            f"units = {table}.units + EXCLUDED.units, "
+            f"orders_count = {table}.orders_count + EXCLUDED.orders_count"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [settings.TIME_ZONE, *(status_params or []), *params])
@@ -0,0 +1,110 @@
+# dashboard_sales/services/sales.py
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+from dashboard_sales.models import SalesDaily, SalesDailyCategory, SalesDailyBrand
+
+
+class SalesDashboardService:
+    """
+    Read side of the sales dashboard.
+
+    Every query reads only the rollup tables (one row per day/status[/category|brand]),
+    so the response time depends on the requested date range and not on the
+    number of orders stored.
+    """
+
+    DEFAULT_RANGE_DAYS = 30
+    MAX_RANGE_DAYS = 366
+
+    GROUPS = ('day', 'category', 'brand')
+
+    @staticmethod
+    def get_sales(
+        *,
+        group: str = 'day',
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status_ids: Iterable[int] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Sales totals for the dashboard charts.
+
+        Args:
+            group (str): 'day' (time series), 'category' or 'brand'.
+            date_from (date | None): First day (inclusive). Defaults to `date_to - 30 days`.
+            date_to (date | None): Last day (inclusive). Defaults to today.
+            status_ids (Iterable[int] | None): Only sum these statuses (all if empty).
+
+        Returns:
+            dict: {"date_from", "date_to", "group", "rows": [{<group key>, "revenue", "units", "orders_count"}]}
+        """
+        date_from, date_to = SalesDashboardService._clamp_range(date_from, date_to)
+
+        if group == 'category':
+            qs = SalesDailyCategory.objects.values('category_id', name=F('category__name'))
+            order_by = '-revenue'
+        elif group == 'brand':
+            qs = SalesDailyBrand.objects.values('brand_id', name=F('brand__name'))
+            order_by = '-revenue'
+        else:
+            group = 'day'
+            qs = SalesDaily.objects.values('day')
+            order_by = 'day'
+
+        qs = qs.filter(day__gte=date_from, day__lte=date_to)
+        status_ids = [s for s in (status_ids or []) if s]
+        if status_ids:
+            qs = qs.filter(status_id__in=status_ids)
+
+        rows = qs.annotate(
+            revenue=Sum('revenue'),
+            units=Sum('units'),
+            orders_count=Sum('orders_count'),
+        ).order_by(order_by)
+
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "group": group,
+            "rows": list(rows),
+        }
+
+    @staticmethod
+    def get_status_totals(*, date_from: date | None = None, date_to: date | None = None) -> list[dict]:
+        """
+        Totals per status for the range (e.g. paid vs cancelled widgets).
+        """
+        date_from, date_to = SalesDashboardService._clamp_range(date_from, date_to)
+        return list(
+            SalesDaily.objects
+            .filter(day__gte=date_from, day__lte=date_to)
+            .values('status_id', status_name=F('status__name'))
+            .annotate(
+                revenue=Sum('revenue'),
+                units=Sum('units'),
+                orders_count=Sum('orders_count'),
+            )
+            .order_by('status_id')
+        )
+
+    # -------------------- private methods
+    @staticmethod
+    def _clamp_range(date_from: date | None, date_to: date | None) -> tuple[date, date]:
+        """
+        Fill defaults and limit the range to MAX_RANGE_DAYS.
+        """
+        date_to = date_to or timezone.localdate()
+        date_from = date_from or date_to - timedelta(days=SalesDashboardService.DEFAULT_RANGE_DAYS)
+
+        if date_from > date_to:
+            date_from, date_to = date_to, date_from
+
+        max_range = timedelta(days=SalesDashboardService.MAX_RANGE_DAYS)
+        if date_to - date_from > max_range:
+            date_from = date_to - max_range
+
+        return date_from, date_to
@@ -0,0 +1,115 @@
+import pytest
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.db import connection, transaction
+from django.utils import timezone
+
+from dashboard_sales.models import SalesDaily, SalesDailyBrand, SalesDailyCategory
+from dashboard_sales.services.rollups import SalesRollupService
+from dashboard_sales.services.sales import SalesDashboardService
+
+# others apps
+from orders.enums import StatusOrderEnum
+from orders.models import Order, ItemOrder, StatusOrder
+from orders.services.orders import OrderService
+from products.models.product import Product
+
+
+@pytest.fixture
+def statuses(db):
+    for status in (StatusOrderEnum.PENDING, StatusOrderEnum.PAYMENT_CONFIRMED):
+        StatusOrder.objects.get_or_create(id=status.value, defaults={"name": status.label})
+
+
+@pytest.fixture
+def orders(db, user, statuses):
+    product = Product.objects.create(
+        name="Peluche Umbreon", price=Decimal("1000"), stock=10, available=True
+    )
+
+    created = []
+    for quantity in (1, 3):
+        order = Order.objects.create(user=user, status_id=StatusOrderEnum.PENDING)
+        ItemOrder.objects.create(
+            order=order, product=product, quantity=quantity, final_price=Decimal("1000")
+        )
+        created.append(order)
+
+    # fuera del SAFETY_LAG para que el batch las tome
+    Order.objects.filter(user=user).update(created_at=timezone.now() - timedelta(minutes=5))
+    return created
+
+
+@pytest.mark.django_db
+def test_batch_rolls_up_new_orders_once(orders):
+    result = SalesRollupService.apply_new_orders()
+    assert result["orders"] == 2
+    assert result["to_id"] == orders[-1].id
+
+    row = SalesDaily.objects.get(status_id=StatusOrderEnum.PENDING)
+    assert row.revenue == Decimal("4000.00")
+    assert row.units == 4
+    assert row.orders_count == 2
+    assert SalesDailyCategory.objects.get().units == 4
+    assert SalesDailyBrand.objects.get().orders_count == 2
+
+    # el watermark evita contar dos veces
+    assert SalesRollupService.apply_new_orders()["orders"] == 0
+    assert SalesDaily.objects.get(status_id=StatusOrderEnum.PENDING).orders_count == 2
+
+
+@pytest.mark.django_db
+def test_status_change_moves_rolled_up_amounts(orders):
+    SalesRollupService.apply_new_orders()
+
+    OrderService.change_status(order_id=orders[1].id, status_id=StatusOrderEnum.PAYMENT_CONFIRMED)
+
+    pending = SalesDaily.objects.get(status_id=StatusOrderEnum.PENDING)
+    confirmed = SalesDaily.objects.get(status_id=StatusOrderEnum.PAYMENT_CONFIRMED)
+    assert (pending.units, pending.orders_count) == (1, 1)
+    assert (confirmed.units, confirmed.orders_count) == (3, 1)
+    assert confirmed.revenue == Decimal("3000.00")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_status_changes_of_one_order_do_not_drift(orders):
+    StatusOrder.objects.get_or_create(id=StatusOrderEnum.CANCELLED.value, defaults={"name": "Cancelada"})
+    SalesRollupService.apply_new_orders()
+    order_id = orders[1].id
+
+    def cancel():
+        try:
+            OrderService.change_status(order_id=order_id, status_id=StatusOrderEnum.CANCELLED)
+        finally:
+            connection.close()
+
+    # el segundo cambio arranca mientras el primero todavia no hizo commit
+    with transaction.atomic():
+        OrderService.change_status(order_id=order_id, status_id=StatusOrderEnum.PAYMENT_CONFIRMED)
+        other = threading.Thread(target=cancel)
+        other.start()
+        time.sleep(0.5)
+    other.join()
+
+    units = dict(SalesDaily.objects.values_list('status_id', 'units'))
+    assert units == {
+        StatusOrderEnum.PENDING: 1,
+        StatusOrderEnum.PAYMENT_CONFIRMED: 0,
+        StatusOrderEnum.CANCELLED: 3,
+    }
+    assert SalesDailyBrand.objects.filter(status_id=StatusOrderEnum.CANCELLED).get().units == 3
+
+
+@pytest.mark.django_db
+def test_dashboard_reads_rollups(orders, django_assert_num_queries):
+    SalesRollupService.apply_new_orders()
+
+    with django_assert_num_queries(1):
+        sales = SalesDashboardService.get_sales(
+            group="day", status_ids=[StatusOrderEnum.PENDING]
+        )
+
+    assert len(sales["rows"]) == 1
+    assert sales["rows"][0]["revenue"] == Decimal("4000.00")
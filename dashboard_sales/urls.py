@@ -0,0 +1,9 @@
+
+
+from django.urls import path
+from dashboard_sales.views_api import SalesDashboardAPI
+
+
+urlpatterns = [
+    path('api/dashboard/sales/', SalesDashboardAPI.as_view(), name='dashboard_sales'),
+]
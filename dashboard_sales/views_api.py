@@ -0,0 +1,42 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from core.permissions import IsAdminOrSuperUser
+from core.utils.utils_basic import valid_date_or_None, valid_id_or_None
+
+from dashboard_sales.services.sales import SalesDashboardService
+
+
+class SalesDashboardAPI(APIView):
+    """
+    GET /api/dashboard/sales/?group=day|category|brand&date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&status=4&status=5
+
+    Serves the sales charts from the daily rollup tables, never from `orders_order`.
+    """
+    # Verificar si es role == 'admin' o user.id == 1
+    permission_classes = [IsAuthenticated, IsAdminOrSuperUser]
+
+    def get(self, request):
+        group = request.GET.get('group', 'day')
+        if group not in SalesDashboardService.GROUPS:
+            return Response(
+                {"success": False, "detail": f"group debe ser uno de {', '.join(SalesDashboardService.GROUPS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        date_from = valid_date_or_None(request.GET.get('date_from'))
+        date_to = valid_date_or_None(request.GET.get('date_to'))
+        status_ids = [valid_id_or_None(s) for s in request.GET.getlist('status')]
+
+        sales = SalesDashboardService.get_sales(
+            group=group,
+            date_from=date_from,
+            date_to=date_to,
+            status_ids=status_ids,
+        )
+        sales["statuses"] = SalesDashboardService.get_status_totals(
+            date_from=sales["date_from"], date_to=sales["date_to"]
+        )
+        return Response({"success": True, **sales}, status=status.HTTP_200_OK)
@@ -28,6 +28,18 @@ DEBUG = env('DEBUG')
 MERCADO_PAGO_PUBLIC_KEY = env('MERCADO_PAGO_PUBLIC_KEY')
 MERCADO_PAGO_ACCESS_TOKEN = env('MERCADO_PAGO_ACCESS_TOKEN')
 
+# Mercado Pago HTTP client (payments/gateway.py). The API url can point to a local stub server
+MERCADO_PAGO_API_URL = env('MERCADO_PAGO_API_URL', default='https://api.mercadopago.com')
+MERCADO_PAGO_CONNECT_TIMEOUT = env.float('MERCADO_PAGO_CONNECT_TIMEOUT', default=3.05)   # seconds
+MERCADO_PAGO_READ_TIMEOUT = env.float('MERCADO_PAGO_READ_TIMEOUT', default=5.0)         # seconds
+MERCADO_PAGO_MAX_RETRIES = env.int('MERCADO_PAGO_MAX_RETRIES', default=2)
+MERCADO_PAGO_BREAKER_THRESHOLD = env.int('MERCADO_PAGO_BREAKER_THRESHOLD', default=5)  # consecutive failures
+MERCADO_PAGO_BREAKER_RESET = env.float('MERCADO_PAGO_BREAKER_RESET', default=30.0)     # seconds open
+
+# Payment notifications (payments/services/notifications.py). Empty url -> BASE_URL_PAGE + webhook route
+MERCADO_PAGO_NOTIFICATION_URL = env('MERCADO_PAGO_NOTIFICATION_URL', default='')
+MERCADO_PAGO_WEBHOOK_SECRET = env('MERCADO_PAGO_WEBHOOK_SECRET', default='')   # x-signature check
+
 # Image hosting service (ImgBB) API Key
 IMGBB_KEY = env('IMG_BB_KEY') 
 
@@ -117,8 +129,8 @@ INSTALLED_APPS = [
     
     # --- ANALYTICS AND BACKOFFICE ---
     # 'dashboard',       # General administration dashboard
-    # 'dashboard_sales', # Specialized sales analytics
-    # 'audit',           # Logging and system activity tracking
+    'dashboard_sales',   # Specialized sales analytics
+    'audit',           # Logging and system activity tracking
     
     'contact',         # Contact forms and support (email smtp)
 ]
@@ -214,6 +226,13 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # Set the default type for auto-generated primary keys
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# --- AUDIT TRAIL ---
+# Audit rows are buffered in-process and written in batches by a background
+# thread (audit/services/audit_buffer.py): every N rows or T milliseconds.
+AUDIT_ASYNC = env.bool('AUDIT_ASYNC', default=True)   # False: bulk_create on commit, no thread
+AUDIT_FLUSH_SIZE = env.int('AUDIT_FLUSH_SIZE', default=500)
+AUDIT_FLUSH_INTERVAL_MS = env.int('AUDIT_FLUSH_INTERVAL_MS', default=500)
+
 
 # ----------------------------------------------------------------------------------------- 
 # DJANGO COMPRESSOR CONFIGURATION 
@@ -37,6 +37,10 @@ class StoreImage(models.Model):
     store = models.ForeignKey('Store', related_name='images', on_delete=models.CASCADE)
     image_type = models.CharField(max_length=10, choices=IMAGE_TYPE, default='header')
     image_url = models.URLField(blank=True, null=True)
+    # archivo compartido (deduplicado por hash) detras de image_url
+    stored_image = models.ForeignKey(
+        'core.StoredImage', null=True, blank=True, on_delete=models.SET_NULL, related_name='store_images'
+    )
     main_image = models.BooleanField(default=False)
     available = models.BooleanField(default=False)
 
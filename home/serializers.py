@@ -66,6 +66,8 @@ class StoreSerializer(serializers.ModelSerializer):
 
 
 from products import utils
+from core.utils.image_store import stored_image_ids
+from core.utils.image_variants import variant_urls
 class StoreImageSerializer(serializers.ModelSerializer):
     """ 
         data_example = {
@@ -75,6 +77,10 @@ class StoreImageSerializer(serializers.ModelSerializer):
         }
     """
     image_url = serializers.CharField(required=False, allow_null=True)
+    image_variants = serializers.SerializerMethodField()    # thumb / card / detail para srcset
+    
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image_url)
     
     def validate_main_image(self, value):
         is_new_main = utils.get_valid_bool(value, field='Main Imagen.')
@@ -112,6 +118,7 @@ class StoreImageSerializer(serializers.ModelSerializer):
         return value
 
     def update(self, instance, validated_data):
+        self._link_stored_image(validated_data)
         is_new_main = validated_data.get('main_image', self.instance.main_image)
         is_actived = validated_data.get('available', self.instance.available)
         # Get other active headers for this store, excluding the current one
@@ -141,6 +148,7 @@ class StoreImageSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
     
     def create(self, validated_data):
+        self._link_stored_image(validated_data)
         is_new_main = validated_data.get('main_image')
         is_actived = validated_data.get('available')
         # Get other active headers for this store, excluding the current one
@@ -169,9 +177,15 @@ class StoreImageSerializer(serializers.ModelSerializer):
         
         return StoreImage.objects.create(**validated_data)
 
+    def _link_stored_image(self, validated_data):
+        # la url viene del endpoint de upload: se referencia el archivo compartido (si es nuestro)
+        if 'image_url' in validated_data:
+            url = validated_data['image_url']
+            validated_data['stored_image_id'] = stored_image_ids([url]).get(url)
+
     class Meta:
         model = StoreImage
-        fields = ['image_url', 'main_image', 'available']
+        fields = ['image_url', 'image_variants', 'main_image', 'available']
 
         extra_kwargs = {
             'image_url': {'required': False},
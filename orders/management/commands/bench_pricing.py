@@ -0,0 +1,88 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from orders.models import ItemOrder
+from orders.services.pricing import OrderPricingService
+from products.models.product import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark del pricing del checkout: compara el calculo anterior "
+        "(dos pasadas con calc_discount_decimal) contra OrderPricingService. "
+        "No usa la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=50, help="Lineas por carrito.")
+        parser.add_argument('--rounds', type=int, default=2000, help="Carritos a calcular.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        products = {
+            i: Product(
+                id=i,
+                subcategory_id=1,   # con los *_id explicitos no se consultan los defaults de las FK
+                brand_id=1,
+                price=Decimal(rng.randint(100, 500000)) / 100,
+                discount=rng.choice((0, 0, 5, 10, 15, 25, 50)),
+            )
+            for i in range(1, options['items'] + 1)
+        }
+        quantities = {i: rng.randint(1, 5) for i in products}
+        rounds = options['rounds']
+
+        legacy = self._run(lambda: _legacy_pricing(products, quantities), rounds)
+        pipeline = self._run(
+            lambda: OrderPricingService.price_order(
+                products=products,
+                products_ids_qty=quantities,
+                shipment_cost=Decimal("1500.00"),
+            ),
+            rounds,
+        )
+
+        # ambos calculos tienen que dar exactamente lo mismo
+        expected = _legacy_pricing(products, quantities)
+        result = OrderPricingService.price_order(
+            products=products, products_ids_qty=quantities, shipment_cost=Decimal("1500.00")
+        )
+        if result["subtotal"] != expected:
+            self.stderr.write(self.style.ERROR(f"Subtotal distinto: {result['subtotal']} != {expected}"))
+            return
+
+        self.stdout.write(f"{options['items']} items x {rounds} carritos")
+        self.stdout.write(f"  legacy   : {legacy * 1e6 / rounds:8.1f} us/carrito")
+        self.stdout.write(f"  pipeline : {pipeline * 1e6 / rounds:8.1f} us/carrito")
+        self.stdout.write(self.style.SUCCESS(f"  speedup  : {legacy / pipeline:.2f}x"))
+
+    @staticmethod
+    def _run(func, rounds: int) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return time.perf_counter() - start
+
+
+def _legacy_pricing(products: dict, quantities: dict) -> Decimal:
+    """ Calculo previo de OrderService._create_order_pending (dos pasadas). """
+    subtotal = Decimal("0.00")
+    for product_id, product in products.items():
+        subtotal += product.calc_discount_decimal() * quantities.get(product_id)
+
+    items = []
+    for product_id, product in products.items():
+        items.append(
+            ItemOrder(
+                product=product,
+                discount=product.discount,
+                original_price=product.price,
+                quantity=quantities.get(product_id),
+                final_price=product.calc_discount_decimal(),
+            )
+        )
+    return subtotal
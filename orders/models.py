@@ -2,6 +2,7 @@
 
 # Create your models here.
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class StatusOrder(models.Model):
@@ -113,9 +114,28 @@ class Order(models.Model):
     email = models.EmailField(blank=True, null=True)
     cellphone = models.CharField(max_length=15, blank=True, null=True)
     detail_order = models.TextField(blank=True, null=True)
+    
+    # Denormalized read model (items, shipment, payment, status and totals).
+    # Written once at order creation and only patched on status changes,
+    # see orders/services/snapshots.py
+    snapshot = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    
+    # Mercado Pago preference of the pending order. Reused while it has not
+    # expired and the payment payload did not change, see payments/utils_for_mp.py
+    mp_preference_id = models.CharField(max_length=64, blank=True, null=True)
+    mp_preference_hash = models.CharField(max_length=64, blank=True, null=True)
+    mp_preference_expires_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']  # ordenar por fecha si agregas `de created`
+        indexes = [
+            # Keyset pagination on (updated_at, id) for order lists (see OrderService)
+            models.Index(fields=['-updated_at', '-id'], name='order_updated_id_idx'),
+            models.Index(fields=['user', '-updated_at', '-id'], name='order_user_updated_id_idx'),
+            models.Index(fields=['status', '-updated_at', '-id'], name='order_status_updated_id_idx'),
+            # Date range filters in the admin order list
+            models.Index(fields=['created_at'], name='order_created_at_idx'),
+        ]
     
 
 
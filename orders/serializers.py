@@ -5,6 +5,7 @@ from rest_framework.exceptions import ValidationError
 from django.utils.html import strip_tags
 
 from orders.models import ShipmentMethod, PaymentMethod
+from orders.enums import StatusOrderEnum
 
 
 class PaymentSerializer(serializers.ModelSerializer):
@@ -193,3 +194,18 @@ class OrderFormSerializer(serializers.Serializer):
         return data
 
 
+
+
+class BulkOrderStatusSerializer(serializers.Serializer):
+    """
+    Payload of the bulk status change endpoint.
+
+    Example:
+        {"order_ids": [10, 11, 12], "status_id": 5}
+    """
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+    status_id = serializers.ChoiceField(choices=StatusOrderEnum.choices)
@@ -1,20 +1,22 @@
-from django.db.models import F
+from django.db.models import F, QuerySet
+from django.db.models.fields.json import KeyTransform
 from django.db import transaction
 from django.utils import timezone
 from rest_framework.exceptions import NotFound, ValidationError
 
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Any
-from decimal import Decimal
 
 # orders app
 from orders.models import (
-    Order, OrderDraft, ShipmentMethod, 
-    ShipmentOrder, PaymentMethod, ItemOrder
+    Order, OrderDraft, ShipmentOrder, ItemOrder
 )
 from orders.enums import StatusOrderEnum
+from orders.services.snapshots import OrderSnapshotService
+from orders.services.pricing import OrderPricingService
 
 # others apps
+from core.utils.utils_pagination import paginate_keyset
 from cart.models import CartItem
 from products.models.product import Product
 
@@ -27,66 +29,121 @@ class OrderService:
     keeping ORM queries out of views and improving reusability.
     """
 
+    # Page sizes for order lists (keyset pagination)
+    USER_ORDERS_PAGE_SIZE = 20
+    ADMIN_ORDERS_PAGE_SIZE = 50
+    MAX_ORDERS_PAGE_SIZE = 100
+
+    # values used by order list views (profile tabs)
+    VALUES_ORDERS_LIST = ('id', 'created_at', 'updated_at', 'total')
+
+    # columnas del export de ordenes (CSV / JSON lines)
+    VALUES_ORDERS_EXPORT = (
+        'id', 'created_at', 'updated_at', 'status_name', 'user_id', 'name', 'dni', 'email', 'cellphone',
+        'payment_name', 'shipment_name', 'shipment_cost', 'discount_coupon', 'total', 'order_items',
+    )
+
     @staticmethod
-    def get_user_orders(user) -> list[dict[str, Any]]:
+    def get_user_orders(
+        user,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+    ) -> dict[str, Any]:
         """
-        Retrieve a list of orders belonging to a specific user.
+        Retrieve one page of orders belonging to a specific user.
 
         The query is optimized for list views (e.g. profile order history)
-        by returning dictionaries instead of full model instances.
+        by returning dictionaries instead of full model instances, and uses
+        keyset pagination on `(updated_at, id)` so each page costs the same
+        no matter how many orders the user has.
 
         Args:
             user (User): Authenticated Django user whose orders will be retrieved.
+            cursor (str | None): Cursor returned by the previous page.
+            page_size (int | None): Rows per page (defaults to USER_ORDERS_PAGE_SIZE).
 
         Returns:
-            list[dict]: A list of dictionaries with the following keys:
-                - id (int): Order ID
-                - created_at (datetime): Order creation timestamp
-                - total (Decimal): Total amount of the order
-                - status__name (str): Human-readable order status
+            dict: {
+                "orders": list[dict] with the keys:
+                    - id (int): Order ID
+                    - created_at (datetime): Order creation timestamp
+                    - updated_at (datetime): Last update timestamp (pagination key)
+                    - total (Decimal): Total amount of the order
+                    - status_name (str): Human-readable order status
+                "next_cursor": str | None
+            }
 
         Notes:
             - Results are ordered by `updated_at` descending.
             - Authentication and authorization should be handled
               by the caller (view or API layer).
         """
-        qs = (
-            Order.objects
-            .filter(user=user)
-            .values('id', 'created_at', 'total', status_name=F('status__name'))
-            .order_by('-updated_at')
-        )
+        qs = Order.objects.filter(user=user)
 
-        return list(qs)
+        return OrderService._paginate_orders(
+            qs,
+            cursor=cursor,
+            page_size=page_size or OrderService.USER_ORDERS_PAGE_SIZE,
+        )
     
     
     @staticmethod
     def get_admin_orders(
         order_id: int | None = None, 
         status_id: int | None = None,
-    ) -> list[dict[str, Any]]:
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        cursor: str | None = None,
+        page_size: int | None = None,
+    ) -> dict[str, Any]:
         """
-        Retrieve orders for admin users with optional filters.
+        Retrieve one page of orders for admin users with optional filters.
 
         Args:
-            order_id (int | None): Filter by specific order ID.
+            order_id (int | None): Filter by specific order ID (ignores other filters).
             status_id (int | None): Filter by order status ID.
+            date_from (date | None): Only orders created on or after this day.
+            date_to (date | None): Only orders created on or before this day.
+            cursor (str | None): Cursor returned by the previous page.
+            page_size (int | None): Rows per page (defaults to ADMIN_ORDERS_PAGE_SIZE).
 
         Returns:
-            list[dict[str, Any]]: List of order dictionaries.
+            dict[str, Any]: {"orders": list[dict], "next_cursor": str | None}
+                (same row structure as `get_user_orders`).
         """
-        qs = Order.objects.all()
-            
-        if order_id:
-            qs = qs.filter(id=order_id)
-            
-        elif status_id:
-            qs = qs.filter(status_id=status_id)
+        qs = OrderService._admin_orders_qs(
+            order_id=order_id, status_id=status_id, date_from=date_from, date_to=date_to
+        )
+        return OrderService._paginate_orders(
+            qs,
+            cursor=cursor,
+            page_size=page_size or OrderService.ADMIN_ORDERS_PAGE_SIZE,
+        )
 
-        return list(
-            qs
-            .values('id', 'created_at', 'total', status_name=F('status__name'))
-            .order_by('-updated_at')
+    @staticmethod
+    def qs_for_export(
+        *,
+        status_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> QuerySet:
+        """
+        Order export rows (VALUES_ORDERS_EXPORT keys), ordered by id, with the
+        same filters as `get_admin_orders`. The items come from the snapshot
+        (no join with ItemOrder).
+
+        Meant to be consumed with `.iterator()`, see core/utils/utils_export.py.
+        """
+        qs = OrderService._admin_orders_qs(status_id=status_id, date_from=date_from, date_to=date_to)
+        return qs.order_by('id').values(
+            'id', 'created_at', 'updated_at', 'user_id', 'name', 'dni', 'email', 'cellphone',
+            'shipment_cost', 'discount_coupon', 'total',
+            status_name=F('status__name'),
+            payment_name=F('payment__name'),
+            shipment_name=F('shipment__method__name'),
+            order_items=KeyTransform('items', 'snapshot'),
         )
     
     @staticmethod
@@ -147,7 +204,80 @@ class OrderService:
 
             return order
 
+    @staticmethod
+    def change_status(*, order_id: int, status_id: int) -> bool:
+        """
+        Change the status of an order keeping its snapshot in sync.
+
+        Args:
+            order_id (int): Order ID.
+            status_id (int): New status (see StatusOrderEnum).
+
+        Returns:
+            bool: True if the order was updated, False if it does not exist.
+        """
+        updated = OrderSnapshotService.set_status(order_ids=[order_id], status_id=status_id)
+        return updated > 0
+
     # -------------------- private methods
+    @staticmethod
+    def _paginate_orders(qs, *, cursor: str | None, page_size: int) -> dict[str, Any]:
+        """
+        Shared keyset pagination for order lists.
+        """
+        page_size = max(1, min(page_size, OrderService.MAX_ORDERS_PAGE_SIZE))
+
+        qs = qs.values(*OrderService.VALUES_ORDERS_LIST, status_name=F('status__name'))
+        orders, next_cursor = paginate_keyset(qs, cursor=cursor, page_size=page_size)
+
+        return {
+            "orders": orders,
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def _admin_orders_qs(
+        *,
+        order_id: int | None = None,
+        status_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> QuerySet:
+        qs = Order.objects.all()
+
+        if order_id:
+            return qs.filter(id=order_id)
+
+        if status_id:
+            qs = qs.filter(status_id=status_id)
+
+        # rangos con datetimes aware en vez de __date para poder usar el indice
+        if date_from:
+            qs = qs.filter(created_at__gte=OrderService._start_of_day(date_from))
+
+        if date_to:
+            qs = qs.filter(created_at__lt=OrderService._start_of_day(date_to + timedelta(days=1)))
+
+        return qs
+
+    @staticmethod
+    def _start_of_day(day: date) -> datetime:
+        """
+        Aware datetime for 00:00 of the given day in the current timezone.
+        """
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    @staticmethod
+    def _get_pending_status() -> dict:
+        """
+        Status payload stored in the snapshot of new orders.
+        """
+        status = OrderSnapshotService.get_status_payload(StatusOrderEnum.PENDING)
+        if status is None:
+            # tabla maestra sin cargar, usamos el label del enum
+            status = {"id": StatusOrderEnum.PENDING.value, "name": StatusOrderEnum.PENDING.label}
+        return status
+
     @staticmethod
     def _create_order_pending(
         *,
@@ -168,7 +298,7 @@ class OrderService:
         1. Validate and fetch shipping & payment methods.
         2. Create a ShipmentOrder associated with the Order.
         3. Compute subtotal, discounts, and final total.
-        4. Create the Order with status = PENDING.
+        4. Create the Order with status = PENDING and its denormalized snapshot.
         5. Create ItemOrder rows in bulk.
         6. Clear items from the user's cart.
 
@@ -220,26 +350,8 @@ class OrderService:
                 "payment_method_id": "3"
             }
         """
-        # .values() does not work with get(), so we simulate by using filter + first()
-        shipping_method = (
-            ShipmentMethod.objects
-            .filter(id=order_data["shipping_method_id"])
-            .values("id", "price")
-            .first()
-        )
-        if not shipping_method:
-            # propagar error 400 drf
-            raise ValidationError("Método de envío no válido")
-
-        payment_method = (
-            PaymentMethod.objects
-            .filter(id=order_data["payment_method_id"])
-            .values("id", "time")
-            .first()
-        )
-        if not payment_method:
-            # propagar error 400 drf
-            raise ValidationError("Método de pago no válido")
+        # Methods come from the in-process cache (no queries on a warm worker)
+        shipping_method, payment_method = OrderPricingService.get_checkout_methods(order_data)
 
         # Create shipment entity linked to the order
         shipment = ShipmentOrder.objects.create(
@@ -253,25 +365,20 @@ class OrderService:
             detail=order_data.get("detail", ""),
         )
 
-        # --- calcular subtotal primero ---
-        subtotal = Decimal("0.00")
-
-        for product_id, product in products.items():
-            quantity = products_ids_qty.get(product_id)
-            price_decimal = product.calc_discount_decimal()
-            subtotal += price_decimal * quantity  # Decimal * int = Decimal
-
-        # ---------------- Calcular total
+        # --- precios, subtotal, total e items en una sola pasada (la orden se asigna despues del create) ---
         # maybe more logic like coupon model in the future
-        discount_coupon = Decimal("0.00")
-        total = subtotal + shipping_method["price"] - discount_coupon
+        pricing = OrderPricingService.price_order(
+            products=products,
+            products_ids_qty=products_ids_qty,
+            shipment_cost=shipping_method["price"],
+        )
+        order_items = pricing["items"]
 
         # Expiration window for order payment
         expire_at = timezone.now() + timedelta(hours=payment_method["time"])
         name = f'{order_data.get("first_name", "")} {order_data.get("last_name", "")}'
 
-        # Create new Order
-        new_order = Order.objects.create(
+        new_order = Order(
             user=user,
             status_id=StatusOrderEnum.PENDING,   # status por defecto pending
             payment_id=payment_method["id"],
@@ -282,28 +389,25 @@ class OrderService:
             dni=order_data.get("dni", ""),
             detail_order=order_data.get("detail_order", ""),
             expire_at=expire_at,
-            shipment_cost=shipping_method["price"],
-            discount_coupon=discount_coupon,
-            total=total,
+            shipment_cost=pricing["shipment_cost"],
+            discount_coupon=pricing["discount_coupon"],
+            total=pricing["total"],
         )
 
+        # Snapshot denormalizado, se guarda en el mismo INSERT de la orden
+        new_order.snapshot = OrderSnapshotService.build(
+            order=new_order,
+            shipping_method=shipping_method,
+            payment_method=payment_method,
+            status=OrderService._get_pending_status(),
+            items=order_items,
+            subtotal=pricing["subtotal"],
+        )
+        new_order.save()
+
         # --------------- Crear order items asociados en bulk
-        order_items = []
-
-        for product_id, product in products.items():
-            quantity = products_ids_qty.get(product_id)
-            price_decimal = product.calc_discount_decimal()
-
-            order_items.append(
-                ItemOrder(
-                    order=new_order,
-                    product=product,
-                    discount=product.discount,
-                    original_price=product.price,
-                    quantity=quantity,
-                    final_price=price_decimal,
-                )
-            )
+        for item in order_items:
+            item.order = new_order
 
         ItemOrder.objects.bulk_create(order_items)
 
@@ -364,8 +468,13 @@ class OrderService:
         products = (
             Product.objects
             .filter(id__in=products_ids_qty.keys())
-            .select_for_update()
-            .only("id", "name", "stock", "stock_reserved", "available", "price", "discount")
+            .select_related("subcategory__category")
+            # lock only product rows, the joined taxonomy is read-only here
+            .select_for_update(of=("self",))
+            .only(
+                "id", "name", "stock", "stock_reserved", "available", "price", "discount",
+                "main_image", "subcategory__category__name",
+            )
             .in_bulk()   # returns {id: Product}
         )
 
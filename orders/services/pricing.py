@@ -0,0 +1,182 @@
+# orders/services/pricing.py
+import threading
+import time
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any
+
+from rest_framework.exceptions import ValidationError
+
+from orders.models import ItemOrder, PaymentMethod, ShipmentMethod
+
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+# factores de descuento precalculados (discount es un entero 0..100)
+# igual que Product.calc_discount_decimal: price * (1 - discount / 100)
+DISCOUNT_FACTORS = {
+    discount: Decimal(1) - Decimal(discount) / Decimal(100)
+    for discount in range(0, 101)
+}
+
+
+class CheckoutMethodsCache:
+    """
+    Small in-process cache of the shipment and payment method rows.
+
+    Both tables have a handful of rows and change only from the admin panel,
+    so checkout reads them from process memory instead of running two queries
+    per order. Each process reloads the rows after `TTL` seconds, and the
+    admin APIs call `invalidate()` after editing a method (other workers pick
+    the change up when their TTL expires).
+    """
+
+    TTL = 300  # seconds
+
+    _lock = threading.Lock()
+    _expires_at = 0.0
+    _shipments: dict[int, dict[str, Any]] = {}
+    _payments: dict[int, dict[str, Any]] = {}
+
+    @classmethod
+    def get_shipment_method(cls, method_id) -> dict[str, Any] | None:
+        """ {"id", "name", "price"} of a ShipmentMethod, None if it does not exist. """
+        cls._ensure_loaded()
+        return cls._shipments.get(cls._as_int(method_id))
+
+    @classmethod
+    def get_payment_method(cls, method_id) -> dict[str, Any] | None:
+        """ {"id", "name", "time"} of a PaymentMethod, None if it does not exist. """
+        cls._ensure_loaded()
+        return cls._payments.get(cls._as_int(method_id))
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._expires_at = 0.0
+
+    # -------------------- private methods
+    @classmethod
+    def _ensure_loaded(cls) -> None:
+        if time.monotonic() < cls._expires_at:
+            return
+
+        with cls._lock:
+            if time.monotonic() < cls._expires_at:   # otro hilo ya lo recargó
+                return
+            cls._shipments = {
+                row["id"]: row
+                for row in ShipmentMethod.objects.values("id", "name", "price")
+            }
+            cls._payments = {
+                row["id"]: row
+                for row in PaymentMethod.objects.values("id", "name", "time")
+            }
+            cls._expires_at = time.monotonic() + cls.TTL
+
+    @staticmethod
+    def _as_int(value) -> int | None:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+
+class OrderPricingService:
+    """
+    Pricing pipeline of the checkout.
+
+    Computes line prices, subtotal, coupon and total in a single pass over the
+    cart and builds the unsaved `ItemOrder` rows at the same time, so the
+    caller can bulk-insert them right after the order. No queries are run
+    here (methods come from `CheckoutMethodsCache`).
+    """
+
+    @staticmethod
+    def get_checkout_methods(order_data: dict) -> tuple[dict, dict]:
+        """
+        Resolve the shipment and payment method selected in the checkout form.
+
+        Returns:
+            tuple: (shipping_method {"id", "name", "price"}, payment_method {"id", "name", "time"})
+
+        Raises:
+            ValidationError: If any of the methods does not exist.
+        """
+        shipping_method = CheckoutMethodsCache.get_shipment_method(order_data.get("shipping_method_id"))
+        if not shipping_method:
+            # propagar error 400 drf
+            raise ValidationError("Método de envío no válido")
+
+        payment_method = CheckoutMethodsCache.get_payment_method(order_data.get("payment_method_id"))
+        if not payment_method:
+            # propagar error 400 drf
+            raise ValidationError("Método de pago no válido")
+
+        return shipping_method, payment_method
+
+    @staticmethod
+    def price_order(
+        *,
+        products: dict,
+        products_ids_qty: dict,
+        shipment_cost: Decimal,
+        discount_coupon: Decimal = ZERO,
+    ) -> dict[str, Any]:
+        """
+        Price every line of the order and build its ItemOrder batch.
+
+        Args:
+            products (dict[int, Product]): Products of the order (with price and discount loaded).
+            products_ids_qty (dict[int, int]): Quantity per product id.
+            shipment_cost (Decimal): Price of the selected shipment method.
+            discount_coupon (Decimal): Coupon amount (no coupons yet, kept for the future).
+
+        Returns:
+            dict: {
+                "items": list[ItemOrder] (unsaved, without order),
+                "subtotal": Decimal,
+                "shipment_cost": Decimal,
+                "discount_coupon": Decimal,
+                "total": Decimal,
+            }
+        """
+        subtotal = ZERO
+        items = []
+
+        for product_id, product in products.items():
+            quantity = products_ids_qty[product_id]
+            final_price = OrderPricingService.line_price(product.price, product.discount)
+            subtotal += final_price * quantity
+
+            items.append(
+                ItemOrder(
+                    product=product,
+                    discount=product.discount,
+                    original_price=product.price,
+                    quantity=quantity,
+                    final_price=final_price,
+                )
+            )
+
+        return {
+            "items": items,
+            "subtotal": subtotal,
+            "shipment_cost": shipment_cost,
+            "discount_coupon": discount_coupon,
+            "total": subtotal + shipment_cost - discount_coupon,
+        }
+
+    @staticmethod
+    def line_price(price: Decimal, discount: int) -> Decimal:
+        """
+        Unit price after discount, same rounding as `Product.calc_discount_decimal()`.
+        """
+        if not isinstance(price, Decimal):   # instancias sin guardar (ej: benchmarks)
+            price = Decimal(str(price))
+
+        factor = DISCOUNT_FACTORS.get(discount)
+        if factor is None:
+            factor = Decimal(1) - Decimal(discount) / Decimal(100)
+        return (price * factor).quantize(CENT, rounding=ROUND_HALF_UP)
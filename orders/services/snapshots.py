@@ -0,0 +1,265 @@
+# orders/services/snapshots.py
+from django.db import transaction
+from django.db.models import F, Func, JSONField, Value
+from django.utils import timezone
+
+from typing import Any, Iterable
+from decimal import Decimal
+
+from orders.models import Order, StatusOrder
+
+# others apps
+from core.clients.sales_client import SalesClient
+
+
+class JSONBSet(Func):
+    """
+    PostgreSQL `jsonb_set(target, path, new_value)` expression.
+
+    Allows patching a single key of a JSONField inside an UPDATE statement,
+    without loading the row into Python.
+    """
+    function = 'jsonb_set'
+    output_field = JSONField()
+
+
+class OrderSnapshotService:
+    """
+    Service responsible for the denormalized order snapshot (`Order.snapshot`).
+
+    Orders do not change after they are created (only their status does), so
+    everything needed to render an order (items, shipment, payment, status and
+    totals) is stored once in a single JSON document. Readers like the order
+    detail page or the Mercado Pago item builder fetch one row by primary key
+    instead of joining five tables on every request.
+
+    Snapshot structure (version 1):
+        {
+            "version": 1,
+            "order": {"name", "email", "subtotal", "shipment_cost", "discount_coupon", "total"},
+            "status": {"id", "name"},
+            "payment": {"id", "name", "time"},
+            "shipment": {"id", "address", "postal_code", "method": {"id", "name", "price"}},
+            "items": [
+                {
+                    "quantity", "final_price", "original_price", "discount",
+                    "product": {"id", "name", "main_image", "category"}
+                },
+            ]
+        }
+
+    Notes:
+        - Decimal values are stored as strings (DjangoJSONEncoder) and converted
+          back to Decimal by `hydrate()`.
+        - Orders created before the snapshot existed have `snapshot=None`;
+          callers must keep a fallback for them.
+    """
+
+    VERSION = 1
+
+    # Decimal fields that are serialized as strings inside the JSON document
+    ORDER_DECIMAL_FIELDS = ('subtotal', 'shipment_cost', 'discount_coupon', 'total')
+    ITEM_DECIMAL_FIELDS = ('final_price', 'original_price')
+
+    @staticmethod
+    def build(
+        *,
+        order: Order,
+        shipping_method: dict,
+        payment_method: dict,
+        status: dict,
+        items: Iterable,
+        subtotal: Decimal,
+    ) -> dict[str, Any]:
+        """
+        Build the snapshot document from in-memory objects (no queries).
+
+        Args:
+            order (Order): The order being created (may still be unsaved, the
+                snapshot is stored in the same INSERT).
+            shipping_method (dict): {"id", "name", "price"} of the ShipmentMethod.
+            payment_method (dict): {"id", "name", "time"} of the PaymentMethod.
+            status (dict): {"id", "name"} of the current StatusOrder.
+            items (Iterable[ItemOrder]): Unsaved or saved ItemOrder instances whose
+                `product` has `name`, `main_image` and `subcategory__category__name` loaded.
+            subtotal (Decimal): Sum of the items final price.
+
+        Returns:
+            dict: The snapshot document ready to be stored in `Order.snapshot`.
+        """
+        shipment = order.shipment
+
+        return {
+            'version': OrderSnapshotService.VERSION,
+            'order': {
+                'name': order.name,
+                'email': order.email,
+                'subtotal': subtotal,
+                'shipment_cost': order.shipment_cost,
+                'discount_coupon': order.discount_coupon,
+                'total': order.total,
+            },
+            'status': {'id': status['id'], 'name': status['name']},
+            'payment': {
+                'id': payment_method['id'],
+                'name': payment_method['name'],
+                'time': payment_method['time'],
+            },
+            'shipment': {
+                'id': shipment.id,
+                'address': shipment.address,
+                'postal_code': shipment.postal_code,
+                'method': {
+                    'id': shipping_method['id'],
+                    'name': shipping_method['name'],
+                    'price': shipping_method['price'],
+                },
+            },
+            'items': [
+                OrderSnapshotService._build_item(item) for item in items
+            ],
+        }
+
+    @staticmethod
+    def get_status_payload(status_id: int) -> dict[str, Any] | None:
+        """
+        Retrieve the `{"id", "name"}` status payload stored in the snapshot.
+        """
+        return (
+            StatusOrder.objects
+            .filter(id=status_id)
+            .values('id', 'name')
+            .first()
+        )
+
+    @staticmethod
+    def set_status(*, order_ids: Iterable[int], status_id: int, locked: bool = False) -> int:
+        """
+        Change the status of one or many orders and patch their snapshot.
+
+        Runs as a single `UPDATE ... SET status_id = ..., snapshot = jsonb_set(...)`,
+        so it costs the same for one order or for hundreds of them.
+        Orders without snapshot (legacy rows) keep `snapshot=NULL`.
+        `updated_at` is set explicitly (`update()` skips auto_now) because the
+        keyset order lists are ordered by it.
+        The orders are locked (SELECT ... FOR UPDATE) and their sales rollups
+        are moved to the new status in the same transaction.
+
+        Args:
+            order_ids (Iterable[int]): IDs of the orders to update.
+            status_id (int): New StatusOrder id (see StatusOrderEnum).
+            locked (bool): The caller already holds the row locks of the orders
+                (e.g. bulk_change_status), skip the SELECT ... FOR UPDATE.
+
+        Returns:
+            int: Number of updated rows.
+        """
+        status = OrderSnapshotService.get_status_payload(status_id)
+        if not status:
+            return 0
+
+        order_ids = list(order_ids)
+        # sin savepoint: si falla el rollup falla toda la transaccion del llamador
+        with transaction.atomic(savepoint=False):
+            # lock de las filas (en orden de id, sin deadlocks entre lotes): dos cambios de la
+            # misma orden se serializan y el segundo lee el estado que dejo el primero
+            if not locked:
+                list(
+                    Order.objects.select_for_update()
+                    .filter(id__in=order_ids)
+                    .order_by('id')
+                    .values_list('id', flat=True)
+                )
+            # antes del UPDATE: los rollups leen el estado anterior de la orden
+            SalesClient.on_orders_status_change(order_ids, status_id)
+
+            return (
+                Order.objects
+                .filter(id__in=order_ids)
+                .update(
+                    status_id=status_id,
+                    updated_at=timezone.now(),
+                    snapshot=JSONBSet(
+                        F('snapshot'),
+                        Value('{status}'),
+                        Value(status, output_field=JSONField()),
+                    ),
+                )
+            )
+
+    @staticmethod
+    def hydrate(snapshot: dict) -> dict[str, Any]:
+        """
+        Convert the stored JSON document back to the types used by templates
+        and services (Decimal for money fields).
+
+        The stored dict is not modified; a new dict is returned.
+        """
+        order = dict(snapshot['order'])
+        for field in OrderSnapshotService.ORDER_DECIMAL_FIELDS:
+            order[field] = OrderSnapshotService._to_decimal(order.get(field))
+
+        shipment = dict(snapshot['shipment'])
+        method = dict(shipment['method'])
+        method['price'] = OrderSnapshotService._to_decimal(method.get('price'))
+        shipment['method'] = method
+
+        items = []
+        for item in snapshot['items']:
+            item = dict(item)
+            for field in OrderSnapshotService.ITEM_DECIMAL_FIELDS:
+                item[field] = OrderSnapshotService._to_decimal(item.get(field))
+            items.append(item)
+
+        return {
+            'order': order,
+            'status': dict(snapshot['status']),
+            'payment': dict(snapshot['payment']),
+            'shipment': shipment,
+            'items': items,
+        }
+
+    @staticmethod
+    def get_detail_row(*, order_id: int, user=None) -> dict[str, Any] | None:
+        """
+        Read the snapshot of an order in a single query by primary key.
+
+        Args:
+            order_id (int): Order ID.
+            user (User | None): If provided and not admin, restricts the lookup
+                to the user's own orders.
+
+        Returns:
+            dict | None: {"id", "created_at", "expire_at", "snapshot"} or None.
+        """
+        qs = Order.objects.filter(id=order_id)
+        if user is not None and user.role != 'admin':
+            qs = qs.filter(user=user)
+
+        return qs.values('id', 'created_at', 'expire_at', 'snapshot').first()
+
+    # -------------------- private methods
+    @staticmethod
+    def _build_item(item) -> dict[str, Any]:
+        product = item.product
+        subcategory = getattr(product, 'subcategory', None)
+        category = subcategory.category.name if subcategory else None
+
+        return {
+            'quantity': item.quantity,
+            'final_price': item.final_price,
+            'original_price': item.original_price,
+            'discount': item.discount,
+            'product': {
+                'id': product.id,
+                'name': product.name,
+                'main_image': product.main_image,
+                'category': category,
+            },
+        }
+
+    @staticmethod
+    def _to_decimal(value) -> Decimal:
+        if value is None or value == '':
+            return Decimal('0.00')
+        return Decimal(str(value))
@@ -0,0 +1,205 @@
+# orders/services/status_transitions.py
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from typing import Any, Iterable
+
+from orders.models import Order, ItemOrder, Invoice
+from orders.enums import StatusOrderEnum
+from orders.services.snapshots import OrderSnapshotService
+
+# others apps
+from products.models.product import Product
+
+
+class OrderStatusTransitionService:
+    """
+    Moves many orders to a new status in one transaction.
+
+    The whole batch costs a fixed number of queries, no matter how many
+    orders or items are involved:
+        1. SELECT ... FOR UPDATE of the orders (set-wise validation).
+        2. One aggregated SUM(quantity) per product for the stock side-effects.
+        3. One UPDATE of `products_product` per stock effect (CASE/WHEN + F()).
+        4. One UPDATE of the invoices (only when confirming payment).
+        5. One UPDATE of the orders status + snapshot (OrderSnapshotService).
+
+    Stock lifecycle:
+        - PENDING / PAYMENT_PENDING: units are reserved (stock -> stock_reserved).
+        - PAYMENT_CONFIRMED / SHIPPED / COMPLETED: units are sold (reservation committed).
+        - CANCELLED / RETURNED: units are back in stock.
+    """
+
+    # estados validos de destino para cada estado actual
+    TRANSITIONS: dict[int, frozenset[int]] = {
+        StatusOrderEnum.PENDING: frozenset({
+            StatusOrderEnum.PAYMENT_PENDING,
+            StatusOrderEnum.PAYMENT_CONFIRMED,
+            StatusOrderEnum.CANCELLED,
+        }),
+        StatusOrderEnum.PAYMENT_PENDING: frozenset({
+            StatusOrderEnum.PAYMENT_CONFIRMED,
+            StatusOrderEnum.CANCELLED,
+        }),
+        StatusOrderEnum.PAYMENT_CONFIRMED: frozenset({
+            StatusOrderEnum.SHIPPED,
+            StatusOrderEnum.COMPLETED,
+            StatusOrderEnum.CANCELLED,
+        }),
+        StatusOrderEnum.SHIPPED: frozenset({StatusOrderEnum.COMPLETED, StatusOrderEnum.RETURNED}),
+        StatusOrderEnum.COMPLETED: frozenset({StatusOrderEnum.RETURNED}),
+        StatusOrderEnum.CANCELLED: frozenset(),
+        StatusOrderEnum.RETURNED: frozenset(),
+    }
+
+    RESERVED = frozenset({StatusOrderEnum.PENDING, StatusOrderEnum.PAYMENT_PENDING})
+    SOLD = frozenset({
+        StatusOrderEnum.PAYMENT_CONFIRMED, StatusOrderEnum.SHIPPED, StatusOrderEnum.COMPLETED
+    })
+    RELEASED = frozenset({StatusOrderEnum.CANCELLED, StatusOrderEnum.RETURNED})
+
+    # stock effects: (F() delta on stock, F() delta on stock_reserved)
+    COMMIT = (0, -1)        # reserved -> sold
+    UNRESERVE = (1, -1)     # reserved -> released
+    RESTOCK = (1, 0)        # sold -> released
+
+    MAX_ORDERS = 1000
+
+    @staticmethod
+    def bulk_change_status(*, order_ids: Iterable[int], status_id: int) -> dict[str, Any]:
+        """
+        Move a list of orders to `status_id`, applying stock and invoice side-effects.
+
+        Orders that cannot be moved (not found, invalid transition or already
+        in the target status) are reported and skipped; the valid ones are
+        updated together. Everything runs in a single transaction.
+
+        Args:
+            order_ids (Iterable[int]): Orders to update (duplicates are ignored).
+            status_id (int): Target status (see StatusOrderEnum).
+
+        Returns:
+            dict: {
+                "status_id": int,
+                "updated": int,
+                "results": [{"order_id", "success", "from_status_id", "detail"}]
+            }
+
+        Raises:
+            ValidationError: If the target status is unknown or the batch is too large.
+        """
+        if status_id not in OrderStatusTransitionService.TRANSITIONS:
+            raise ValidationError("Estado de orden no válido.")
+
+        order_ids = list(dict.fromkeys(order_ids))   # sin duplicados, respeta el orden
+        if len(order_ids) > OrderStatusTransitionService.MAX_ORDERS:
+            raise ValidationError(
+                f"Máximo {OrderStatusTransitionService.MAX_ORDERS} órdenes por operación."
+            )
+
+        with transaction.atomic():
+            current = dict(
+                Order.objects
+                .filter(id__in=order_ids)
+                .select_for_update()
+                .values_list('id', 'status_id')
+            )
+
+            results = []
+            effects: dict[tuple[int, int], list[int]] = {}
+            valid_ids = []
+
+            for order_id in order_ids:
+                from_status = current.get(order_id)
+                detail = OrderStatusTransitionService._validate(order_id in current, from_status, status_id)
+                results.append({
+                    "order_id": order_id,
+                    "success": detail is None,
+                    "from_status_id": from_status,
+                    "detail": detail,
+                })
+                if detail:
+                    continue
+
+                valid_ids.append(order_id)
+                effect = OrderStatusTransitionService._get_stock_effect(from_status, status_id)
+                if effect:
+                    effects.setdefault(effect, []).append(order_id)
+
+            if valid_ids:
+                for effect, ids in effects.items():
+                    OrderStatusTransitionService._apply_stock_effect(ids, effect)
+
+                if status_id == StatusOrderEnum.PAYMENT_CONFIRMED:
+                    Invoice.objects.filter(order_id__in=valid_ids, is_paid=False).update(
+                        is_paid=True, paid_at=timezone.now()
+                    )
+
+                OrderSnapshotService.set_status(order_ids=valid_ids, status_id=status_id, locked=True)
+
+        return {
+            "status_id": status_id,
+            "updated": len(valid_ids),
+            "results": results,
+        }
+
+    # -------------------- private methods
+    @staticmethod
+    def _validate(exists: bool, from_status: int | None, to_status: int) -> str | None:
+        """
+        Error message for an invalid transition, None if it is allowed.
+        """
+        if not exists:
+            return "Orden no encontrada."
+        if from_status == to_status:
+            return "La orden ya se encuentra en ese estado."
+        allowed = OrderStatusTransitionService.TRANSITIONS.get(from_status, frozenset())
+        if to_status not in allowed:
+            return "Transición de estado no permitida."
+        return None
+
+    @staticmethod
+    def _get_stock_effect(from_status: int, to_status: int) -> tuple[int, int] | None:
+        cls = OrderStatusTransitionService
+        if from_status in cls.RESERVED and to_status in cls.SOLD:
+            return cls.COMMIT
+        if from_status in cls.RESERVED and to_status in cls.RELEASED:
+            return cls.UNRESERVE
+        if from_status in cls.SOLD and to_status in cls.RELEASED:
+            return cls.RESTOCK
+        return None
+
+    @staticmethod
+    def _apply_stock_effect(order_ids: list[int], effect: tuple[int, int]) -> None:
+        """
+        Apply one stock effect for all the items of the given orders.
+
+        Quantities are summed per product in the database and written back
+        with a single `UPDATE ... SET stock = stock + CASE id WHEN ... END`.
+        """
+        quantities = dict(
+            ItemOrder.objects
+            .filter(order_id__in=order_ids)
+            .values('product_id')
+            .annotate(total=Sum('quantity'))
+            .values_list('product_id', 'total')
+        )
+        if not quantities:
+            return
+
+        delta = Case(
+            *(When(id=product_id, then=Value(qty)) for product_id, qty in quantities.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+        stock_sign, reserved_sign = effect
+        fields = {}
+        if stock_sign:
+            fields['stock'] = F('stock') + delta
+        if reserved_sign:
+            fields['stock_reserved'] = F('stock_reserved') - delta
+
+        Product.objects.filter(id__in=quantities.keys()).update(**fields)
@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+
+from orders.services.orders import OrderService
+from orders.models import Order
+from core.utils.utils_export import iter_csv, iter_jsonl, iter_rows, streaming_export_response
+
+
+@pytest.fixture
+def orders(db, user):
+    snapshot = {"items": [{"product_id": 1, "name": "Mate, \"imperial\"", "quantity": 2}]}
+    return [Order.objects.create(user=user, total="1500.50", snapshot=snapshot) for _ in range(3)]
+
+
+def _content(response) -> str:
+    return b"".join(response.streaming_content).decode("utf-8-sig")
+
+
+@pytest.mark.django_db
+def test_export_csv_one_row_per_order(orders):
+    qs = OrderService.qs_for_export()
+    response = streaming_export_response(iter_rows(qs), OrderService.VALUES_ORDERS_EXPORT, "csv", "ordenes")
+
+    assert response.streaming
+    assert response["Content-Disposition"].startswith('attachment; filename="ordenes_')
+
+    rows = list(csv.DictReader(io.StringIO(_content(response))))
+    assert [int(r["id"]) for r in rows] == [o.id for o in orders]
+    assert rows[0]["total"] == "1500.50"
+    assert json.loads(rows[0]["order_items"])[0]["name"] == 'Mate, "imperial"'
+
+
+@pytest.mark.django_db
+def test_export_jsonl_with_filters(orders):
+    qs = OrderService.qs_for_export(date_to=timezone.localdate() - timedelta(days=1))
+    assert list(iter_rows(qs)) == []
+
+    qs = OrderService.qs_for_export(date_from=timezone.localdate())
+    lines = "".join(iter_jsonl(iter_rows(qs), OrderService.VALUES_ORDERS_EXPORT)).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [o.id for o in orders]
+    assert json.loads(lines[0])["order_items"][0]["quantity"] == 2
+
+
+def test_export_is_chunked_and_lazy():
+    def rows():
+        yield from ({"id": i} for i in range(1200))
+        raise AssertionError("se consumió de más")   # no se llega si no se pide el último pedazo
+
+    chunks = iter_csv(rows(), ("id",))
+    assert next(chunks) == "\ufeffid\r\n"   # encabezado antes de tocar las filas
+    assert next(chunks).count("\r\n") == 500
@@ -0,0 +1,58 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+
+from orders.services.orders import OrderService
+from orders.models import Order
+from core.utils.utils_pagination import encode_cursor, decode_cursor
+
+
+# -----------------------------
+# cursor encode / decode
+# -----------------------------
+def test_cursor_roundtrip():
+    now = timezone.now()
+    assert decode_cursor(encode_cursor(now, 42)) == (now, 42)
+
+
+@pytest.mark.parametrize("cursor", [None, "", "no-es-base64", "MjAyNS0wMS0wMXwtMQ"])
+def test_invalid_cursor_is_first_page(cursor):
+    assert decode_cursor(cursor) is None
+
+
+# -----------------------------
+# OrderService keyset pagination
+# -----------------------------
+@pytest.fixture
+def orders(db, user):
+    created = [Order.objects.create(user=user) for _ in range(5)]
+
+    # mismo updated_at para todas, el desempate lo hace el id
+    same_time = timezone.now() - timedelta(days=1)
+    Order.objects.filter(user=user).update(updated_at=same_time)
+    return created
+
+
+@pytest.mark.django_db
+def test_user_orders_pages_do_not_overlap(user, orders):
+    first = OrderService.get_user_orders(user, page_size=2)
+    assert [o["id"] for o in first["orders"]] == [orders[4].id, orders[3].id]
+    assert first["next_cursor"]
+
+    second = OrderService.get_user_orders(user, cursor=first["next_cursor"], page_size=2)
+    third = OrderService.get_user_orders(user, cursor=second["next_cursor"], page_size=2)
+
+    assert [o["id"] for o in second["orders"]] == [orders[2].id, orders[1].id]
+    assert [o["id"] for o in third["orders"]] == [orders[0].id]
+    assert third["next_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_admin_orders_date_range(orders):
+    today = timezone.localdate()
+
+    page = OrderService.get_admin_orders(date_from=today, date_to=today)
+    assert len(page["orders"]) == len(orders)
+
+    page = OrderService.get_admin_orders(date_to=today - timedelta(days=1))
+    assert page["orders"] == []
@@ -0,0 +1,84 @@
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from orders.services.orders import OrderService
+from orders.services.pricing import CheckoutMethodsCache, OrderPricingService
+from orders.models import OrderDraft, PaymentMethod, ShipmentMethod
+
+# others apps
+from products.models.product import Product
+
+
+def _unsaved_product(**fields):
+    # con los *_id explicitos no se evaluan los defaults de las FK (que consultan la db)
+    return Product(subcategory_id=1, brand_id=1, **fields)
+
+
+@pytest.mark.parametrize("price, discount", [
+    (Decimal("5000"), 10),
+    (Decimal("999.99"), 15),
+    (Decimal("0.05"), 50),
+    (Decimal("1234.56"), 0),
+    (Decimal("10.01"), 33),
+])
+def test_line_price_matches_product_rounding(price, discount):
+    product = _unsaved_product(price=price, discount=discount)
+    assert OrderPricingService.line_price(price, discount) == product.calc_discount_decimal()
+
+
+def test_price_order_single_pass_totals():
+    products = {
+        1: _unsaved_product(id=1, price=Decimal("5000"), discount=10),
+        2: _unsaved_product(id=2, price=Decimal("300"), discount=0),
+    }
+    pricing = OrderPricingService.price_order(
+        products=products,
+        products_ids_qty={1: 2, 2: 3},
+        shipment_cost=Decimal("1500.00"),
+    )
+
+    assert pricing["subtotal"] == Decimal("9900.00")
+    assert pricing["total"] == Decimal("11400.00")
+    assert [item.final_price for item in pricing["items"]] == [Decimal("4500.00"), Decimal("300.00")]
+
+
+def _prepare_checkout(user, size):
+    """ Crea productos + draft y devuelve el order_data del form. """
+    ShipmentMethod.objects.get_or_create(id=1, defaults={"name": "Retiro en Local", "price": Decimal("0")})
+    PaymentMethod.objects.get_or_create(id=1, defaults={"name": "Efectivo", "time": 12})
+    offset = Product.objects.count()
+    products = [
+        Product.objects.create(name=f"Peluche {offset + i}", price=Decimal("100"), stock=10, available=True)
+        for i in range(size)
+    ]
+    OrderDraft.objects.create(
+        user=user,
+        cart={"items": [{"id": p.id, "quantity": 1} for p in products]},
+    )
+    return {
+        "first_name": "Lucas",
+        "last_name": "Callamullo",
+        "email": "lucas@test.com",
+        "name_retire": "Lucas",
+        "dni_retire": "41224335",
+        "shipping_method_id": "1",
+        "payment_method_id": "1",
+    }
+
+
+@pytest.mark.django_db
+def test_checkout_query_count_does_not_depend_on_cart_size(user, cart):
+    CheckoutMethodsCache.invalidate()
+    # calienta el cache de métodos
+    OrderService.create_order_pending(user=user, order_data=_prepare_checkout(user, 1))
+
+    counts = []
+    for size in (1, 20):
+        order_data = _prepare_checkout(user, size)
+        with CaptureQueriesContext(connection) as ctx:
+            OrderService.create_order_pending(user=user, order_data=order_data)
+        counts.append(len(ctx.captured_queries))
+
+    assert counts[0] == counts[1]
@@ -0,0 +1,92 @@
+import pytest
+from decimal import Decimal
+
+from orders.services.orders import OrderService
+from orders.services.snapshots import OrderSnapshotService
+from orders.models import OrderDraft, Order, PaymentMethod, ShipmentMethod
+from orders.enums import StatusOrderEnum
+from orders.utils import get_order_detail_context
+
+# others apps
+from products.models.product import Product
+
+
+@pytest.fixture
+def order(db, user, cart):
+    ShipmentMethod.objects.get_or_create(id=1, defaults={"name": "Retiro en Local", "price": Decimal("0")})
+    PaymentMethod.objects.get_or_create(id=1, defaults={"name": "Efectivo", "time": 12})
+    product = Product.objects.create(
+        name="Peluche Espeon",
+        price=Decimal("5000"),
+        discount=10,
+        stock=10,
+        stock_reserved=0,
+        available=True,
+        main_image="https://i.ibb.co/espeon.webp",
+    )
+
+    OrderDraft.objects.create(
+        user=user,
+        cart={"items": [{"id": product.id, "quantity": 2}]},
+    )
+
+    order_data = {
+        "first_name": "Lucas",
+        "last_name": "Callamullo",
+        "email": "lucas@test.com",
+        "name_retire": "Lucas",
+        "dni_retire": "41224335",
+        "shipping_method_id": "1",
+        "payment_method_id": "1",
+    }
+    return OrderService.create_order_pending(user=user, order_data=order_data)
+
+
+@pytest.mark.django_db
+def test_snapshot_written_on_create(order):
+    order.refresh_from_db()
+    snapshot = order.snapshot
+
+    assert snapshot["version"] == OrderSnapshotService.VERSION
+    assert snapshot["status"]["id"] == StatusOrderEnum.PENDING
+    assert len(snapshot["items"]) == 1
+
+    item = snapshot["items"][0]
+    assert item["quantity"] == 2
+    assert Decimal(item["final_price"]) == Decimal("4500.00")
+    assert item["product"]["main_image"] == "https://i.ibb.co/espeon.webp"
+    assert Decimal(snapshot["order"]["total"]) == order.total
+
+
+@pytest.mark.django_db
+def test_detail_context_reads_snapshot(order, user, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        context = get_order_detail_context(order.id, user)
+
+    assert context["order"]["id"] == order.id
+    assert context["order"]["total"] == order.total
+    assert context["items"][0]["final_price"] == Decimal("4500.00")
+    assert context["shipment"]["method"]["id"] == 1
+
+
+@pytest.mark.django_db
+def test_change_status_updates_snapshot(order):
+    assert OrderService.change_status(
+        order_id=order.id, status_id=StatusOrderEnum.CANCELLED
+    )
+
+    order = Order.objects.get(id=order.id)
+    assert order.status_id == StatusOrderEnum.CANCELLED
+    assert order.snapshot["status"]["id"] == StatusOrderEnum.CANCELLED
+    # el resto del snapshot no se modifica
+    assert len(order.snapshot["items"]) == 1
+
+
+@pytest.mark.django_db
+def test_change_status_touches_updated_at(order):
+    before = Order.objects.values_list('updated_at', flat=True).get(id=order.id)
+
+    OrderSnapshotService.set_status(order_ids=[order.id], status_id=StatusOrderEnum.CANCELLED)
+
+    after = Order.objects.values_list('updated_at', flat=True).get(id=order.id)
+    assert after > before
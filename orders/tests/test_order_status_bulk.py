@@ -0,0 +1,88 @@
+import pytest
+from decimal import Decimal
+
+from orders.services.status_transitions import OrderStatusTransitionService
+from orders.models import Order, ItemOrder, StatusOrder
+from orders.enums import StatusOrderEnum
+
+# others apps
+from products.models.product import Product
+
+
+@pytest.fixture
+def statuses(db):
+    for status in StatusOrderEnum:
+        StatusOrder.objects.get_or_create(id=status.value, defaults={"name": status.label})
+
+
+@pytest.fixture
+def product(db):
+    # 4 unidades ya reservadas por las ordenes pendientes del fixture
+    return Product.objects.create(
+        name="Peluche Jolteon",
+        price=Decimal("2000"),
+        stock=6,
+        stock_reserved=4,
+        available=True,
+    )
+
+
+@pytest.fixture
+def orders(user, statuses, product):
+    created = []
+    for quantity in (1, 3):
+        order = Order.objects.create(user=user, status_id=StatusOrderEnum.PENDING)
+        ItemOrder.objects.create(
+            order=order, product=product, quantity=quantity, final_price=Decimal("2000")
+        )
+        created.append(order)
+    return created
+
+
+@pytest.mark.django_db
+def test_bulk_confirm_commits_reserved_stock(orders, product, django_assert_max_num_queries):
+    ids = [o.id for o in orders]
+
+    with django_assert_max_num_queries(10):
+        report = OrderStatusTransitionService.bulk_change_status(
+            order_ids=ids, status_id=StatusOrderEnum.PAYMENT_CONFIRMED
+        )
+
+    assert report["updated"] == 2
+    assert all(r["success"] for r in report["results"])
+    assert set(Order.objects.filter(id__in=ids).values_list("status_id", flat=True)) == {
+        StatusOrderEnum.PAYMENT_CONFIRMED
+    }
+
+    product.refresh_from_db()
+    assert (product.stock, product.stock_reserved) == (6, 0)
+
+
+@pytest.mark.django_db
+def test_bulk_cancel_releases_stock_and_reports_invalid(orders, product):
+    cancelled = Order.objects.create(user=orders[0].user, status_id=StatusOrderEnum.CANCELLED)
+
+    report = OrderStatusTransitionService.bulk_change_status(
+        order_ids=[orders[0].id, cancelled.id, 999999],
+        status_id=StatusOrderEnum.CANCELLED,
+    )
+
+    results = {r["order_id"]: r for r in report["results"]}
+    assert report["updated"] == 1
+    assert results[orders[0].id]["success"]
+    assert not results[cancelled.id]["success"]
+    assert results[999999]["detail"] == "Orden no encontrada."
+
+    product.refresh_from_db()
+    assert (product.stock, product.stock_reserved) == (7, 3)
+
+
+@pytest.mark.django_db
+def test_invalid_transition_is_not_applied(orders, product):
+    report = OrderStatusTransitionService.bulk_change_status(
+        order_ids=[orders[0].id], status_id=StatusOrderEnum.RETURNED
+    )
+
+    assert report["updated"] == 0
+    assert report["results"][0]["detail"] == "Transición de estado no permitida."
+    assert Order.objects.get(id=orders[0].id).status_id == StatusOrderEnum.PENDING
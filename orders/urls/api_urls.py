@@ -1,12 +1,19 @@
 
 
 from django.urls import path
-from orders.views.api.orders import OrderAPI
+from orders.views.api.orders import OrderAPI, OrderStatusBulkAPI, OrderExportAPI
 from orders.views.api.payments import PaymentAPI
 from orders.views.api.shipments import ShipmentAPI
+from payments.views.api.gateway import GatewayMetricsAPI
+from payments.views.api.webhooks import MercadoPagoWebhookAPI
 
 urlpatterns = [
     path("order-form/", OrderAPI.as_view(), name="valid_order_form"),
+    path("api/orders/status/bulk/", OrderStatusBulkAPI.as_view(), name="orders_status_bulk"),
+    path("api/orders/export/<str:fmt>/", OrderExportAPI.as_view(), name="orders_export"),
     path("api/shipments/<int:shipment_id>/", ShipmentAPI.as_view(), name="update_shipment"),
     path("api/payments/<int:payment_id>/", PaymentAPI.as_view(), name="update_payment"),
+    # payments.urls no se incluye (paquete sin __init__): las rutas de pagos viven aca
+    path("api/payments/webhooks/mercadopago/", MercadoPagoWebhookAPI.as_view(), name="payments_mp_webhook"),
+    path("api/payments/gateway/metrics/", GatewayMetricsAPI.as_view(), name="payments_gateway_metrics"),
 ]
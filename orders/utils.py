@@ -15,13 +15,36 @@ from rest_framework.status import HTTP_400_BAD_REQUEST
 from rest_framework.response import Response
 
 from products.utils import valid_id_or_None
+from orders.services.snapshots import OrderSnapshotService
 
 def get_order_detail_context(order_id, user):
-    # Optimización de consultas con select_related
+    """
+    Build the template context for the order detail page.
+
+    Reads the denormalized `Order.snapshot` in a single query by primary key.
+    Orders created before the snapshot existed fall back to the joined query.
+    """
     order_id = valid_id_or_None(order_id)
     if not order_id:
         return None
     
+    row = OrderSnapshotService.get_detail_row(order_id=order_id, user=user)
+    if not row:
+        return None
+    
+    snapshot = row.pop('snapshot')
+    if not snapshot:
+        return _get_order_detail_context_legacy(order_id, user)
+    
+    context = OrderSnapshotService.hydrate(snapshot)
+    
+    # datos que viven en columnas propias de la orden (id, fechas)
+    context['order'].update(row)
+    return context
+
+
+def _get_order_detail_context_legacy(order_id, user):
+    # Optimización de consultas con select_related
     order = Order.objects.filter(id=order_id)
     if user.role != 'admin':
         order = order.filter(user=user)
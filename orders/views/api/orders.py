@@ -6,9 +6,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from cart.carrito import Carrito
-from orders.serializers import OrderFormSerializer
+from orders.serializers import OrderFormSerializer, BulkOrderStatusSerializer
 from orders import utils
 from orders.services.orders import OrderService  
+from orders.services.status_transitions import OrderStatusTransitionService
+
+from core.permissions import IsAdminOrSuperUser
+from core.utils.utils_basic import valid_id_or_None, valid_date_or_None
+from core.utils.utils_export import EXPORT_FORMATS, iter_rows, streaming_export_response
 
 
 class OrderAPI(APIView):
@@ -36,4 +41,53 @@ class OrderAPI(APIView):
         # retornamos unicamente el id, para construir la url de redirect en front 
         # aunque capaz sería mejor devolver la url no lo sé, de momento esta asi
         return Response({'order_id': order.id}, status=status.HTTP_201_CREATED)
-        
\ No newline at end of file
+
+
+class OrderStatusBulkAPI(APIView):
+    """
+    POST {"order_ids": [...], "status_id": int}
+
+    Moves many orders to a new status in a single transaction and returns
+    a per-order report (orders with invalid transitions are skipped).
+    """
+    # Verificar si es role == 'admin' o user.id == 1
+    permission_classes = [IsAuthenticated, IsAdminOrSuperUser]
+
+    def post(self, request):
+        serializer = BulkOrderStatusSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        report = OrderStatusTransitionService.bulk_change_status(
+            order_ids=serializer.validated_data["order_ids"],
+            status_id=serializer.validated_data["status_id"],
+        )
+        return Response({"success": True, **report}, status=status.HTTP_200_OK)
+
+
+class OrderExportAPI(APIView):
+    """
+    GET api/orders/export/<csv|jsonl>/
+
+    Order dump streamed row by row (server-side cursor), one row per order
+    with its items from the snapshot.
+
+    Optional filters (same as the admin order list): ?status=<id>,
+    ?date_from=YYYY-MM-DD, ?date_to=YYYY-MM-DD.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrSuperUser]
+
+    def get(self, request, fmt):
+        if fmt not in EXPORT_FORMATS:
+            return Response(
+                {"success": False, "detail": f"Formato '{fmt}' no soportado. Use csv o jsonl."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        qs = OrderService.qs_for_export(
+            status_id=valid_id_or_None(request.GET.get('status')),
+            date_from=valid_date_or_None(request.GET.get('date_from')),
+            date_to=valid_date_or_None(request.GET.get('date_to')),
+        )
+        return streaming_export_response(iter_rows(qs), OrderService.VALUES_ORDERS_EXPORT, fmt, 'ordenes')
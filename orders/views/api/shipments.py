@@ -6,6 +6,8 @@ from rest_framework.permissions import IsAuthenticated
 from orders.models import ShipmentMethod
 from orders.serializers import ShipmentSerializer
 
+from orders.services.pricing import CheckoutMethodsCache
+
 from core.permissions import IsAdminOrSuperUser
 from core.utils.utils_basic import valid_id_or_None
 
@@ -31,6 +33,7 @@ class ShipmentAPI(APIView):
         # si esta todo bien se guarda el objeto automaticamente
         if serializer.is_valid():
             serializer.save()
+            CheckoutMethodsCache.invalidate()   # checkout lee los métodos desde memoria
             return Response({"success": True, "message": "Shipment actualizado correctamente"}, status=status.HTTP_200_OK)
             
         return Response({"success": False, "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
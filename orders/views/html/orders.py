@@ -1,8 +1,12 @@
 
 
+from django.conf import settings
 from django.shortcuts import render
 # Create your views here.
 
+from orders.enums import PaymentMethodEnum, StatusOrderEnum
+from orders.models import Order
+
 from orders.services.orders_draft import OrderDraftService
 from orders.services.shipment_methods import ShipmentMethodService
 from orders.services.payment_methods import PaymentMethodService
@@ -16,11 +20,36 @@ def order_detail(request, order_id):
     
     context = get_order_detail_context(order_id, user)
     if not context:
-        render(request, "payments/fail_payments.html", {"error": "Order Not Found."})
+        return render(request, "payments/fail_payments.html", {"error": "Order Not Found."})
+    
+    # Wallet de mercado pago solo para ordenes pendientes de pago
+    if (
+        context['payment']['id'] == PaymentMethodEnum.MERCADO_PAGO
+        and context['status']['id'] in (StatusOrderEnum.PENDING, StatusOrderEnum.PAYMENT_PENDING)
+    ):
+        context.update(_get_mp_context(context['order']['id']))
     
     return render(request, "orders/order_detail.html", context)
 
 
+def _get_mp_context(order_id):
+    """
+    Preference id para el wallet brick. La preferencia se reutiliza mientras siga
+    vigente (ver payments/utils_for_mp.create_preference_data), recargar la pagina
+    no vuelve a llamar a la api de mercado pago.
+    """
+    from payments.gateway import PaymentGatewayError
+    from payments.utils_for_mp import create_preference_data
+    
+    order = Order.objects.select_related('payment', 'shipment__method').get(id=order_id)
+    try:
+        preference_id, _ = create_preference_data(order, 0)
+    except PaymentGatewayError as e:
+        return {"preference_id": None, "preference_error": str(e.detail)}
+    
+    return {"preference_id": preference_id, "public_key": settings.MERCADO_PAGO_PUBLIC_KEY}
+
+
 
 
 def resume_order(request):
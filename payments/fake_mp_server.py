@@ -0,0 +1,307 @@
+# payments/fake_mp_server.py
+"""
+Local stand-in for the Mercado Pago API, for load tests and manual checkout runs.
+
+Only uses the standard library, so it can run on a laptop or in CI next to the
+app (`python manage.py fake_mp_server`). Point the app to it with
+`MERCADO_PAGO_API_URL=http://127.0.0.1:8787`.
+
+Implemented endpoints (same paths and shapes as the real API):
+    POST /checkout/preferences           -> create a preference
+    GET  /checkout/preferences/<id>      -> fetch a preference
+    GET  /v1/payments/<id>               -> fetch a payment
+    GET  /v1/payments/search             -> search by external_reference
+
+Control endpoints (not part of Mercado Pago, never affected by latency or failures):
+    POST /fake/preferences/<id>/pay      -> simulate the buyer paying; body {"status": "approved"}
+                                            creates the payment and sends the IPN to the
+                                            preference `notification_url`
+    POST /fake/config                    -> change latency / failure settings at runtime
+    GET  /fake/stats                     -> counters of served requests
+"""
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+
+class FakeMercadoPagoServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the fake gateway state (in memory).
+
+    Args:
+        address (tuple): (host, port). Port 0 picks a free port.
+        latency_ms (float): Base latency added to every API request.
+        jitter_ms (float): Random extra latency, uniform in [0, jitter_ms].
+        failure_rate (float): Probability (0..1) of answering 503.
+        timeout_rate (float): Probability (0..1) of hanging `hang_seconds` before answering
+            (to exercise client read timeouts).
+        ipn_delay_ms (float): Delay before the IPN callback is sent after a payment.
+        seed (int | None): Seed for reproducible failure patterns.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 8787),
+        *,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        failure_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        hang_seconds: float = 30.0,
+        ipn_delay_ms: float = 0,
+        seed: int | None = None,
+    ):
+        super().__init__(address, FakeMercadoPagoHandler)
+        self.config = {
+            "latency_ms": latency_ms,
+            "jitter_ms": jitter_ms,
+            "failure_rate": failure_rate,
+            "timeout_rate": timeout_rate,
+            "hang_seconds": hang_seconds,
+            "ipn_delay_ms": ipn_delay_ms,
+        }
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+        self.preferences: dict[str, dict] = {}
+        self.payments: dict[int, dict] = {}
+        self.next_payment_id = 1_000_000
+        self.stats = {"requests": 0, "failures": 0, "hangs": 0, "ipn_sent": 0, "ipn_errors": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_thread(self) -> threading.Thread:
+        """ Run `serve_forever()` in a daemon thread (tests / load tests). """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    # ---------- state ----------
+
+    def create_preference(self, data: dict) -> dict:
+        preference_id = f"fake-{uuid.uuid4().hex[:24]}"
+        preference = {
+            **data,
+            "id": preference_id,
+            "init_point": f"{self.base_url}/fake/checkout?pref_id={preference_id}",
+            "sandbox_init_point": f"{self.base_url}/fake/checkout?pref_id={preference_id}",
+            "date_created": _now_iso(),
+        }
+        with self.lock:
+            self.preferences[preference_id] = preference
+        return preference
+
+    def pay_preference(self, preference_id: str, status: str = "approved") -> dict | None:
+        with self.lock:
+            preference = self.preferences.get(preference_id)
+            if preference is None:
+                return None
+            self.next_payment_id += 1
+            payment_id = self.next_payment_id
+
+        amount = sum(
+            Decimal(str(item.get("unit_price", 0))) * int(item.get("quantity", 1))
+            for item in preference.get("items", [])
+        )
+        payment = {
+            "id": payment_id,
+            "status": status,
+            "status_detail": "accredited" if status == "approved" else "cc_rejected_other_reason",
+            "external_reference": preference.get("external_reference"),
+            "preference_id": preference_id,
+            "transaction_amount": float(round(amount, 2)),
+            "currency_id": "ARS",
+            "date_created": _now_iso(),
+            "date_approved": _now_iso() if status == "approved" else None,
+            "payment_method_id": "account_money",
+        }
+        with self.lock:
+            self.payments[payment_id] = payment
+
+        notification_url = preference.get("notification_url")
+        if notification_url:
+            threading.Thread(
+                target=self._send_ipn, args=(notification_url, payment_id), daemon=True
+            ).start()
+        return payment
+
+    def search_payments(self, params: dict) -> dict:
+        reference = params.get("external_reference")
+        with self.lock:
+            results = [
+                p for p in self.payments.values()
+                if reference is None or p["external_reference"] == reference
+            ]
+        return {"results": results, "paging": {"total": len(results), "limit": 30, "offset": 0}}
+
+    # -------------------- private methods
+    def _send_ipn(self, notification_url: str, payment_id: int) -> None:
+        time.sleep(self.config["ipn_delay_ms"] / 1000)
+
+        separator = "&" if "?" in notification_url else "?"
+        url = f"{notification_url}{separator}{urlencode({'topic': 'payment', 'id': payment_id})}"
+        body = json.dumps({
+            "action": "payment.created",
+            "type": "payment",
+            "data": {"id": str(payment_id)},
+        }).encode()
+
+        try:
+            urlopen(Request(url, data=body, headers={"Content-Type": "application/json"}), timeout=10).read()
+            key = "ipn_sent"
+        except OSError as e:
+            logger.warning("Fake MP IPN to %s failed: %s", url, e)
+            key = "ipn_errors"
+
+        with self.lock:
+            self.stats[key] += 1
+
+
+class FakeMercadoPagoHandler(BaseHTTPRequestHandler):
+
+    server: FakeMercadoPagoServer
+    protocol_version = "HTTP/1.1"   # keep-alive, como la API real
+
+    ROUTES = (
+        ("POST", re.compile(r"^/checkout/preferences/?$"), "_create_preference"),
+        ("GET", re.compile(r"^/checkout/preferences/(?P<pk>[\w-]+)/?$"), "_get_preference"),
+        ("GET", re.compile(r"^/v1/payments/search/?$"), "_search_payments"),
+        ("GET", re.compile(r"^/v1/payments/(?P<pk>\d+)/?$"), "_get_payment"),
+        ("POST", re.compile(r"^/fake/preferences/(?P<pk>[\w-]+)/pay/?$"), "_fake_pay"),
+        ("POST", re.compile(r"^/fake/config/?$"), "_fake_config"),
+        ("GET", re.compile(r"^/fake/stats/?$"), "_fake_stats"),
+    )
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        logger.debug("Fake MP %s - %s", self.address_string(), format % args)
+
+    # -------------------- routing
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        self.query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        # el body se lee siempre antes de responder, sino rompe la conexion keep-alive
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(url.path)
+            if route_method == method and match:
+                if not url.path.startswith("/fake/") and not self._apply_chaos():
+                    return
+                return getattr(self, handler)(**match.groupdict())
+
+        self._reply(404, {"message": "resource not found", "status": 404})
+
+    def _apply_chaos(self) -> bool:
+        """
+        Latency and random failures. Returns False if the request was already answered.
+        """
+        server = self.server
+        config = server.config
+        with server.lock:
+            server.stats["requests"] += 1
+            roll = server.random.random()
+            jitter = server.random.uniform(0, config["jitter_ms"]) if config["jitter_ms"] else 0
+
+        time.sleep((config["latency_ms"] + jitter) / 1000)
+
+        if roll < config["timeout_rate"]:
+            with server.lock:
+                server.stats["hangs"] += 1
+            time.sleep(config["hang_seconds"])
+        elif roll < config["timeout_rate"] + config["failure_rate"]:
+            with server.lock:
+                server.stats["failures"] += 1
+            self._reply(503, {"message": "service unavailable", "status": 503})
+            return False
+        return True
+
+    # -------------------- api
+    def _create_preference(self):
+        data = self._read_json()
+        if not data.get("items"):
+            return self._reply(400, {"message": "items needed", "status": 400})
+        self._reply(201, self.server.create_preference(data))
+
+    def _get_preference(self, pk):
+        preference = self.server.preferences.get(pk)
+        if preference is None:
+            return self._reply(404, {"message": "preference not found", "status": 404})
+        self._reply(200, preference)
+
+    def _get_payment(self, pk):
+        payment = self.server.payments.get(int(pk))
+        if payment is None:
+            return self._reply(404, {"message": "Payment not found", "status": 404})
+        self._reply(200, payment)
+
+    def _search_payments(self):
+        self._reply(200, self.server.search_payments(self.query))
+
+    # -------------------- control
+    def _fake_pay(self, pk):
+        status = self._read_json().get("status", "approved")
+        payment = self.server.pay_preference(pk, status)
+        if payment is None:
+            return self._reply(404, {"message": "preference not found", "status": 404})
+        self._reply(201, payment)
+
+    def _fake_config(self):
+        data = self._read_json()
+        with self.server.lock:
+            for key in self.server.config:
+                if key in data:
+                    self.server.config[key] = float(data[key])
+        self._reply(200, self.server.config)
+
+    def _fake_stats(self):
+        with self.server.lock:
+            stats = {
+                **self.server.stats,
+                "preferences": len(self.server.preferences),
+                "payments": len(self.server.payments),
+            }
+        self._reply(200, stats)
+
+    # -------------------- helpers
+    def _read_json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return {}
+
+    def _reply(self, status_code: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000-03:00", time.localtime())
@@ -0,0 +1,390 @@
+# payments/gateway.py
+"""
+HTTP client layer for the Mercado Pago API.
+
+Replaces the module-level `mercadopago.SDK` (created at import time, no
+timeouts, no retry policy) with a client that:
+    - reuses pooled keep-alive connections (`requests.Session` + HTTPAdapter),
+    - applies strict connect/read timeouts to every call,
+    - retries transient failures a bounded number of times with full jitter,
+    - stops calling the gateway while it is failing (circuit breaker),
+    - records latency and error metrics per operation.
+
+The base url is configurable (`MERCADO_PAGO_API_URL`) so the same client can
+be pointed to a local stub server in tests and load tests.
+"""
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentGatewayError(APIException):
+    """ The gateway answered with an error or could not be reached. """
+    status_code = status.HTTP_502_BAD_GATEWAY
+    default_detail = "No pudimos comunicarnos con Mercado Pago, intentá nuevamente."
+    default_code = "payment_gateway_error"
+
+
+class PaymentGatewayUnavailable(PaymentGatewayError):
+    """ The circuit breaker is open, the call was not attempted. """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Mercado Pago no está disponible en este momento, intentá en unos minutos."
+    default_code = "payment_gateway_unavailable"
+
+
+class CircuitBreaker:
+    """
+    Minimal thread-safe circuit breaker.
+
+    - closed: calls go through; `failure_threshold` consecutive failures open it.
+    - open: calls fail fast until `reset_timeout` seconds have passed.
+    - half-open: one trial call is allowed; success closes it, failure re-opens it.
+      A trial that proves nothing (e.g. a 4xx) only releases the slot (release_trial).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def release_trial(self) -> None:
+        """ Neither success nor failure: free the half-open trial, keep state and failures. """
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    # -------------------- private methods
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+
+class GatewayMetrics:
+    """
+    In-process latency and error counters per operation.
+
+    Latencies are kept in a fixed histogram (milliseconds) so memory does not
+    grow with traffic. Each worker process has its own counters, `snapshot()`
+    includes the pid so several workers can be told apart.
+    """
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: dict[str, dict[str, Any]] = {}
+
+    def observe(self, operation: str, *, elapsed: float, outcome: str, attempts: int = 1) -> None:
+        """
+        Args:
+            operation (str): e.g. "create_preference".
+            elapsed (float): Total seconds spent, retries included.
+            outcome (str): "ok", "http_error", "timeout", "connection_error",
+                "request_error", "invalid_response" or "circuit_open".
+            attempts (int): HTTP attempts made.
+        """
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            op = self._ops.setdefault(operation, {
+                "calls": 0,
+                "retries": 0,
+                "outcomes": {},
+                "latency_ms_sum": 0.0,
+                "latency_ms_max": 0.0,
+                "latency_ms_buckets": {str(b): 0 for b in (*self.BUCKETS_MS, "inf")},
+            })
+            op["calls"] += 1
+            op["retries"] += max(0, attempts - 1)
+            op["outcomes"][outcome] = op["outcomes"].get(outcome, 0) + 1
+            op["latency_ms_sum"] += elapsed_ms
+            op["latency_ms_max"] = max(op["latency_ms_max"], elapsed_ms)
+
+            bucket = next((str(b) for b in self.BUCKETS_MS if elapsed_ms <= b), "inf")
+            op["latency_ms_buckets"][bucket] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            operations = {}
+            for name, op in self._ops.items():
+                operations[name] = {
+                    **op,
+                    "outcomes": dict(op["outcomes"]),
+                    "latency_ms_buckets": dict(op["latency_ms_buckets"]),
+                    "latency_ms_avg": round(op["latency_ms_sum"] / op["calls"], 2) if op["calls"] else 0,
+                }
+        return {"pid": os.getpid(), "operations": operations}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+
+class MercadoPagoClient:
+    """
+    Pooled, timeout-bounded Mercado Pago API client.
+
+    Only the endpoints used by the store are implemented. All of them go
+    through `_request()`, which applies the timeouts, the retry policy, the
+    circuit breaker and the metrics.
+
+    Notes:
+        - POST requests send an `X-Idempotency-Key` (the same one on every
+          retry), so a retried preference creation never creates two preferences.
+        - 4xx answers (except 429) are not retried: they are bugs in the payload.
+    """
+
+    DEFAULT_BASE_URL = "https://api.mercadopago.com"
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    RETRY_OUTCOMES = frozenset({"timeout", "connection_error", "request_error"})
+
+    def __init__(
+        self,
+        *,
+        access_token: str,
+        base_url: str | None = None,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 5.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 2.0,
+        pool_maxsize: int = 10,
+        breaker: CircuitBreaker | None = None,
+        metrics: GatewayMetrics | None = None,
+    ):
+        self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or GatewayMetrics()
+
+        self.session = requests.Session()
+        # los reintentos los maneja _request (con jitter y breaker), no urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        })
+
+    # ---------- Public API ----------
+
+    def create_preference(self, preference_data: dict) -> dict:
+        """
+        Create a Checkout Pro preference.
+
+        Returns:
+            dict: The preference returned by Mercado Pago (includes "id" and "init_point").
+        """
+        return self._request(
+            "POST", "/checkout/preferences",
+            operation="create_preference", json=preference_data,
+        )
+
+    def get_preference(self, preference_id: str) -> dict:
+        return self._request(
+            "GET", f"/checkout/preferences/{preference_id}",
+            operation="get_preference",
+        )
+
+    def get_payment(self, payment_id: int | str) -> dict:
+        """
+        Fetch a payment (used by IPN/webhook processing and reconciliation).
+        """
+        return self._request(
+            "GET", f"/v1/payments/{payment_id}",
+            operation="get_payment",
+        )
+
+    def search_payments(self, **params) -> dict:
+        """
+        Search payments, e.g. `search_payments(external_reference="123")`.
+        """
+        return self._request(
+            "GET", "/v1/payments/search",
+            operation="search_payments", params=params,
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+    # -------------------- private methods
+    def _request(self, method: str, path: str, *, operation: str, **kwargs) -> dict:
+        if not self.breaker.allow_request():
+            self.metrics.observe(operation, elapsed=0.0, outcome="circuit_open", attempts=0)
+            raise PaymentGatewayUnavailable()
+
+        headers = kwargs.pop("headers", {})
+        if method == "POST":
+            headers.setdefault("X-Idempotency-Key", uuid.uuid4().hex)
+
+        url = f"{self.base_url}{path}"
+        start = time.perf_counter()
+        attempt = 0
+        # el resultado siempre llega al breaker (finally): si no, una excepcion
+        # inesperada deja el trial del half-open tomado para siempre.
+        # "success" | "failure" | None (error del cliente: no cuenta, solo libera el trial)
+        breaker_result = "failure"
+
+        try:
+            while True:
+                attempt += 1
+                outcome, response, error = self._send(method, url, headers=headers, **kwargs)
+
+                retryable = outcome in self.RETRY_OUTCOMES or (
+                    response is not None and response.status_code in self.RETRY_STATUSES
+                )
+                if outcome != "ok" and retryable and attempt <= self.max_retries:
+                    time.sleep(self._backoff(attempt))
+                    continue
+                break
+
+            if outcome == "ok":
+                try:
+                    data = response.json() if response.content else {}
+                except ValueError as e:
+                    # 2xx con un body que no es JSON (proxy, pagina de mantenimiento, ...)
+                    outcome, error = "invalid_response", e
+
+            elapsed = time.perf_counter() - start
+            self.metrics.observe(operation, elapsed=elapsed, outcome=outcome, attempts=attempt)
+
+            if outcome == "ok":
+                breaker_result = "success"
+                return data
+
+            # solo los errores del lado del gateway abren el circuito
+            if outcome == "http_error" and not retryable:
+                breaker_result = None
+
+            status_code = response.status_code if response is not None else None
+            logger.warning(
+                "Mercado Pago %s failed: outcome=%s status=%s attempts=%s elapsed=%.3fs error=%s",
+                operation, outcome, status_code, attempt, elapsed, error,
+            )
+            raise PaymentGatewayError()
+        finally:
+            if breaker_result == "success":
+                self.breaker.record_success()
+            elif breaker_result == "failure":
+                self.breaker.record_failure()
+            else:
+                self.breaker.release_trial()
+
+    def _send(self, method: str, url: str, **kwargs):
+        """
+        One HTTP attempt. Returns (outcome, response | None, error | None).
+        """
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.Timeout as e:
+            return "timeout", None, e
+        except requests.ConnectionError as e:
+            return "connection_error", None, e
+        except requests.RequestException as e:
+            # ChunkedEncodingError, ContentDecodingError, TooManyRedirects, ...
+            return "request_error", None, e
+
+        if response.status_code >= 400:
+            return "http_error", response, response.text[:300]
+        return "ok", response, None
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter: random(0, min(max, base * 2^(attempt-1))).
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+_client: MercadoPagoClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_mp_client() -> MercadoPagoClient:
+    """
+    Process-wide client, created lazily on first use (not at import time)
+    and configured from settings.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MercadoPagoClient(
+                    access_token=settings.MERCADO_PAGO_ACCESS_TOKEN,
+                    base_url=getattr(settings, "MERCADO_PAGO_API_URL", None),
+                    connect_timeout=getattr(settings, "MERCADO_PAGO_CONNECT_TIMEOUT", 3.05),
+                    read_timeout=getattr(settings, "MERCADO_PAGO_READ_TIMEOUT", 5.0),
+                    max_retries=getattr(settings, "MERCADO_PAGO_MAX_RETRIES", 2),
+                    breaker=CircuitBreaker(
+                        failure_threshold=getattr(settings, "MERCADO_PAGO_BREAKER_THRESHOLD", 5),
+                        reset_timeout=getattr(settings, "MERCADO_PAGO_BREAKER_RESET", 30.0),
+                    ),
+                )
+    return _client
+
+
+def set_mp_client(client: MercadoPagoClient | None) -> None:
+    """
+    Replace the process-wide client (e.g. a client pointed to the local fake
+    server in load tests). `None` makes the next `get_mp_client()` rebuild it
+    from settings.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
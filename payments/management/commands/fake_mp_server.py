@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from payments.fake_mp_server import FakeMercadoPagoServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Levanta un Mercado Pago falso en local (preferencias, pagos e IPN) con latencia "
+        "y tasa de fallos configurables. Usar con MERCADO_PAGO_API_URL=http://<host>:<port>"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8787)
+        parser.add_argument('--latency-ms', type=float, default=0, help="Latencia base por request.")
+        parser.add_argument('--jitter-ms', type=float, default=0, help="Latencia extra aleatoria [0, jitter].")
+        parser.add_argument('--failure-rate', type=float, default=0.0, help="Probabilidad de responder 503 (0..1).")
+        parser.add_argument('--timeout-rate', type=float, default=0.0, help="Probabilidad de colgar la respuesta (0..1).")
+        parser.add_argument('--ipn-delay-ms', type=float, default=0, help="Demora antes de enviar el IPN.")
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        server = FakeMercadoPagoServer(
+            (options['host'], options['port']),
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            failure_rate=options['failure_rate'],
+            timeout_rate=options['timeout_rate'],
+            ipn_delay_ms=options['ipn_delay_ms'],
+            seed=options['seed'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Fake Mercado Pago escuchando en {server.base_url}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,274 @@
+import random
+import statistics
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from decimal import Decimal
+
+import requests
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from cart.models import Cart, CartItem
+from orders.enums import PaymentMethodEnum, ShipmentMethodEnum
+from orders.models import Order, OrderDraft, ShipmentOrder
+from orders.services.orders import OrderService
+from payments.fake_mp_server import FakeMercadoPagoServer
+from payments.gateway import MercadoPagoClient, get_mp_client, set_mp_client
+from payments.services.payment_confirmation import PaymentConfirmationService
+from payments.utils_for_mp import create_preference_data
+from products.models.product import Product
+
+User = get_user_model()
+
+EMAIL_PREFIX = "loadtest-checkout-"
+PRODUCT_PREFIX = "LoadTest Checkout"
+STEPS = ("cart", "draft", "order", "preference", "payment", "confirmation", "total")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test del checkout completo contra un Mercado Pago falso: "
+        "carrito -> draft -> create_order_pending -> preferencia -> pago -> confirmación. "
+        "Crea usuarios y productos de prueba (usar --cleanup para borrarlos al final). "
+        "No correr contra la base de producción."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help="Usuarios virtuales concurrentes.")
+        parser.add_argument('--checkouts', type=int, default=5, help="Checkouts por usuario.")
+        parser.add_argument('--items', type=int, default=3, help="Productos distintos por carrito.")
+        parser.add_argument('--products', type=int, default=50, help="Productos de prueba a crear.")
+        parser.add_argument('--mp-url', default=None, help="Fake MP ya levantado; si falta se levanta uno en proceso.")
+        parser.add_argument('--latency-ms', type=float, default=80, help="Latencia del fake MP en proceso.")
+        parser.add_argument('--jitter-ms', type=float, default=40)
+        parser.add_argument('--failure-rate', type=float, default=0.0)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--cleanup', action='store_true', help="Borra los datos de prueba al terminar.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.lock = threading.Lock()
+        self.timings = {step: [] for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+
+        fake_server = None
+        mp_url = options['mp_url']
+        if not mp_url:
+            fake_server = FakeMercadoPagoServer(
+                ("127.0.0.1", 0),
+                latency_ms=options['latency_ms'],
+                jitter_ms=options['jitter_ms'],
+                failure_rate=options['failure_rate'],
+                seed=options['seed'],
+            )
+            fake_server.start_in_thread()
+            mp_url = fake_server.base_url
+        self.mp_url = mp_url.rstrip("/")
+
+        # cliente apuntado al fake, con un pool del tamaño de la concurrencia
+        set_mp_client(MercadoPagoClient(
+            access_token="TEST-loadtest", base_url=self.mp_url, pool_maxsize=options['users']
+        ))
+        self.http = requests.Session()
+
+        products = self._create_products(options['products'])
+        if len(products) < options['items']:
+            raise CommandError("--products debe ser mayor o igual a --items")
+        users = self._create_users(options['users'])
+
+        self.stdout.write(
+            f"{len(users)} usuarios x {options['checkouts']} checkouts, "
+            f"{options['items']} items por carrito, MP: {self.mp_url}"
+        )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            futures = [
+                pool.submit(self._run_user, user, products, options['checkouts'], options['items'])
+                for user in users
+            ]
+            for future in as_completed(futures):
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        self._report(elapsed)
+
+        if options['cleanup']:
+            self._cleanup()
+        set_mp_client(None)
+        if fake_server:
+            fake_server.shutdown()
+            fake_server.server_close()
+
+    # -------------------- scenario
+    def _run_user(self, user, products, checkouts: int, items: int):
+        try:
+            for _ in range(checkouts):
+                with self.lock:
+                    cart_products = self.rng.sample(products, items)
+                try:
+                    self._checkout(user, cart_products)
+                except Exception as e:
+                    # el error ya quedo contado en su paso, seguimos con el siguiente checkout
+                    self.stderr.write(f"checkout fallido ({user.email}): {e!r}")
+        finally:
+            connection.close()   # cada hilo tiene su propia conexion
+
+    def _checkout(self, user, cart_products):
+        total_start = time.perf_counter()
+
+        with self._step("cart"):
+            cart, _ = Cart.objects.get_or_create(user=user)
+            CartItem.objects.bulk_create([
+                CartItem(cart=cart, product=product, quantity=1) for product in cart_products
+            ])
+
+        with self._step("draft"):
+            # mismo formato que Carrito.get_cart_serializer()
+            snapshot = {
+                "items": [
+                    {
+                        "id": p.id, "name": p.name, "slug": p.slug, "price": float(p.price),
+                        "image": p.main_image, "quantity": 1, "stock": p.stock, "discount": p.discount,
+                    }
+                    for p in cart_products
+                ],
+                "total_quantity": len(cart_products),
+            }
+            OrderDraft.objects.update_or_create(
+                user=user, status="OPEN", defaults={"cart": snapshot}
+            )
+
+        with self._step("order"):
+            order = OrderService.create_order_pending(user=user, order_data=self._order_data(user))
+
+        with self._step("preference"):
+            order = Order.objects.select_related("payment", "shipment__method").get(id=order.id)
+            preference_id, _ = create_preference_data(order, 0)
+
+        with self._step("payment"):
+            # el comprador paga en el checkout de MP (endpoint de control del fake)
+            response = self.http.post(
+                f"{self.mp_url}/fake/preferences/{preference_id}/pay",
+                json={"status": "approved"}, timeout=10,
+            )
+            response.raise_for_status()
+            payment_id = response.json()["id"]
+
+        with self._step("confirmation"):
+            # mismo camino que el worker de notificaciones: valida el monto y crea la factura
+            payment = get_mp_client().get_payment(payment_id)
+            result = PaymentConfirmationService.apply_payments([payment])[int(payment["id"])]
+            if result["outcome"] not in (
+                PaymentConfirmationService.CONFIRMED, PaymentConfirmationService.ALREADY_CONFIRMED
+            ):
+                raise RuntimeError(f"pago {payment_id} no confirmado: {result['outcome']} {result['detail']}")
+
+        self._record("total", time.perf_counter() - total_start)
+
+    @contextmanager
+    def _step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._record(name, 0, failed=True)
+            raise
+        self._record(name, time.perf_counter() - start)
+
+    def _record(self, step: str, seconds: float, failed: bool = False):
+        with self.lock:
+            if failed:
+                self.errors[step] += 1
+            else:
+                self.timings[step].append(seconds * 1000)
+
+    @staticmethod
+    def _order_data(user) -> dict:
+        return {
+            "first_name": "Load",
+            "last_name": "Test",
+            "email": user.email,
+            "cellphone": "3510000000",
+            "dni": "40000000",
+            "name_retire": "Load Test",
+            "dni_retire": "40000000",
+            "shipping_method_id": str(ShipmentMethodEnum.PICKUP.value),
+            "payment_method_id": str(PaymentMethodEnum.MERCADO_PAGO.value),
+        }
+
+    # -------------------- setup / report
+    def _create_products(self, count: int) -> list:
+        existing = list(Product.objects.filter(name__startswith=PRODUCT_PREFIX)[:count])
+        if len(existing) < count:
+            existing += Product.objects.bulk_create([
+                Product(
+                    name=f"{PRODUCT_PREFIX} {i}",
+                    slug=f"loadtest-checkout-{i}",
+                    price=Decimal(self.rng.randint(1000, 50000)),
+                    discount=self.rng.choice((0, 10, 20)),
+                    stock=1_000_000,
+                    available=True,
+                )
+                for i in range(len(existing), count)
+            ])
+        Product.objects.filter(id__in=[p.id for p in existing]).update(stock=1_000_000)
+        return existing
+
+    def _create_users(self, count: int) -> list:
+        users = []
+        for i in range(count):
+            user, created = User.objects.get_or_create(email=f"{EMAIL_PREFIX}{i}@example.com")
+            if created:
+                user.set_unusable_password()
+                user.save(update_fields=["password"])
+            users.append(user)
+        return users
+
+    def _report(self, elapsed: float):
+        done = len(self.timings["total"])
+        self.stdout.write("")
+        self.stdout.write(f"{'step':<14}{'ok':>7}{'err':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+        for step in STEPS:
+            values = sorted(self.timings[step])
+            if not values:
+                self.stdout.write(f"{step:<14}{0:>7}{self.errors[step]:>6}")
+                continue
+            self.stdout.write(
+                f"{step:<14}{len(values):>7}{self.errors[step]:>6}"
+                f"{statistics.median(values):>10.1f}{_percentile(values, 95):>10.1f}"
+                f"{_percentile(values, 99):>10.1f}{values[-1]:>10.1f}"
+            )
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(
+            f"{done} checkouts en {elapsed:.2f}s -> {done / elapsed:.1f} checkouts/s"
+        ))
+
+        gateway = get_mp_client().metrics.snapshot()["operations"]
+        for operation, data in gateway.items():
+            self.stdout.write(
+                f"  MP {operation}: calls={data['calls']} retries={data['retries']} "
+                f"avg={data['latency_ms_avg']}ms outcomes={data['outcomes']}"
+            )
+
+    def _cleanup(self):
+        users = User.objects.filter(email__startswith=EMAIL_PREFIX)
+        shipment_ids = list(
+            Order.objects.filter(user__in=users).values_list("shipment_id", flat=True)
+        )
+        users.delete()   # cascade: orders, items, carrito, drafts
+        ShipmentOrder.objects.filter(id__in=shipment_ids).delete()
+        Product.objects.filter(name__startswith=PRODUCT_PREFIX).delete()
+        self.stdout.write("Datos de prueba eliminados.")
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    """ Percentil nearest-rank sobre una lista ordenada. """
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
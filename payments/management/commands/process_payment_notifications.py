@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.services.notifications import PaymentNotificationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Procesa la cola de notificaciones de pago de Mercado Pago: consulta cada pago en la API, "
+        "crea la factura y confirma la orden. Con --loop queda corriendo como worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=PaymentNotificationService.BATCH_SIZE,
+            help="Notificaciones por lote."
+        )
+        parser.add_argument('--loop', action='store_true', help="No termina, sigue leyendo la cola.")
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help="Segundos de espera cuando la cola está vacía (solo con --loop)."
+        )
+
+    def handle(self, *args, **options):
+        totals = {"claimed": 0, "processed": 0, "retried": 0, "failed": 0}
+
+        try:
+            while True:
+                stats = PaymentNotificationService.process_batch(options['batch_size'])
+                for key, value in stats.items():
+                    totals[key] += value
+
+                if stats["claimed"]:
+                    self.stdout.write(
+                        f"lote: {stats['processed']} procesadas, {stats['retried']} reintentos, "
+                        f"{stats['failed']} fallidas"
+                    )
+
+                if stats["claimed"] < options['batch_size'] or not stats["processed"]:
+                    # cola vacía (o solo reintentos): terminar o esperar
+                    if not options['loop']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass   # el lote en curso ya quedó guardado, lo reclamado sin terminar se recupera por STALE_CLAIM
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['processed']} notificaciones procesadas, {totals['retried']} para reintentar, "
+            f"{totals['failed']} fallidas."
+        ))
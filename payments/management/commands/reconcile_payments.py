@@ -0,0 +1,77 @@
+import time
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from payments.services.reconciliation import PaymentReconciliationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Concilia órdenes pendientes pagadas con Mercado Pago: busca el pago de cada orden "
+        "(external_reference) en paralelo y confirma las aprobadas (factura + estado) por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size', type=int, default=PaymentReconciliationService.PAGE_SIZE,
+            help="Órdenes por lote (cada lote se aplica en su propia transacción)."
+        )
+        parser.add_argument(
+            '--workers', type=int, default=PaymentReconciliationService.WORKERS,
+            help="Consultas concurrentes a Mercado Pago."
+        )
+        parser.add_argument(
+            '--min-age', type=int, default=30,
+            help="Minutos: ignora órdenes más nuevas (checkout en curso)."
+        )
+        parser.add_argument('--days', type=int, default=None, help="Solo órdenes de los últimos N días.")
+        parser.add_argument('--limit', type=int, default=None, help="Máximo de órdenes a revisar.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo informa, no modifica nada.")
+        parser.add_argument('--verbose-details', action='store_true', help="Lista cada orden confirmada o con error.")
+
+    def handle(self, *args, **options):
+        totals = {
+            "orders": 0, "without_payment": 0, "not_approved": 0, "confirmed": 0,
+            "already_confirmed": 0, "invalid": 0, "errors": 0,
+        }
+        pages = PaymentReconciliationService.iter_pending_pages(
+            page_size=options['page_size'],
+            min_age=timedelta(minutes=options['min_age']),
+            max_age=timedelta(days=options['days']) if options['days'] else None,
+        )
+
+        start = time.perf_counter()
+        for order_ids in pages:
+            if options['limit'] is not None:
+                order_ids = order_ids[:options['limit'] - totals["orders"]]
+
+            stats = PaymentReconciliationService.reconcile_page(
+                order_ids, workers=options['workers'], dry_run=options['dry_run']
+            )
+            for key in totals:
+                totals[key] += stats[key]
+
+            if options['verbose_details']:
+                for detail in stats["details"]:
+                    self.stdout.write(f"  orden {detail['order_id']}: {detail['outcome']} {detail['detail'] or ''}")
+
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{totals['orders']} órdenes revisadas, {totals['confirmed']} confirmadas "
+                f"({totals['orders'] / elapsed:.1f} órdenes/s)"
+            )
+
+            if options['limit'] is not None and totals["orders"] >= options['limit']:
+                break
+
+        elapsed = time.perf_counter() - start
+        prefix = "[dry-run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{totals['orders']} órdenes en {elapsed:.2f}s "
+            f"({totals['orders'] / elapsed if elapsed else 0:.1f} órdenes/s): "
+            f"{totals['confirmed']} confirmadas, {totals['already_confirmed']} ya confirmadas, "
+            f"{totals['not_approved']} sin aprobar, {totals['without_payment']} sin pago, "
+            f"{totals['invalid']} inválidas, {totals['errors']} errores."
+        ))
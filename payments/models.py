@@ -1,3 +1,58 @@
 from django.db import models
 
-# Create your models here.
+
+class PaymentNotification(models.Model):
+    """
+    Queue of Mercado Pago payment notifications (IPN / webhooks).
+
+    The webhook endpoint only inserts (or re-queues) one row per payment id and
+    answers 200 right away; `PaymentNotificationService.process_batch()` later
+    fetches the payment from the API and applies it to the order. Mercado Pago
+    sends several notifications for the same payment (created, updated, IPN and
+    webhook at the same time), they all collapse into the same row.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_PROCESSED = "processed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pendiente"),
+        (STATUS_PROCESSING, "Procesando"),
+        (STATUS_PROCESSED, "Procesada"),
+        (STATUS_FAILED, "Fallida"),
+    ]
+
+    payment_id = models.BigIntegerField(unique=True)
+    topic = models.CharField(max_length=30, default="payment")
+    payload = models.JSONField(blank=True, null=True)   # ultimo body recibido, solo para debug
+
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    times_notified = models.PositiveIntegerField(default=1)
+    last_error = models.TextField(blank=True, null=True)
+
+    # resultado del ultimo procesamiento
+    payment_status = models.CharField(max_length=30, blank=True, null=True)
+    order = models.ForeignKey(
+        'orders.Order', on_delete=models.SET_NULL, null=True, blank=True, related_name='payment_notifications'
+    )
+
+    received_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Notificación de pago"
+        verbose_name_plural = "Notificaciones de pago"
+        indexes = [
+            # el worker solo recorre las pendientes
+            models.Index(
+                fields=['id'], name='payment_notif_pending_idx',
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Notificación pago {self.payment_id} ({self.status})"
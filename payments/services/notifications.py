@@ -0,0 +1,274 @@
+# payments/services/notifications.py
+import hashlib
+import hmac
+import json
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from typing import Any
+
+from payments.gateway import PaymentGatewayUnavailable, get_mp_client
+from payments.models import PaymentNotification
+from payments.services.payment_confirmation import PaymentConfirmationService
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentNotificationService:
+    """
+    Ingestion and batch processing of Mercado Pago payment notifications.
+
+    The webhook request only runs `enqueue()` (one INSERT ... ON CONFLICT) and
+    answers 200, so Mercado Pago never times out or retries because the store
+    was slow. The worker (`manage.py process_payment_notifications`) calls
+    `process_batch()`, which:
+        1. Claims a batch of pending rows (SELECT ... FOR UPDATE SKIP LOCKED,
+           several workers can run at the same time).
+        2. Fetches the payments from the API in parallel, outside any transaction.
+        3. Applies them with `PaymentConfirmationService` (invoice + order status).
+        4. Marks the rows as processed, or back to pending / failed on errors.
+
+    Notifications are never trusted: the payment status always comes from the
+    API with our own access token.
+    """
+
+    BATCH_SIZE = 50
+    FETCH_WORKERS = 8
+    MAX_ATTEMPTS = 5
+    STALE_CLAIM = timedelta(minutes=5)   # filas 'processing' de un worker que murió
+
+    PAYMENT_TOPICS = frozenset({"payment", "payment.created", "payment.updated"})
+
+    @staticmethod
+    def parse_notification(query_params, data: Any) -> tuple[str | None, int | None]:
+        """
+        Extract (topic, payment_id) from the IPN or webhook formats:
+            - IPN:      ?topic=payment&id=123
+            - Webhook:  ?type=payment&data.id=123  /  {"type": "payment", "data": {"id": "123"}}
+
+        Returns:
+            tuple: (topic, payment_id); payment_id is None if it is missing or not numeric.
+        """
+        data = data if isinstance(data, dict) else {}
+        body_data = data.get("data") if isinstance(data.get("data"), dict) else {}
+
+        topic = (
+            query_params.get("topic") or query_params.get("type")
+            or data.get("topic") or data.get("type") or data.get("action")
+        )
+        raw_id = (
+            query_params.get("data.id") or query_params.get("id")
+            or body_data.get("id") or data.get("resource")
+        )
+        # IPN viejo: "resource" puede venir como url ".../v1/payments/123"
+        if isinstance(raw_id, str):
+            raw_id = raw_id.rstrip("/").rsplit("/", 1)[-1]
+
+        try:
+            payment_id = int(raw_id)
+        except (TypeError, ValueError):
+            payment_id = None
+        return topic, payment_id
+
+    @staticmethod
+    def is_valid_signature(*, signature: str | None, request_id: str | None, data_id: int) -> bool:
+        """
+        Validate the `x-signature` header of a webhook when a secret is configured
+        (MERCADO_PAGO_WEBHOOK_SECRET). Notifications without the header (IPN) are
+        accepted: processing only trusts the payment fetched from the API.
+        """
+        secret = getattr(settings, "MERCADO_PAGO_WEBHOOK_SECRET", "")
+        if not secret or not signature:
+            return True
+
+        parts = dict(
+            part.strip().split("=", 1) for part in signature.split(",") if "=" in part
+        )
+        ts, received = parts.get("ts"), parts.get("v1")
+        if not ts or not received:
+            return False
+
+        manifest = f"id:{data_id};"
+        if request_id:
+            manifest += f"request-id:{request_id};"
+        manifest += f"ts:{ts};"
+        expected = hmac.new(secret.encode(), manifest.encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, received)
+
+    @staticmethod
+    def enqueue(*, payment_id: int, topic: str, payload: dict | None = None) -> None:
+        """
+        Queue a payment notification, deduplicated by payment id.
+
+        A repeated notification of a queued payment only bumps its counter. A
+        notification of an already processed (or failed) payment puts it back
+        in the queue, since it usually means the payment status changed.
+        A single statement, safe under concurrent requests.
+        """
+        table = PaymentNotification._meta.db_table
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table}
+                    (payment_id, topic, payload, status, attempts, times_notified, received_at, updated_at)
+                VALUES (%s, %s, %s::jsonb, %s, 0, 1, %s, %s)
+                ON CONFLICT (payment_id) DO UPDATE SET
+                    times_notified = {table}.times_notified + 1,
+                    payload = EXCLUDED.payload,
+                    updated_at = EXCLUDED.updated_at,
+                    attempts = CASE WHEN {table}.status = %s THEN 0 ELSE {table}.attempts END,
+                    status = %s
+                """,
+                [
+                    payment_id, topic[:30], json.dumps(payload) if payload is not None else None,
+                    PaymentNotification.STATUS_PENDING, now, now,
+                    PaymentNotification.STATUS_FAILED, PaymentNotification.STATUS_PENDING,
+                ],
+            )
+
+    @staticmethod
+    def process_batch(batch_size: int | None = None) -> dict[str, int]:
+        """
+        Process one batch of queued notifications.
+
+        Returns:
+            dict: {"claimed", "processed", "retried", "failed"} counters.
+        """
+        cls = PaymentNotificationService
+        claimed = cls._claim(batch_size or cls.BATCH_SIZE)
+        stats = {"claimed": len(claimed), "processed": 0, "retried": 0, "failed": 0}
+        if not claimed:
+            return stats
+
+        fetched = cls._fetch_payments([row["payment_id"] for row in claimed])
+        payments = [payment for payment in fetched.values() if isinstance(payment, dict)]
+
+        results = {}
+        apply_error = None
+        if payments:
+            try:
+                results = PaymentConfirmationService.apply_payments(payments)
+            except Exception as e:   # se reintenta el lote completo
+                logger.exception("Error applying Mercado Pago payments")
+                apply_error = repr(e)
+
+        now = timezone.now()
+        finished = []
+        for row in claimed:
+            payment = fetched.get(row["payment_id"])
+            notification = PaymentNotification(id=row["id"], attempts=row["attempts"])
+
+            if isinstance(payment, dict) and apply_error is None:
+                result = results.get(int(payment["id"]), {})
+                notification.status = PaymentNotification.STATUS_PROCESSED
+                notification.payment_status = payment.get("status")
+                confirmed = result.get("outcome") in (
+                    PaymentConfirmationService.CONFIRMED, PaymentConfirmationService.ALREADY_CONFIRMED
+                )
+                # la orden solo se enlaza si existe (external_reference puede ser cualquier cosa)
+                notification.order_id = result.get("order_id") if confirmed else None
+                notification.last_error = (
+                    result.get("detail") if result.get("outcome") == PaymentConfirmationService.INVALID else None
+                )
+                notification.processed_at = now
+                stats["processed"] += 1
+            else:
+                error = apply_error or repr(payment)
+                if isinstance(payment, PaymentGatewayUnavailable):
+                    notification.attempts -= 1   # circuito abierto: no cuenta como intento
+                if notification.attempts >= cls.MAX_ATTEMPTS:
+                    notification.status = PaymentNotification.STATUS_FAILED
+                    stats["failed"] += 1
+                else:
+                    notification.status = PaymentNotification.STATUS_PENDING
+                    stats["retried"] += 1
+                notification.last_error = error[:1000]
+                notification.processed_at = None
+                notification.payment_status = None
+                notification.order_id = None
+
+            notification.updated_at = now
+            finished.append(notification)
+
+        cls._finish(finished)
+        return stats
+
+    # -------------------- private methods
+    @staticmethod
+    def _claim(batch_size: int) -> list[dict]:
+        """
+        Lock a batch of pending rows and mark them as processing (short transaction).
+        """
+        stale = timezone.now() - PaymentNotificationService.STALE_CLAIM
+        with transaction.atomic():
+            ids = list(
+                PaymentNotification.objects
+                .filter(
+                    Q(status=PaymentNotification.STATUS_PENDING)
+                    | Q(status=PaymentNotification.STATUS_PROCESSING, claimed_at__lt=stale)
+                )
+                .order_by('id')
+                .select_for_update(skip_locked=True)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return []
+
+            PaymentNotification.objects.filter(id__in=ids).update(
+                status=PaymentNotification.STATUS_PROCESSING,
+                claimed_at=timezone.now(),
+                attempts=F('attempts') + 1,
+            )
+            return list(
+                PaymentNotification.objects
+                .filter(id__in=ids)
+                .order_by('id')
+                .values('id', 'payment_id', 'attempts')
+            )
+
+    @staticmethod
+    def _fetch_payments(payment_ids: list[int]) -> dict[int, dict | Exception]:
+        """
+        GET every payment in parallel (the client session is thread-safe and pooled).
+        Failed fetches are returned as the exception instead of the payment.
+        """
+        client = get_mp_client()
+
+        def fetch(payment_id):
+            try:
+                return client.get_payment(payment_id)
+            except Exception as e:   # PaymentGatewayError o respuesta inesperada
+                return e
+
+        workers = min(PaymentNotificationService.FETCH_WORKERS, len(payment_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(payment_ids, pool.map(fetch, payment_ids)))
+
+    @staticmethod
+    def _finish(notifications: list[PaymentNotification]) -> None:
+        """
+        Save the outcome of the batch. Rows re-queued by a new notification while
+        they were being processed stay pending, so the newer status is not lost.
+        """
+        with transaction.atomic():
+            still_processing = set(
+                PaymentNotification.objects
+                .filter(
+                    id__in=[n.id for n in notifications],
+                    status=PaymentNotification.STATUS_PROCESSING,
+                )
+                .select_for_update()
+                .values_list('id', flat=True)
+            )
+            PaymentNotification.objects.bulk_update(
+                [n for n in notifications if n.id in still_processing],
+                ['status', 'attempts', 'last_error', 'payment_status', 'order_id', 'processed_at', 'updated_at'],
+            )
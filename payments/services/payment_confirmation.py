@@ -0,0 +1,202 @@
+# payments/services/payment_confirmation.py
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from typing import Any
+
+from orders.models import Order, Invoice
+from orders.enums import StatusOrderEnum
+from orders.services.status_transitions import OrderStatusTransitionService
+
+
+class PaymentConfirmationService:
+    """
+    Applies Mercado Pago payments (as returned by `GET /v1/payments/<id>`) to
+    their orders, in batches.
+
+    Used by the notification worker and by the reconciliation job, so a payment
+    is confirmed the same way no matter how we found out about it. For each
+    batch:
+        1. One SELECT of the referenced orders and one of their invoices.
+        2. One bulk INSERT of the missing invoices + one bulk UPDATE of the existing ones.
+        3. One bulk status change to PAYMENT_CONFIRMED (OrderStatusTransitionService).
+    Everything runs in a single transaction, an order is never confirmed without its invoice.
+
+    Applying the same payment twice is harmless: the second time the order is
+    already confirmed and the invoice already exists.
+    """
+
+    APPROVED = "approved"
+    AMOUNT_TOLERANCE = Decimal("0.01")
+
+    # outcomes por pago
+    CONFIRMED = "confirmed"
+    ALREADY_CONFIRMED = "already_confirmed"
+    NOT_APPROVED = "not_approved"
+    INVALID = "invalid"
+
+    @staticmethod
+    def apply_payments(payments: list[dict]) -> dict[int, dict[str, Any]]:
+        """
+        Confirm the orders of the approved payments.
+
+        Args:
+            payments (list[dict]): Payment resources from the Mercado Pago API.
+
+        Returns:
+            dict: {payment_id: {"order_id": int | None, "outcome": str, "detail": str | None}}
+                outcome is one of "confirmed", "already_confirmed", "not_approved" or "invalid".
+        """
+        cls = PaymentConfirmationService
+        results: dict[int, dict[str, Any]] = {}
+        approved: dict[int, dict] = {}   # order_id -> payment (el primero aprobado gana)
+
+        for payment in payments:
+            payment_id = int(payment["id"])
+            order_id = cls._get_order_id(payment)
+            results[payment_id] = {"order_id": order_id, "outcome": None, "detail": None}
+
+            if order_id is None:
+                results[payment_id].update(outcome=cls.INVALID, detail="Pago sin external_reference válido.")
+            elif payment.get("status") != cls.APPROVED:
+                results[payment_id].update(outcome=cls.NOT_APPROVED, detail=payment.get("status"))
+            elif order_id in approved:
+                results[payment_id].update(
+                    outcome=cls.INVALID, detail=f"La orden ya tiene el pago {approved[order_id]['id']}."
+                )
+            else:
+                approved[order_id] = payment
+
+        if not approved:
+            return results
+
+        with transaction.atomic():
+            orders = {
+                order.id: order
+                for order in (
+                    Order.objects
+                    .filter(id__in=approved.keys())
+                    .select_for_update()
+                    .only('id', 'user_id', 'total', 'status_id')
+                )
+            }
+
+            to_confirm: dict[int, dict] = {}
+            for order_id, payment in approved.items():
+                result = results[int(payment["id"])]
+                order = orders.get(order_id)
+                detail = cls._validate(order, payment)
+                if detail:
+                    result.update(outcome=cls.INVALID, detail=detail)
+                elif order.status_id in OrderStatusTransitionService.SOLD:
+                    result.update(outcome=cls.ALREADY_CONFIRMED)
+                elif StatusOrderEnum.PAYMENT_CONFIRMED not in OrderStatusTransitionService.TRANSITIONS.get(
+                    order.status_id, frozenset()
+                ):
+                    # ej: orden cancelada que igual se pagó -> revisar / devolver a mano
+                    result.update(outcome=cls.INVALID, detail="Transición de estado no permitida.")
+                else:
+                    to_confirm[order_id] = payment
+
+            if not to_confirm:
+                return results
+
+            cls._save_invoices({order_id: orders[order_id] for order_id in to_confirm}, to_confirm)
+
+            ids = list(to_confirm)
+            for start in range(0, len(ids), OrderStatusTransitionService.MAX_ORDERS):
+                report = OrderStatusTransitionService.bulk_change_status(
+                    order_ids=ids[start:start + OrderStatusTransitionService.MAX_ORDERS],
+                    status_id=StatusOrderEnum.PAYMENT_CONFIRMED,
+                )
+                for row in report["results"]:
+                    result = results[int(to_confirm[row["order_id"]]["id"])]
+                    if row["success"]:
+                        result.update(outcome=cls.CONFIRMED)
+                    else:
+                        result.update(outcome=cls.INVALID, detail=row["detail"])
+
+        return results
+
+    # -------------------- private methods
+    @staticmethod
+    def _get_order_id(payment: dict) -> int | None:
+        try:
+            return int(payment.get("external_reference"))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _validate(order: Order | None, payment: dict) -> str | None:
+        """
+        Error message if the payment can not confirm the order, None if it can.
+        """
+        if order is None:
+            return "Orden no encontrada."
+        try:
+            amount = Decimal(str(payment.get("transaction_amount")))
+        except InvalidOperation:
+            return "Pago sin monto."
+        if order.total is not None and amount + PaymentConfirmationService.AMOUNT_TOLERANCE < order.total:
+            return f"Monto pagado {amount} menor al total de la orden {order.total}."
+        return None
+
+    @staticmethod
+    def _save_invoices(orders: dict[int, Order], payments: dict[int, dict]) -> None:
+        """
+        Create the invoices of the orders that do not have one yet and attach
+        the payment data to the existing ones.
+        """
+        existing = {
+            invoice.order_id: invoice
+            for invoice in Invoice.objects.filter(order_id__in=orders.keys())
+        }
+        now = timezone.now()
+        to_create, to_update = [], []
+
+        for order_id, order in orders.items():
+            payment = payments[order_id]
+            processor_data = PaymentConfirmationService._processor_data(payment)
+            paid_at = parse_datetime(payment.get("date_approved") or "") or now
+            total_mp = Decimal(str(
+                (payment.get("transaction_details") or {}).get("net_received_amount")
+                or payment.get("transaction_amount")
+            ))
+
+            invoice = existing.get(order_id)
+            if invoice is None:
+                to_create.append(Invoice(
+                    order_id=order_id,
+                    user_id=order.user_id,
+                    fiscal_total=order.total or 0,
+                    payment_processor_data=processor_data,
+                    is_paid=True,
+                    paid_at=paid_at,
+                    total_mp=total_mp,
+                ))
+            else:
+                invoice.payment_processor_data = processor_data
+                invoice.is_paid = True
+                invoice.paid_at = invoice.paid_at or paid_at
+                invoice.total_mp = total_mp
+                invoice.updated_at = now   # bulk_update no aplica auto_now
+                to_update.append(invoice)
+
+        if to_create:
+            Invoice.objects.bulk_create(to_create)
+        if to_update:
+            Invoice.objects.bulk_update(
+                to_update, ['payment_processor_data', 'is_paid', 'paid_at', 'total_mp', 'updated_at']
+            )
+
+    @staticmethod
+    def _processor_data(payment: dict) -> dict:
+        """ Only the fields worth keeping from the payment resource. """
+        keys = (
+            "id", "status", "status_detail", "payment_method_id", "payment_type_id",
+            "transaction_amount", "currency_id", "date_created", "date_approved", "preference_id",
+        )
+        return {"processor": "mercado_pago", **{key: payment.get(key) for key in keys}}
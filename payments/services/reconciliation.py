@@ -0,0 +1,133 @@
+# payments/services/reconciliation.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.utils import timezone
+
+from typing import Any, Iterator
+
+from orders.models import Order
+from orders.enums import PaymentMethodEnum, StatusOrderEnum
+from payments.gateway import get_mp_client
+from payments.services.payment_confirmation import PaymentConfirmationService
+
+
+class PaymentReconciliationService:
+    """
+    Finds Mercado Pago payments of orders that never got confirmed (lost
+    notification, buyer closed the tab before the back_url redirect, worker
+    down) and applies them.
+
+    Orders are read by pages with keyset pagination on the id, the payments of
+    a page are searched in parallel (`external_reference` = order id) with a
+    bounded thread pool, and each page is applied with
+    `PaymentConfirmationService` in its own short transaction.
+    """
+
+    PAGE_SIZE = 200
+    WORKERS = 8
+    PENDING_STATUSES = (StatusOrderEnum.PENDING, StatusOrderEnum.PAYMENT_PENDING)
+
+    @staticmethod
+    def iter_pending_pages(
+        *, page_size: int = PAGE_SIZE, min_age: timedelta, max_age: timedelta | None = None
+    ) -> Iterator[list[int]]:
+        """
+        Yield lists of ids of pending Mercado Pago orders, oldest first.
+
+        Args:
+            page_size (int): Orders per page.
+            min_age (timedelta): Skip orders younger than this (checkout still in progress).
+            max_age (timedelta | None): Skip orders older than this.
+        """
+        now = timezone.now()
+        qs = Order.objects.filter(
+            status_id__in=PaymentReconciliationService.PENDING_STATUSES,
+            payment_id=PaymentMethodEnum.MERCADO_PAGO,
+            created_at__lte=now - min_age,
+        )
+        if max_age is not None:
+            qs = qs.filter(created_at__gte=now - max_age)
+
+        last_id = 0
+        while True:
+            ids = list(
+                qs.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:page_size]
+            )
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    @staticmethod
+    def fetch_payments(order_ids: list[int], workers: int = WORKERS) -> dict[int, dict | None | Exception]:
+        """
+        Search the payment of every order in parallel.
+
+        Returns:
+            dict: {order_id: payment} with the approved payment if there is one, else
+                the most recent one; None if the order has no payments and the
+                exception if the search failed.
+        """
+        client = get_mp_client()
+
+        def fetch(order_id):
+            try:
+                response = client.search_payments(
+                    external_reference=str(order_id), sort="date_created", criteria="desc"
+                )
+            except Exception as e:   # PaymentGatewayError: se reporta y se sigue con el resto
+                return e
+            results = response.get("results") or []
+            approved = [p for p in results if p.get("status") == PaymentConfirmationService.APPROVED]
+            return (approved or results or [None])[0]
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(order_ids)) or 1) as pool:
+            return dict(zip(order_ids, pool.map(fetch, order_ids)))
+
+    @staticmethod
+    def reconcile_page(order_ids: list[int], *, workers: int = WORKERS, dry_run: bool = False) -> dict[str, Any]:
+        """
+        Fetch and apply the payments of one page of orders.
+
+        Returns:
+            dict: Counters {"orders", "without_payment", "not_approved", "confirmed",
+                "already_confirmed", "invalid", "errors"} and "details" (list of
+                {"order_id", "outcome", "detail"} for everything that was not a plain skip).
+        """
+        fetched = PaymentReconciliationService.fetch_payments(order_ids, workers)
+        stats = {
+            "orders": len(order_ids), "without_payment": 0, "not_approved": 0, "confirmed": 0,
+            "already_confirmed": 0, "invalid": 0, "errors": 0, "details": [],
+        }
+
+        approved = {}   # order_id -> payment
+        for order_id, payment in fetched.items():
+            if isinstance(payment, Exception):
+                stats["errors"] += 1
+                stats["details"].append({"order_id": order_id, "outcome": "error", "detail": repr(payment)})
+            elif payment is None:
+                stats["without_payment"] += 1
+            elif payment.get("status") != PaymentConfirmationService.APPROVED:
+                stats["not_approved"] += 1
+            else:
+                approved[order_id] = payment
+
+        if dry_run:
+            stats["confirmed"] = len(approved)
+            stats["details"] += [
+                {"order_id": order_id, "outcome": "would_confirm", "detail": payment["id"]}
+                for order_id, payment in approved.items()
+            ]
+            return stats
+
+        if approved:
+            results = PaymentConfirmationService.apply_payments(list(approved.values()))
+            for result in results.values():
+                stats[result["outcome"]] += 1
+                if result["outcome"] != PaymentConfirmationService.ALREADY_CONFIRMED:
+                    stats["details"].append({
+                        "order_id": result["order_id"], "outcome": result["outcome"], "detail": result["detail"]
+                    })
+
+        return stats
@@ -0,0 +1,248 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from django.urls import resolve
+
+from payments.gateway import (
+    CircuitBreaker, MercadoPagoClient, PaymentGatewayError, PaymentGatewayUnavailable
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the Mercado Pago API.
+    `server.fail_next` requests answer 503 before the stub starts answering 201/200.
+    """
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.idempotency_keys.append(self.headers.get("X-Idempotency-Key"))
+
+        if self._should_fail():
+            return self._reply(503, {"message": "unavailable"})
+        self._reply(201, {"id": "pref-123", "external_reference": body.get("external_reference")})
+
+    def do_GET(self):
+        if self._should_fail():
+            return self._reply(503, {"message": "unavailable"})
+        if self.path.startswith("/v1/payments/404"):
+            return self._reply(404, {"message": "not found"})
+        if self.path.startswith("/v1/payments/500"):
+            return self._reply_raw(200, b"<html>mantenimiento</html>", "text/html")
+        self._reply(200, {"id": int(self.path.rsplit("/", 1)[-1]), "status": "approved"})
+
+    def log_message(self, *args):
+        pass   # sin ruido en la salida de pytest
+
+    def _should_fail(self) -> bool:
+        self.server.calls += 1
+        if self.server.fail_next > 0:
+            self.server.fail_next -= 1
+            return True
+        return False
+
+    def _reply(self, status_code: int, payload: dict):
+        self._reply_raw(status_code, json.dumps(payload).encode(), "application/json")
+
+    def _reply_raw(self, status_code: int, data: bytes, content_type: str):
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.fail_next = 0
+    server.calls = 0
+    server.idempotency_keys = []
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(stub, **kwargs):
+    options = {
+        "access_token": "TEST-token",
+        "base_url": f"http://127.0.0.1:{stub.server_address[1]}",
+        "backoff_base": 0.001,
+        "backoff_max": 0.002,
+    }
+    options.update(kwargs)
+    return MercadoPagoClient(**options)
+
+
+def test_create_preference_ok(stub):
+    client = make_client(stub)
+    preference = client.create_preference({"external_reference": "10"})
+
+    assert preference == {"id": "pref-123", "external_reference": "10"}
+    metrics = client.metrics.snapshot()["operations"]["create_preference"]
+    assert metrics["calls"] == 1
+    assert metrics["outcomes"] == {"ok": 1}
+
+
+def test_retries_transient_errors_with_same_idempotency_key(stub):
+    stub.fail_next = 2
+    client = make_client(stub, max_retries=2)
+
+    assert client.create_preference({})["id"] == "pref-123"
+    assert stub.calls == 3
+    assert len(set(stub.idempotency_keys)) == 1
+    assert client.metrics.snapshot()["operations"]["create_preference"]["retries"] == 2
+
+
+def test_client_errors_are_not_retried(stub):
+    client = make_client(stub)
+
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(404)
+    assert stub.calls == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_do_not_reset_failures(stub):
+    client = make_client(
+        stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    )
+    stub.fail_next = 1
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(1)
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(404)
+
+    # el 404 no cuenta como exito: la segunda falla del gateway abre el circuito
+    stub.fail_next = 1
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(1)
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_client_error_in_half_open_trial_keeps_circuit_half_open(stub):
+    client = make_client(
+        stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    )
+    stub.fail_next = 1
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(1)
+
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(404)
+    # el trial quedo libre pero el circuito no se cerro
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.get_payment(7) == {"id": 7, "status": "approved"}
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_json_success_body_is_a_gateway_error(stub):
+    client = make_client(
+        stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    )
+
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(500)
+
+    outcomes = client.metrics.snapshot()["operations"]["get_payment"]["outcomes"]
+    assert outcomes == {"invalid_response": 1}
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_circuit_opens_and_fails_fast(stub):
+    stub.fail_next = 100
+    client = make_client(
+        stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    )
+
+    for _ in range(2):
+        with pytest.raises(PaymentGatewayError):
+            client.get_payment(1)
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    calls = stub.calls
+    with pytest.raises(PaymentGatewayUnavailable):
+        client.get_payment(1)
+    assert stub.calls == calls   # no llegó al servidor
+
+
+def test_half_open_trial_closes_circuit(stub):
+    client = make_client(
+        stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    )
+    stub.fail_next = 1
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(1)
+
+    assert client.get_payment(7) == {"id": 7, "status": "approved"}
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_other_request_errors_count_as_gateway_failures(stub, monkeypatch):
+    client = make_client(
+        stub, max_retries=1, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    )
+
+    def broken_body(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    monkeypatch.setattr(client.session, "request", broken_body)
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(1)
+
+    metrics = client.metrics.snapshot()["operations"]["get_payment"]
+    assert metrics["outcomes"] == {"request_error": 1}
+    assert metrics["retries"] == 1
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_unexpected_error_releases_half_open_trial(stub, monkeypatch):
+    client = make_client(
+        stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    )
+    stub.fail_next = 1
+    with pytest.raises(PaymentGatewayError):
+        client.get_payment(1)
+
+    # el trial del half-open explota con algo que no es de requests
+    with monkeypatch.context() as patch:
+        patch.setattr(client.session, "request", lambda *a, **kw: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            client.get_payment(1)
+
+    # sin el finally el breaker quedaria con el trial tomado y fallaria rapido siempre
+    assert client.get_payment(7) == {"id": 7, "status": "approved"}
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_read_timeout_is_enforced():
+    # servidor que acepta la conexion pero nunca responde
+    import socket
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1)
+    try:
+        client = MercadoPagoClient(
+            access_token="TEST-token",
+            base_url=f"http://127.0.0.1:{sock.getsockname()[1]}",
+            read_timeout=0.2,
+            max_retries=0,
+        )
+        with pytest.raises(PaymentGatewayError):
+            client.get_payment(1)
+        outcomes = client.metrics.snapshot()["operations"]["get_payment"]["outcomes"]
+        assert outcomes == {"timeout": 1}
+    finally:
+        sock.close()
+
+
+def test_metrics_route_is_routed_from_root_urlconf():
+    assert resolve("/api/payments/gateway/metrics/").url_name == "payments_gateway_metrics"
@@ -0,0 +1,158 @@
+import hashlib
+import hmac
+
+import pytest
+from decimal import Decimal
+
+from django.urls import resolve
+
+from orders.models import Order, ItemOrder, Invoice, StatusOrder
+from orders.enums import StatusOrderEnum
+from payments.fake_mp_server import FakeMercadoPagoServer
+from payments.gateway import MercadoPagoClient, set_mp_client
+from payments.models import PaymentNotification
+from payments.services.notifications import PaymentNotificationService
+
+# others apps
+from products.models.product import Product
+
+
+WEBHOOK_URL = "/api/payments/webhooks/mercadopago/"
+
+
+@pytest.fixture
+def fake_mp():
+    server = FakeMercadoPagoServer(("127.0.0.1", 0))
+    server.start_in_thread()
+    set_mp_client(MercadoPagoClient(access_token="TEST-token", base_url=server.base_url, max_retries=0))
+    yield server
+    set_mp_client(None)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def order(user):
+    for status in StatusOrderEnum:
+        StatusOrder.objects.get_or_create(id=status.value, defaults={"name": status.label})
+
+    product = Product.objects.create(
+        name="Peluche Pikachu", price=Decimal("1500"), stock=10, stock_reserved=2, available=True
+    )
+    order = Order.objects.create(user=user, status_id=StatusOrderEnum.PENDING, total=Decimal("3000"))
+    ItemOrder.objects.create(order=order, product=product, quantity=2, final_price=Decimal("1500"))
+    return order
+
+
+def pay(fake_mp, order, status="approved", amount="1500"):
+    preference = fake_mp.create_preference({
+        "external_reference": str(order.id),
+        "items": [{"title": "Peluche", "quantity": 2, "unit_price": float(amount)}],
+    })
+    return fake_mp.pay_preference(preference["id"], status)
+
+
+def test_parse_ipn_and_webhook_formats():
+    parse = PaymentNotificationService.parse_notification
+
+    assert parse({"topic": "payment", "id": "123"}, {}) == ("payment", 123)
+    assert parse({"type": "payment", "data.id": "55"}, {}) == ("payment", 55)
+    assert parse({}, {"type": "payment", "data": {"id": "77"}}) == ("payment", 77)
+    assert parse({"topic": "payment"}, {"resource": "https://api.mercadopago.com/v1/payments/9"}) == ("payment", 9)
+    assert parse({"topic": "merchant_order", "id": "abc"}, None) == ("merchant_order", None)
+
+
+def test_signature_validation(settings):
+    settings.MERCADO_PAGO_WEBHOOK_SECRET = "secret"
+    digest = hmac.new(b"secret", b"id:123;request-id:req-1;ts:1700000000;", hashlib.sha256).hexdigest()
+
+    valid = PaymentNotificationService.is_valid_signature
+    assert valid(signature=f"ts=1700000000,v1={digest}", request_id="req-1", data_id=123)
+    assert not valid(signature=f"ts=1700000000,v1={digest}", request_id="req-2", data_id=123)
+    assert valid(signature=None, request_id=None, data_id=123)   # IPN sin firma
+
+
+def test_webhook_is_routed_from_root_urlconf():
+    # la url que se manda como notification_url tiene que resolver en ecommerce.urls
+    assert resolve(WEBHOOK_URL).url_name == "payments_mp_webhook"
+
+
+@pytest.mark.django_db
+def test_webhook_dedupes_by_payment_id(api_client):
+    for _ in range(3):
+        response = api_client.post(f"{WEBHOOK_URL}?topic=payment&id=42", {}, format="json")
+        assert response.status_code == 200
+
+    notification = PaymentNotification.objects.get(payment_id=42)
+    assert notification.times_notified == 3
+    assert notification.status == PaymentNotification.STATUS_PENDING
+
+
+@pytest.mark.django_db
+def test_webhook_ignores_other_topics(api_client):
+    response = api_client.post(f"{WEBHOOK_URL}?topic=merchant_order&id=1", {}, format="json")
+
+    assert response.status_code == 200
+    assert response.json()["queued"] is False
+    assert not PaymentNotification.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_process_batch_confirms_order_and_creates_invoice(fake_mp, order):
+    payment = pay(fake_mp, order)
+    PaymentNotificationService.enqueue(payment_id=payment["id"], topic="payment")
+
+    stats = PaymentNotificationService.process_batch()
+
+    assert stats == {"claimed": 1, "processed": 1, "retried": 0, "failed": 0}
+    order.refresh_from_db()
+    assert order.status_id == StatusOrderEnum.PAYMENT_CONFIRMED
+
+    invoice = Invoice.objects.get(order=order)
+    assert invoice.is_paid and invoice.fiscal_total == Decimal("3000")
+    assert invoice.payment_processor_data["id"] == payment["id"]
+
+    notification = PaymentNotification.objects.get(payment_id=payment["id"])
+    assert notification.status == PaymentNotification.STATUS_PROCESSED
+    assert notification.order_id == order.id
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reprocessing_is_idempotent(fake_mp, order):
+    payment = pay(fake_mp, order)
+    PaymentNotificationService.enqueue(payment_id=payment["id"], topic="payment")
+    PaymentNotificationService.process_batch()
+
+    # MP vuelve a notificar el mismo pago
+    PaymentNotificationService.enqueue(payment_id=payment["id"], topic="payment")
+    stats = PaymentNotificationService.process_batch()
+
+    assert stats["processed"] == 1
+    assert Invoice.objects.filter(order=order).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rejected_or_short_payments_do_not_confirm(fake_mp, order):
+    rejected = pay(fake_mp, order, status="rejected")
+    short = pay(fake_mp, order, amount="10")
+    for payment in (rejected, short):
+        PaymentNotificationService.enqueue(payment_id=payment["id"], topic="payment")
+
+    PaymentNotificationService.process_batch()
+
+    order.refresh_from_db()
+    assert order.status_id == StatusOrderEnum.PENDING
+    assert not Invoice.objects.filter(order=order).exists()
+    assert "menor al total" in PaymentNotification.objects.get(payment_id=short["id"]).last_error
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unknown_payment_is_retried(fake_mp):
+    PaymentNotificationService.enqueue(payment_id=999, topic="payment")
+
+    stats = PaymentNotificationService.process_batch()
+
+    assert stats["retried"] == 1
+    notification = PaymentNotification.objects.get(payment_id=999)
+    assert notification.status == PaymentNotification.STATUS_PENDING
+    assert notification.attempts == 1
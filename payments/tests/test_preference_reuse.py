@@ -0,0 +1,85 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from orders.models import Order, ItemOrder, PaymentMethod, ShipmentMethod, ShipmentOrder
+from orders.enums import PaymentMethodEnum, ShipmentMethodEnum
+from payments.fake_mp_server import FakeMercadoPagoServer
+from payments.gateway import MercadoPagoClient, set_mp_client
+from payments.utils_for_mp import create_preference_data
+
+# others apps
+from products.models.product import Product
+
+
+@pytest.fixture
+def fake_mp(settings):
+    settings.BASE_URL_PAGE = "https://shop.example.com"
+    settings.MERCADO_PAGO_NOTIFICATION_URL = ""
+    server = FakeMercadoPagoServer(("127.0.0.1", 0))
+    server.start_in_thread()
+    set_mp_client(MercadoPagoClient(access_token="TEST-token", base_url=server.base_url, max_retries=0))
+    yield server
+    set_mp_client(None)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def order(user):
+    payment = PaymentMethod.objects.create(id=PaymentMethodEnum.MERCADO_PAGO, name="Mercado Pago", time=4)
+    method = ShipmentMethod.objects.create(id=ShipmentMethodEnum.PICKUP, name="Retiro", price=Decimal("0"))
+    shipment = ShipmentOrder.objects.create(method=method)
+
+    order = Order.objects.create(
+        user=user, payment=payment, shipment=shipment, name="Ash Ketchum", total=Decimal("4500")
+    )
+    for i in range(3):
+        product = Product.objects.create(name=f"Peluche {i}", price=Decimal("1500"), stock=5, available=True)
+        ItemOrder.objects.create(order=order, product=product, quantity=1, final_price=Decimal("1500"))
+
+    return Order.objects.select_related("payment", "shipment__method").get(id=order.id)
+
+
+@pytest.mark.django_db
+def test_preference_is_reused_while_valid(fake_mp, order):
+    first_id, total = create_preference_data(order, 0)
+    second_id, _ = create_preference_data(order, 0)
+
+    assert first_id == second_id
+    assert total == 4500
+    assert len(fake_mp.preferences) == 1
+
+    order.refresh_from_db()
+    assert order.mp_preference_id == first_id
+    assert order.mp_preference_expires_at > timezone.now()
+
+
+@pytest.mark.django_db
+def test_changed_payload_creates_new_preference(fake_mp, order):
+    first_id, _ = create_preference_data(order, 0)
+    second_id, _ = create_preference_data(order, 500)
+
+    assert first_id != second_id
+    assert len(fake_mp.preferences) == 2
+
+
+@pytest.mark.django_db
+def test_expiring_preference_is_not_reused(fake_mp, order):
+    first_id, _ = create_preference_data(order, 0)
+    order.mp_preference_expires_at = timezone.now() + timedelta(minutes=1)
+
+    second_id, _ = create_preference_data(order, 0)
+
+    assert first_id != second_id
+
+
+@pytest.mark.django_db
+def test_reuse_runs_a_single_items_query(fake_mp, order, django_assert_num_queries):
+    create_preference_data(order, 0)
+
+    # items de la orden (sin snapshot) en una sola consulta, sin llamar a la api
+    with django_assert_num_queries(1):
+        create_preference_data(order, 0)
@@ -0,0 +1,90 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from orders.models import Order, Invoice, PaymentMethod, StatusOrder
+from orders.enums import PaymentMethodEnum, StatusOrderEnum
+from payments.fake_mp_server import FakeMercadoPagoServer
+from payments.gateway import MercadoPagoClient, set_mp_client
+from payments.services.reconciliation import PaymentReconciliationService
+
+
+@pytest.fixture
+def fake_mp():
+    server = FakeMercadoPagoServer(("127.0.0.1", 0))
+    server.start_in_thread()
+    set_mp_client(MercadoPagoClient(access_token="TEST-token", base_url=server.base_url, max_retries=0))
+    yield server
+    set_mp_client(None)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def orders(user):
+    for status in StatusOrderEnum:
+        StatusOrder.objects.get_or_create(id=status.value, defaults={"name": status.label})
+    payment = PaymentMethod.objects.create(id=PaymentMethodEnum.MERCADO_PAGO, name="Mercado Pago", time=4)
+
+    created = [
+        Order.objects.create(user=user, payment=payment, status_id=StatusOrderEnum.PENDING, total=Decimal("1000"))
+        for _ in range(5)
+    ]
+    # fuera de la ventana de checkout en curso
+    Order.objects.filter(id__in=[o.id for o in created]).update(created_at=timezone.now() - timedelta(hours=2))
+    return created
+
+
+def pay(fake_mp, order, status="approved"):
+    preference = fake_mp.create_preference({
+        "external_reference": str(order.id),
+        "items": [{"title": "Peluche", "quantity": 1, "unit_price": 1000}],
+    })
+    return fake_mp.pay_preference(preference["id"], status)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reconcile_confirms_paid_orders_only(fake_mp, orders):
+    pay(fake_mp, orders[0])
+    pay(fake_mp, orders[1], status="rejected")
+    pay(fake_mp, orders[2], status="rejected")
+    pay(fake_mp, orders[2])   # reintento aprobado
+
+    pages = list(PaymentReconciliationService.iter_pending_pages(page_size=2, min_age=timedelta(minutes=30)))
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+    totals = {"confirmed": 0, "not_approved": 0, "without_payment": 0}
+    for page in pages:
+        stats = PaymentReconciliationService.reconcile_page(page, workers=4)
+        for key in totals:
+            totals[key] += stats[key]
+
+    assert totals == {"confirmed": 2, "not_approved": 1, "without_payment": 2}
+    confirmed = set(
+        Order.objects.filter(status_id=StatusOrderEnum.PAYMENT_CONFIRMED).values_list("id", flat=True)
+    )
+    assert confirmed == {orders[0].id, orders[2].id}
+    assert Invoice.objects.filter(order_id__in=confirmed, is_paid=True).count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dry_run_does_not_write(fake_mp, orders):
+    pay(fake_mp, orders[0])
+
+    stats = PaymentReconciliationService.reconcile_page([o.id for o in orders], dry_run=True)
+
+    assert stats["confirmed"] == 1
+    assert not Invoice.objects.exists()
+    assert not Order.objects.filter(status_id=StatusOrderEnum.PAYMENT_CONFIRMED).exists()
+
+
+@pytest.mark.django_db
+def test_recent_orders_are_skipped(orders):
+    Order.objects.filter(id=orders[0].id).update(created_at=timezone.now())
+
+    ids = [i for page in PaymentReconciliationService.iter_pending_pages(min_age=timedelta(minutes=30)) for i in page]
+
+    assert orders[0].id not in ids
+    assert len(ids) == 4
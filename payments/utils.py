@@ -1,6 +1,8 @@
 
 
-from orders.models import StatusOrder, Invoice
+from orders.models import Invoice
+from orders.enums import StatusOrderEnum
+from orders.services.orders import OrderService
 
 from cart.carrito import Carrito
 
@@ -93,11 +95,8 @@ def confirm_order(request, payment_mp, order):
                 invoice_number=None  # This generate after create Factura
             )
 
-            # Crear orden
-            status = StatusOrder.objects.get(id=3)  # Orden en estado "Pendiente"
-            order.status = status  # Cambiar estado a "Pendiente"
-            order.invoice = invoice  # Asociar factura
-            order.save()  # Guardar cambios en la base de datos
+            # Cambiar estado a "Pago a Confirmar" (actualiza tambien el snapshot de la orden)
+            OrderService.change_status(order_id=order.id, status_id=StatusOrderEnum.PAYMENT_PENDING)
             
             # Vaciar el carrito tras la compra
             carrito.clear()
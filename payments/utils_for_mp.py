@@ -1,16 +1,36 @@
 
 
-import mercadopago
+import hashlib
+import json
+
+from datetime import timedelta
+
 from django.conf import settings
+from django.utils import timezone as dj_timezone
+
+from orders.models import Order, ItemOrder
+from payments.gateway import get_mp_client
+
 
-sdk = mercadopago.SDK(settings.MERCADO_PAGO_ACCESS_TOKEN)
+# margen minimo de vida que le tiene que quedar a una preferencia para reutilizarla
+PREFERENCE_REUSE_MARGIN = timedelta(minutes=10)
 
 
 def create_preference_data(order, discount):
+    """
+        Devuelve el id de la preferencia de mercado pago de la orden y el total del carrito.
+        
+        Si la orden ya tiene una preferencia vigente creada con el mismo payload (items, payer,
+        urls, descuento) se reutiliza sin llamar a la api. Sino se crea una nueva y se guarda
+        su id, hash y vencimiento en la orden.
+        
+        order (Order): con `payment` y `shipment__method` cargados (select_related)
+    """
     
     # Generar las fechas
     expiration_date_from = generate_datetime(flag='start')
     expiration_date_to = generate_datetime(flag='end', hours_window=order.payment.time)
+    expires_at = dj_timezone.now() + timedelta(hours=order.payment.time)
     
     # get urls for mp payments
     back_urls = get_urls_ngrok(settings.BASE_URL_PAGE)
@@ -42,7 +62,8 @@ def create_preference_data(order, discount):
             "excluded_payment_types" : [],
             "installments" : 1
         },
-        "notification_url": "https://www.your-site.com/ipn",
+        # IPN / webhooks -> payments/views/api/webhooks.py (se procesan en batch con un worker)
+        "notification_url": get_notification_url(),
         "statement_descriptor": settings.PYME_NAME,
         # fechas calculadas con la fucnion en payments/utils.py
         "expires": True, 
@@ -56,16 +77,54 @@ def create_preference_data(order, discount):
         "external_reference": str(order.id),  
     }
 
-    # Crea la preferencia en Mercado Pago
-    preference_response = sdk.preference().create(preference_data)
-    preference = preference_response["response"]
+    # Reutilizar la preferencia guardada si sigue vigente y nada cambio
+    payload_hash = get_preference_hash(preference_data)
+    if is_preference_reusable(order, payload_hash):
+        return order.mp_preference_id, total_cart
+
+    # Crea la preferencia en Mercado Pago (timeouts, reintentos y circuit breaker en payments/gateway.py)
+    # si falla lanza PaymentGatewayError -> 502/503 con el custom handler de DRF
+    preference = get_mp_client().create_preference(preference_data)
     
     # Obtiene el ID de la preferencia que se pasa como contexto
     preference_id = preference["id"]
     
+    # update() y no save(): no toca updated_at (orden de los listados) ni pisa otros campos
+    Order.objects.filter(id=order.id).update(
+        mp_preference_id=preference_id,
+        mp_preference_hash=payload_hash,
+        mp_preference_expires_at=expires_at,
+    )
+    order.mp_preference_id = preference_id
+    order.mp_preference_hash = payload_hash
+    order.mp_preference_expires_at = expires_at
+    
     return preference_id, total_cart
 
 
+def get_preference_hash(preference_data: dict) -> str:
+    """
+        Hash estable del payload de la preferencia, sin las fechas de vencimiento
+        (cambian en cada llamada y no hacen a la preferencia distinta)
+    """
+    data = {
+        key: value for key, value in preference_data.items()
+        if key not in ("expiration_date_from", "expiration_date_to")
+    }
+    raw = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def is_preference_reusable(order, payload_hash: str) -> bool:
+    """
+        True si la orden tiene una preferencia con el mismo payload que no vence pronto
+    """
+    if not order.mp_preference_id or order.mp_preference_hash != payload_hash:
+        return False
+    expires_at = order.mp_preference_expires_at
+    return expires_at is not None and expires_at > dj_timezone.now() + PREFERENCE_REUSE_MARGIN
+
+
 def get_items_from_order(order):
     """
     Se espera que la funcion devuelva todos los items almacenados en el carrito del usuario con el formato
@@ -82,30 +141,40 @@ def get_items_from_order(order):
     },
 
     Args:
-        user_id (_type_, optional): _description_. Defaults to None.
+        order (Order): Orden de la que se arman los items. Si tiene `snapshot` se lee
+            de ahí sin consultas extra, sino se leen los items en una sola consulta (ordenes viejas).
     """
+    if order.snapshot:
+        return get_items_from_snapshot(order.snapshot)
+    
     items = []
     total_cart = 0
 
-    # Precargar relaciones necesarias si no están ya precargadas    # items_order = order.items.all()
-    if not hasattr(order, '_prefetched_objects_cache') or 'items' not in order._prefetched_objects_cache:
-        order.items.all().select_related('product')
+    # Una sola consulta con los datos del producto y su categoria (antes N+1 por item)
+    items_order = (
+        ItemOrder.objects
+        .filter(order_id=order.id)
+        .values(
+            'quantity', 'final_price',
+            'product__id', 'product__name', 'product__main_image', 'product__description',
+            'product__subcategory__category__name',
+        )
+    )
 
     # Procesar items
-    for item in order.items.all():
-        product = item.product
-        price = float(item.price)
-        quantity = item.quantity
-        category_name = (product.category.name or "No Category")[:50]
+    for item in items_order:
+        price = float(item['final_price'])
+        quantity = item['quantity']
+        category_name = (item['product__subcategory__category__name'] or "No Category")[:50]
         
         items.append({
-            "id": str(product.id),
-            "title": product.name[:255],  # MercadoPago tiene límite de 256 chars
+            "id": str(item['product__id']),
+            "title": item['product__name'][:255],  # MercadoPago tiene límite de 256 chars
             "quantity": quantity,
             "unit_price": price,
             "currency_id": "ARS",  # Moneda (ajustar según sea necesario)
-            "picture_url": product.main_image[:500],  # Límite de URL
-            "description": (product.description or '')[:255],
+            "picture_url": (item['product__main_image'] or "")[:500],  # Límite de URL
+            "description": (item['product__description'] or '')[:255],
             "category_id": category_name,
         })
         
@@ -132,6 +201,50 @@ def get_items_from_order(order):
     return items, total_cart
     
 
+def get_items_from_snapshot(snapshot):
+    """
+    Igual que get_items_from_order pero a partir del snapshot desnormalizado de la orden
+    (ver orders/services/snapshots.py), no realiza ninguna consulta a la base de datos.
+    """
+    items = []
+    total_cart = 0
+    
+    for item in snapshot["items"]:
+        product = item["product"]
+        price = float(item["final_price"])
+        quantity = item["quantity"]
+        
+        items.append({
+            "id": str(product["id"]),
+            "title": product["name"][:255],  # MercadoPago tiene límite de 256 chars
+            "quantity": quantity,
+            "unit_price": price,
+            "currency_id": "ARS",
+            "picture_url": (product["main_image"] or "")[:500],  # Límite de URL
+            "category_id": (product["category"] or "No Category")[:50],
+        })
+        
+        total_cart += price * quantity
+    
+    # Al usar check out pro incluiremos al costo de envio si existiera como un item
+    shipment_method = snapshot["shipment"]["method"]
+    shipment_price = float(shipment_method["price"])
+    
+    items.append({
+        "id": shipment_method["id"],
+        "title": shipment_method["name"],
+        "quantity": 1, 
+        "unit_price": shipment_price,
+        "currency_id": "ARS",
+        "description": "Precio del envío",
+        "category_id": "envío",
+    })
+    
+    total_cart += shipment_price
+    
+    return items, total_cart
+
+
 def get_items_with_discount(items, discount, total):
     """  
         Esto es para obtener los items con un descuento total aplicado proporcionalmente
@@ -196,9 +309,12 @@ def get_payer_info_from_form(order):
     }
     """
     
+    # Order solo guarda el nombre completo ("first_name last_name")
+    first_name, _, last_name = (order.name or "").strip().partition(" ")
+    
     payer = {
-        "name": (order.first_name or "")[:25],    # Limit MP
-        "surname": (order.last_name or "")[:25],
+        "name": first_name[:25],    # Limit MP
+        "surname": last_name[:25],
         "email": (order.email or "")[:50],
         "phone": {
             "area_code": "351",
@@ -261,6 +377,17 @@ def generate_datetime(flag: str='start', hours_window: int=4, utc_offset: int=-3
     return formatted_time
 
 
+def get_notification_url() -> str:
+    """
+        Url donde mercado pago envia las notificaciones de pago, por defecto la ruta
+        del webhook sobre BASE_URL_PAGE (se puede pisar con MERCADO_PAGO_NOTIFICATION_URL)
+    """
+    url = getattr(settings, "MERCADO_PAGO_NOTIFICATION_URL", "")
+    if url:
+        return url
+    return settings.BASE_URL_PAGE.rstrip("/") + "/api/payments/webhooks/mercadopago/"
+
+
 def get_urls_ngrok(url: str) -> dict:
     """ 
         Obtiene de forma generica las urls necesarias para trabajar con mercado pago
@@ -0,0 +1,24 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from core.permissions import IsAdminOrSuperUser
+from payments.gateway import get_mp_client
+
+
+class GatewayMetricsAPI(APIView):
+    """
+    GET: latency / error metrics and circuit breaker state of the Mercado Pago
+    client in the worker that serves the request.
+    """
+    # Verificar si es role == 'admin' o user.id == 1
+    permission_classes = [IsAuthenticated, IsAdminOrSuperUser]
+
+    def get(self, request):
+        client = get_mp_client()
+        return Response({
+            "success": True,
+            "circuit": client.breaker.state,
+            **client.metrics.snapshot(),
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,43 @@
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import AllowAny
+
+from payments.services.notifications import PaymentNotificationService
+
+
+class MercadoPagoWebhookAPI(APIView):
+    """
+    POST: Mercado Pago IPN / webhook receiver (`notification_url` of the preferences).
+
+    Only queues the payment id and answers 200 right away, the payment is
+    fetched and applied later by `manage.py process_payment_notifications`.
+    No auth, no CSRF and no throttling: Mercado Pago retries (and eventually
+    disables the url) when the answer is slow or not 2xx.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+    def post(self, request):
+        try:
+            data = request.data
+        except ParseError:
+            data = {}
+
+        topic, payment_id = PaymentNotificationService.parse_notification(request.query_params, data)
+
+        # merchant_order, chargebacks, etc: se confirman igual por la notificacion del pago
+        if payment_id is None or topic not in PaymentNotificationService.PAYMENT_TOPICS:
+            return Response({"success": True, "queued": False}, status=status.HTTP_200_OK)
+
+        if not PaymentNotificationService.is_valid_signature(
+            signature=request.headers.get("x-signature"),
+            request_id=request.headers.get("x-request-id"),
+            data_id=payment_id,
+        ):
+            return Response({"success": False, "detail": "Firma inválida."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        PaymentNotificationService.enqueue(payment_id=payment_id, topic=topic, payload=data or None)
+        return Response({"success": True, "queued": True}, status=status.HTTP_200_OK)
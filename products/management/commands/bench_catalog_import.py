@@ -0,0 +1,110 @@
+import csv
+import os
+import random
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.services.catalog_import import CatalogImportService, _parse_numbered
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark del import de catálogo en paralelo: genera un .csv de prueba y mide el parseo "
+        "con 1, 2, 4 y 8 procesos. Con --write corre además el import completo en dry-run "
+        "(necesita la base de datos; no guarda nada)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000)
+        parser.add_argument('--workers', default='1,2,4,8', help="Cantidades de procesos a medir, separadas por coma.")
+        parser.add_argument('--batch-size', type=int, default=CatalogImportService.BATCH_SIZE)
+        parser.add_argument('--file', help="Usar (o generar la primera vez) este .csv en lugar de uno temporal.")
+        parser.add_argument('--write', action='store_true', help="Medir también el import completo (dry-run).")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        workers_list = [int(w) for w in options['workers'].split(',')]
+        batch_size = options['batch_size']
+        path = options['file'] or os.path.join(tempfile.mkdtemp(), 'catalog_bench.csv')
+
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            _write_catalog(path, options['rows'], options['seed'])
+            self.stdout.write(f"generado {path} en {time.perf_counter() - start:.1f}s")
+        size = os.path.getsize(path) / 1024 / 1024
+
+        self.stdout.write(f"{path} ({size:.0f} MB), lotes de {batch_size} filas, {os.cpu_count()} CPUs")
+        base = None
+        for workers in workers_list:
+            rows, elapsed = self._run(lambda: self._parse(path, workers, batch_size))
+            base = base or elapsed
+            self.stdout.write(
+                f"  parseo   {workers} proc: {elapsed:7.2f}s  {rows / elapsed:9.0f} filas/s  x{base / elapsed:.2f}"
+            )
+
+        if options['write']:
+            base = None
+            for workers in workers_list:
+                rows, elapsed = self._run(lambda: self._import(path, workers, batch_size))
+                base = base or elapsed
+                self.stdout.write(
+                    f"  import   {workers} proc: {elapsed:7.2f}s  {rows / elapsed:9.0f} filas/s  x{base / elapsed:.2f}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("listo"))
+
+    @staticmethod
+    def _run(func) -> tuple[int, float]:
+        start = time.perf_counter()
+        rows = func()
+        return rows, time.perf_counter() - start
+
+    @staticmethod
+    def _parse(path: str, workers: int, batch_size: int) -> int:
+        if workers == 1:
+            # camino serial de run(): sin pool ni pickling
+            rows = CatalogImportService.iter_file(path)
+            return _parse_numbered(enumerate(rows, start=2))[2]
+        chunks = CatalogImportService.iter_parsed_chunks(path, workers=workers, chunk_rows=batch_size)
+        return sum(count for _, _, count in chunks)
+
+    @staticmethod
+    def _import(path: str, workers: int, batch_size: int) -> int:
+        if workers == 1:
+            stats = CatalogImportService.run(CatalogImportService.iter_file(path), batch_size=batch_size, dry_run=True)
+        else:
+            stats = CatalogImportService.run_parallel(path, workers=workers, batch_size=batch_size, dry_run=True)
+        return stats["rows"]
+
+
+def _write_catalog(path: str, rows: int, seed: int) -> None:
+    """ Catálogo sintético con el formato de products_data.xlsx (~1% de filas inválidas). """
+    rng = random.Random(seed)
+    categories = [f"Categoria {i}" for i in range(20)]
+    brands = [f"Marca {i}" for i in range(500)]
+    words = "mate termo yerba bombilla set acero vidrio madera cuero negro blanco grande chico".split()
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CatalogImportService.COLUMNS)
+        for i in range(rows):
+            category = rng.choice(categories)
+            description = " ".join(rng.choices(words, k=rng.randint(5, 30)))
+            if rng.random() < 0.05:
+                description += '\n"Edición" limitada, 2 años de garantía'   # campo con comillas y salto de línea
+            writer.writerow((
+                f"SKU-{i:08d}",
+                f"{' '.join(rng.choices(words, k=3)).title()} {i}" if rng.random() > 0.01 else "",
+                f"{rng.uniform(100, 500_000):.2f}".replace('.', ','),
+                rng.choice(('si', 'no')),
+                rng.randint(0, 500),
+                category,
+                f"{category} - {rng.randint(0, 9)}",
+                rng.choice(brands),
+                rng.choice((0, 0, 0, 10, 15, 25)),
+                description,
+                f"https://cdn.example.com/img/{i}.jpg",
+                f"https://cdn.example.com/img/{i}-2.jpg" if rng.random() < 0.3 else "",
+            ))
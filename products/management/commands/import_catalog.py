@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services.catalog_import import CatalogImportService
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa un catálogo de proveedor (.xlsx o .csv) por lotes: lee el archivo en streaming, "
+        "resuelve categorías/subcategorías/marcas en memoria y crea productos e imágenes con bulk_create. "
+        "Los códigos (columna id -> sku) que ya existen se saltean, o se actualizan solo si cambiaron con --sync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Archivo .xlsx o .csv (primera fila = encabezado).")
+        parser.add_argument(
+            '--batch-size', type=int, default=CatalogImportService.BATCH_SIZE,
+            help="Productos por lote (cada lote es una transacción)."
+        )
+        parser.add_argument(
+            '--sync', action='store_true',
+            help="Sincronización incremental: actualiza solo los campos que cambiaron de los sku existentes."
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Muestra el resumen de cambios sin guardar nada.")
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Procesos que parsean el archivo en paralelo (solo .csv); la escritura sigue en un único proceso."
+        )
+        parser.add_argument('--show-errors', type=int, default=20, help="Cantidad de errores a listar al final.")
+
+    def handle(self, *args, **options):
+        try:
+            kwargs = {
+                "batch_size": options['batch_size'],
+                "on_progress": self._progress,
+                "sync": options['sync'],
+                "dry_run": options['dry_run'],
+            }
+            if options['workers'] > 1:
+                stats = CatalogImportService.run_parallel(options['path'], workers=options['workers'], **kwargs)
+            else:
+                stats = CatalogImportService.run(CatalogImportService.iter_file(options['path']), **kwargs)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for line, message in sorted(stats["error_details"])[:options['show_errors']]:
+            self.stdout.write(self.style.WARNING(f"  línea {line}: {message}"))
+
+        if stats["fields"]:
+            self.stdout.write("Cambios por campo:")
+            for field, count in stats["fields"].most_common():
+                self.stdout.write(f"  {field}: {count}")
+        if options['dry_run']:
+            for sku, field, old, new in stats["changes"]:
+                self.stdout.write(f"  {sku} {field}: {old} -> {new}")
+
+        rate = stats["rows"] / stats["elapsed"] if stats["elapsed"] else 0
+        prefix = "[dry-run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{stats['rows']} filas en {stats['elapsed']:.2f}s ({rate:.0f} filas/s): "
+            f"{stats['created']} productos creados, {stats['updated']} actualizados, "
+            f"{stats['unchanged']} sin cambios, {stats['existing']} ya existían, "
+            f"{stats['images']} imágenes, {stats['errors']} errores."
+        ))
+
+    def _progress(self, stats):
+        rate = stats["rows"] / stats["elapsed"] if stats["elapsed"] else 0
+        self.stdout.write(
+            f"{stats['rows']} filas, {stats['created']} creados, {stats['updated']} actualizados ({rate:.0f} filas/s)"
+        )
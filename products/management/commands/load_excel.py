@@ -1,9 +1,8 @@
 
 
 from django.core.management.base import BaseCommand
-from openpyxl import load_workbook
 
-from products import utils
+from products.services.catalog_import import CatalogImportService
 from products.models import Product, PCategory, PSubcategory, PBrand, ProductImage
 from users.models import CustomUser
 
@@ -13,14 +12,6 @@ from products.data.load_users import load_users_init
 from products.data.load_store import load_store_init
 
 # command python manage.py load_data_project
-from django.utils.text import slugify
-from django.utils.crypto import get_random_string
-
-def unique_slug(base_slug, model):
-    slug = base_slug
-    while model.objects.filter(slug=slug).exists():
-        slug = f"{base_slug}-{get_random_string(4)}"
-    return slug
 
 
 def clean_value(value, zero=False):
@@ -99,101 +90,13 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS("✔ Datos iniciales cargados correctamente."))
         # Path to the Excel file
-        try:
-            file = 'products/data/products_data.xlsx'
-            
-        except FileNotFoundError:
-            print(f'File not found: {file}')
-            return None
-        
-        # Lista de nombres de las columnas en orden
-        columns = [
-            'id', 'name', 'price', 'available', 'stock', 'category', 'subcategory', 'brand', 
-            'discount', 'description', 'image_url', 'image_url2'
-        ]
-
-        # Abrimos el archivo Excel
-        wb = load_workbook(file)
-        ws = wb.active
-
-        # Si querés ignorar el encabezado real del archivo y usar tu lista:
-        for fila in ws.iter_rows(min_row=2, values_only=True):  # Salta el encabezado
-            fila_dict = dict(zip(columns, fila))  # Empareja nombre-columna con valor
-            
-            # obtener un name necesario y unico para productos
-            name = clean_value(fila_dict.get("name"))
-            
-            if not name:
-                print(f'Product "{fila_dict.get("id")}" does not have a product_name.')
-                continue    # no lo va a cargar 
-            
-            # obtener los valores de cada uno a crear
-            category = clean_value(fila_dict.get("category"))
-            subcategory = clean_value(fila_dict.get("subcategory"))
-            brand = clean_value(fila_dict.get("brand"))
-        
-            # Create categories, subcategories, brands if they don't exist
-            if category is None:
-                category_obj = PCategory.get_default_model_or_id(model=True)
-            else:
-                category_obj, _ = PCategory.objects.get_or_create(name=category)    
-            
-            if subcategory is None or category is None:
-                sub_category_obj = PSubcategory.get_default_model_or_id(model=True)
-            else:
-                sub_category_obj, _ = PSubcategory.objects.get_or_create(name=subcategory, category=category_obj)    
-            
-            if brand is None:
-                brand_obj = PBrand.get_default_model_or_id(model=True)
-            else:
-                brand_obj, _ = PBrand.objects.get_or_create(name=brand)    
-
-            # Get the rest of the values from the Excel
-            price = clean_value(fila_dict.get("price"), zero=True)
-            stock = clean_value(fila_dict.get("stock"), zero=True)
-            discount = clean_value(fila_dict.get("discount"), zero=True)
-            
-            # Return true or false for availability
-            available_str = fila_dict.get("available", "").lower()
-            available = available_str in ["si", "sí", "yes"]
+        file = 'products/data/products_data.xlsx'
 
-            description = clean_value(fila_dict.get("description"))
-            image_url = clean_value(fila_dict.get("image_url"))
-            image_url2 = clean_value(fila_dict.get("image_url2"))
-            
-            # Normalize the name before creating the product
-            normalized_name = utils.normalize_or_None(name)
-            slug = unique_slug(slugify(name), Product)  # get the slugified version of the name
-            
-            # Retrieve or create the product
-            product_obj, created = Product.objects.get_or_create(
-                name=name,
-                slug=slug,
-                normalized_name=normalized_name,
-                price=price,
-                stock=stock,
-                discount=discount,
-                available=available,
-                category=category_obj,
-                subcategory=sub_category_obj,
-                brand=brand_obj,
-                description=description,
-            )
-            
-            # Add image URLs to the products
-            cont = 0
-            if image_url:
-                ProductImage.objects.create(product=product_obj, image_url=image_url)
-                cont += 1
-        
-            if image_url2:
-                ProductImage.objects.create(product=product_obj, image_url=image_url2)
-                cont += 1
-             
-            if created:
-                print(f'Product {product_obj.name} created successfully with {cont} associated images.')
-            else:
-                print(f'Product {product_obj.name} updated successfully with {cont} associated images.')
+        # Carga por lotes (lectura en streaming + bulk_create), ver import_catalog
+        stats = CatalogImportService.run(CatalogImportService.iter_file(file))
+        for line, message in stats["error_details"]:
+            print(f'Fila {line}: {message}')
+        print(f'{stats["created"]} productos creados con {stats["images"]} imágenes en {stats["elapsed"]:.2f}s.')
              
         # ================================================================
         # Create other necessary data for the initial project load
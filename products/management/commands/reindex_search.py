@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services.search_index import SearchIndexService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula normalized_name y search_vector de los productos desactualizados, "
+        "por rangos de id y con un UPDATE por rango (la normalización corre en SQL, "
+        "las filas no pasan por Python). Solo PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=SearchIndexService.BATCH_SIZE,
+            help="Ids por rango (cada rango es una transacción)."
+        )
+        parser.add_argument('--start-id', type=int, help="Retomar desde este id.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo cuenta las filas desactualizadas.")
+        parser.add_argument(
+            '--sleep', type=int, default=0,
+            help="Pausa en ms entre rangos (para no competir con el tráfico)."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            SearchIndexService.check_backend()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        first_id, last_id = SearchIndexService.id_bounds()
+        if first_id is None:
+            self.stdout.write("No hay productos.")
+            return
+
+        batch_size = options['batch_size']
+        start_id = max(first_id, options['start_id'] or first_id)
+        started = time.perf_counter()
+        total = 0
+        for start in range(start_id, last_id + 1, batch_size):
+            end = start + batch_size
+            total += SearchIndexService.reindex_range(start, end, dry_run=options['dry_run'])
+
+            elapsed = time.perf_counter() - started
+            done = min(end, last_id + 1) - start_id
+            self.stdout.write(
+                f"ids {start}-{end - 1}: {total} desactualizados "
+                f"({done / elapsed:.0f} ids/s, {done * 100 / (last_id + 1 - start_id):.0f}%)"
+            )
+            if options['sleep']:
+                time.sleep(options['sleep'] / 1000)
+
+        verb = "desactualizados (dry-run)" if options['dry_run'] else "actualizados"
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} productos {verb} en {time.perf_counter() - started:.1f}s"
+        ))
@@ -100,16 +100,9 @@ def updates_main_image_field():
         
 def updates_normalized_names():
     """
-    Usar bulk_update es una forma más eficiente de actualizar varios objetos sin llamar a save() 
-    en cada uno de ellos, especialmente cuando necesitas actualizar el mismo campo para muchos 
-    registros.
+    Reemplazado por `manage.py reindex_search`: recalcula normalized_name y search_vector
+    solo de las filas desactualizadas, en SQL y por rangos de id (antes se cargaban todos
+    los productos, se normalizaba en Python y se hacia bulk_update de todo).
     """
-    
-    products = Product.objects.all()
-        
-    for product in products:
-        product.normalized_name = filters.normalize_or_None(product.name)
-        print(f"name: {product.name} | normalized_name: {product.normalized_name}")
-        
-    # Usar bulk_update para actualizar todos los productos en una sola consulta
-    Product.objects.bulk_update(products, ['normalized_name'])
\ No newline at end of file
+    from django.core.management import call_command
+    call_command('reindex_search')
@@ -54,6 +54,19 @@ class Product(models.Model):
         null=True,
         help_text="SEO-friendly identifier generated from the product name."
     )
+    sku = models.CharField(
+        max_length=64,
+        unique=True,
+        blank=True,
+        null=True,
+        help_text="Supplier code, used as the key by the catalog importer."
+    )
+    import_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        null=True,
+        help_text="Hash of the supplier row of the last import (incremental sync)."
+    )
     normalized_name = models.CharField(
         max_length=120,
         blank=True,
@@ -15,6 +15,10 @@ class ProductImage(models.Model):
     
     image_url = models.URLField(
         null=True, blank=True, help_text="URL of the image.")
+
+    stored_image = models.ForeignKey(
+        "core.StoredImage", null=True, blank=True, on_delete=models.SET_NULL, related_name='product_images',
+        help_text="Shared content-addressed file behind `image_url` (None for legacy/external urls).")
     
     main_image = models.BooleanField(
         default=False, help_text="Indicates whether this is the product's main image.")
@@ -0,0 +1,38 @@
+from rest_framework import serializers
+
+from products.services.price_adjustment import PriceAdjustmentService
+
+
+class PriceAdjustmentSerializer(serializers.Serializer):
+    """
+    Payload del ajuste masivo de precios.
+
+    Ejemplo (+12.5% a una marca, redondeado a $10, precio y precio de lista):
+    {
+        "mode": "percent",
+        "value": "12.5",
+        "brand": 5,
+        "rounding": "10",
+        "fields": ["price", "price_list"],
+        "preview": true
+    }
+    """
+    mode = serializers.ChoiceField(choices=PriceAdjustmentService.MODES)
+    value = serializers.DecimalField(max_digits=12, decimal_places=2)
+    rounding = serializers.ChoiceField(choices=PriceAdjustmentService.ROUNDING_STEPS, default='0.01')
+    fields = serializers.MultipleChoiceField(choices=PriceAdjustmentService.FIELDS, default=('price',))
+
+    category = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    subcategory = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    brand = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+
+    preview = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not any(attrs.get(key) for key in ('category', 'subcategory', 'brand')):
+            raise serializers.ValidationError("Indique al menos una categoría, subcategoría o marca.")
+        if attrs['value'] == 0:
+            raise serializers.ValidationError({"value": "El ajuste no puede ser 0."})
+        # orden estable de los campos (MultipleChoiceField devuelve un set)
+        attrs['fields'] = tuple(f for f in PriceAdjustmentService.FIELDS if f in attrs['fields'])
+        return attrs
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from core.utils.image_variants import ready_variant_names, variant_urls
+
 class ProductListSerializer(serializers.Serializer):
     """
     Serializer for listing products in a compact format for API responses.
@@ -26,6 +28,8 @@ class ProductListSerializer(serializers.Serializer):
         Last update timestamp, optional.
     main_image : str | None
         URL of the main product image, optional.
+    main_image_variants : dict | None
+        thumb / card / detail URLs (webp + jpg) for `srcset`, only for images stored by us.
     is_favorited : bool
         Indicates whether the product is in the user's favorites.
     brand_id : int
@@ -39,6 +43,8 @@ class ProductListSerializer(serializers.Serializer):
     ------
     - The `to_representation` method ensures `price_list` is always included, even if null.
     - `is_favorited` is calculated using the `favorites_ids` passed in the serializer context.
+    - `main_image_variants` is only sent once the variants exist; with `many=True`
+      they are checked with a single query for the whole list.
     
     Example:
     --------
@@ -69,6 +75,7 @@ class ProductListSerializer(serializers.Serializer):
     discount = serializers.IntegerField()
     updated_at = serializers.DateTimeField(required=False, allow_null=True)
     main_image = serializers.CharField(required=False, allow_null=True)
+    main_image_variants = serializers.SerializerMethodField()
     
     # Boolean to indicate if the product is favorited by the current user
     is_favorited = serializers.SerializerMethodField()
@@ -78,6 +85,17 @@ class ProductListSerializer(serializers.Serializer):
     category_id = serializers.IntegerField()
     subcategory_id = serializers.IntegerField()
     
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        # una sola consulta de variantes listas (srcset) para toda la lista
+        products = args[0] if args else kwargs.get('instance')
+        if products is not None:
+            kwargs['context'] = {
+                **kwargs.get('context', {}),
+                'variant_names': ready_variant_names(p.get('main_image') for p in products),
+            }
+        return super().many_init(*args, **kwargs)
+
     def to_representation(self, instance):
         """
         Customize the representation to filter out null values,
@@ -87,6 +105,12 @@ class ProductListSerializer(serializers.Serializer):
         allowed_nulls = {'price_list'}
         return {k: v for k, v in rep.items() if v is not None or k in allowed_nulls}
 
+    def get_main_image_variants(self, obj):
+        """
+        Resized WebP/JPEG variants of the main image (None for external urls like ImgBB).
+        """
+        return variant_urls(obj.get('main_image'), self.context.get('variant_names'))
+
     def get_is_favorited(self, obj):
         """
         Determine if the product is in the user's favorites.
@@ -11,6 +11,7 @@ from products.models.subcategory import Subcategory
 from products.models.brand import Brand
 
 from core.utils import utils_basic
+from core.utils.image_variants import variant_urls
 
 class ProductSerializer(serializers.ModelSerializer):
     """
@@ -47,6 +48,7 @@ class ProductSerializer(serializers.ModelSerializer):
         # 2. Replace specific fields with human-readable names.
         # For example, instead of returning an ID for 'category', return its name.
         representation['main_image'] = instance.main_image if instance.main_image else None
+        representation['main_image_variants'] = variant_urls(instance.main_image)    # srcset (None si es externa o aun no generada)
         representation['category'] = instance.subcategory.category.name if instance.subcategory else None
         representation['subcategory'] = instance.subcategory.name if instance.subcategory else None
         representation['brand'] = instance.brand.name if instance.brand else None
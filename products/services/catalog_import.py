@@ -0,0 +1,722 @@
+# products/services/catalog_import.py
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import time
+
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+import django
+
+from django.contrib.postgres.search import SearchVector
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django.utils.text import slugify
+
+from products.models.brand import Brand
+from products.models.category import Category
+from products.models.product import Product
+from products.models.product_image import ProductImage
+from products.models.subcategory import Subcategory
+
+from core.utils.utils_basic import normalize_or_None
+
+
+class CatalogImportService:
+    """
+    Bulk importer of supplier catalog files (.xlsx or .csv).
+
+    - Rows are streamed (`load_workbook(read_only=True)` / `csv.reader`),
+      the file is never loaded whole.
+    - Category, subcategory and brand ids are resolved from in-memory maps
+      built once; the missing ones are created in bulk per batch.
+    - Products and their images are written with `bulk_create` in batches
+      (one transaction per batch), normalized_name and slug are computed in
+      Python and the search_vector with one UPDATE per batch.
+
+    Rows are identified by the supplier code (`id` column -> `Product.sku`).
+    SKUs that already exist are skipped, or updated in sync mode: each row is
+    hashed and only the rows whose hash differs from the one stored by the
+    last import are compared field by field and written with `bulk_update`
+    of the changed fields.
+    """
+
+    # orden de las columnas de products_data.xlsx (si el archivo no trae encabezado propio)
+    COLUMNS = (
+        'id', 'name', 'price', 'available', 'stock', 'category', 'subcategory', 'brand',
+        'discount', 'description', 'image_url', 'image_url2',
+    )
+    IMAGE_COLUMNS = ('image_url', 'image_url2')
+    YES_VALUES = {'si', 'sí', 'yes', 'true', '1', 'x'}
+
+    BATCH_SIZE = 2000
+    MAX_ERRORS_KEPT = 200   # errores detallados guardados en stats (el contador sigue)
+    MAX_CHANGES_KEPT = 50   # ejemplos de cambios para el resumen del dry-run
+    MENU_CACHE_KEY = 'categories_dropmenu'   # menu de categorias (CategoryService.CACHE_KEY)
+
+    # valores guardados contra los que se compara en modo sync
+    SYNC_VALUES = (
+        'id', 'sku', 'import_hash', 'name', 'slug', 'price', 'price_list', 'stock', 'discount',
+        'available', 'description', 'main_image', 'subcategory_id', 'brand_id',
+    )
+    # campos de la fila que entran en el hash (lo que manda el proveedor)
+    HASH_FIELDS = (
+        'sku', 'name', 'price', 'price_list', 'stock', 'discount', 'available', 'description',
+        'category', 'subcategory', 'brand', 'images',
+    )
+
+    @staticmethod
+    def iter_file(path: str) -> Iterator[dict]:
+        """
+        Yield one dict per data row of an .xlsx or .csv file.
+
+        The first row is the header; if it does not contain a `name` column the
+        default `COLUMNS` order is used (products_data.xlsx).
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.csv':
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                columns = CatalogImportService._columns(next(reader, []))
+                for values in reader:
+                    yield dict(zip(columns, values))
+            return
+
+        if ext not in ('.xlsx', '.xlsm'):
+            raise ValueError(f"Formato '{ext}' no soportado. Use .xlsx o .csv")
+
+        from openpyxl import load_workbook
+
+        # read_only: las filas se leen del xml a medida que se iteran
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            columns = CatalogImportService._columns(next(rows, ()))
+            for values in rows:
+                yield dict(zip(columns, values))
+        finally:
+            wb.close()
+
+    @staticmethod
+    def parse_row(raw: dict) -> dict[str, Any]:
+        """
+        Clean and validate one raw row. Pure function (no DB access).
+
+        Returns:
+            dict: sku, name, normalized_name, slug, price, price_list, stock,
+                discount, available, description, category, subcategory,
+                brand, images (list of urls) and hash (of the supplier values).
+
+        Raises:
+            ValueError: With a user-facing message if the row is invalid.
+        """
+        name = _text(raw.get('name'))
+        if not name:
+            raise ValueError("La fila no tiene nombre.")
+        if len(name) > 120:
+            raise ValueError("El nombre supera los 120 caracteres.")
+
+        taxonomy = {key: _text(raw.get(key)) for key in ('category', 'subcategory', 'brand')}
+        for key, value in taxonomy.items():
+            if value and len(value) > 32:
+                raise ValueError(f"{key} supera los 32 caracteres: {value!r}")
+
+        discount = _integer(raw.get('discount'), 'discount')
+        if discount > 100:
+            raise ValueError("discount debe estar entre 0 y 100.")
+
+        sku = _text(raw.get('id'))
+        if sku and len(sku) > 64:
+            raise ValueError("El código supera los 64 caracteres.")
+
+        available = raw.get('available')
+        if not isinstance(available, bool):
+            available = (_text(available) or '').lower() in CatalogImportService.YES_VALUES
+
+        row = {
+            "sku": sku,
+            "name": name,
+            "normalized_name": normalize_or_None(name),
+            "slug": slugify(name)[:120] or None,
+            "price": _decimal(raw.get('price'), 'price') or Decimal('0.00'),
+            "price_list": _decimal(raw.get('price_list'), 'price_list'),
+            "stock": _integer(raw.get('stock'), 'stock'),
+            "discount": discount,
+            "available": available,
+            "description": _text(raw.get('description')),
+            **taxonomy,
+            "images": [url for url in (_text(raw.get(col)) for col in CatalogImportService.IMAGE_COLUMNS) if url],
+        }
+        row["hash"] = hashlib.blake2b(
+            repr([row[field] for field in CatalogImportService.HASH_FIELDS]).encode(), digest_size=16
+        ).hexdigest()
+        return row
+
+    @staticmethod
+    def run(
+        rows: Iterable[dict],
+        *,
+        batch_size: int = BATCH_SIZE,
+        on_progress: Callable[[dict], None] | None = None,
+        sync: bool = False,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Parse and import raw rows in batches.
+
+        Args:
+            rows (Iterable[dict]): Raw rows, e.g. from `iter_file()`.
+            batch_size (int): Products per bulk insert / transaction.
+            on_progress (callable | None): Called with the stats after each batch.
+            sync (bool): Update the existing SKUs that changed.
+            dry_run (bool): Run everything inside one transaction that is rolled
+                back at the end: the stats are exact but nothing is saved.
+
+        Returns:
+            dict: {"rows", "created", "updated", "unchanged", "existing", "images",
+                "fields", "changes", "errors", "error_details", "elapsed"} where
+                fields counts the changes per field, changes is a sample of
+                (sku, field, old, new) and error_details a list of (line, message).
+        """
+        # linea 1 = encabezado
+        numbered = enumerate(rows, start=2)
+        chunks = (_parse_numbered(batch) for batch in iter(lambda: list(islice(numbered, batch_size)), []))
+        return CatalogImportService._write_chunks(
+            chunks, batch_size=batch_size, on_progress=on_progress, sync=sync, dry_run=dry_run
+        )
+
+    @staticmethod
+    def run_parallel(
+        path: str,
+        *,
+        workers: int,
+        batch_size: int = BATCH_SIZE,
+        on_progress: Callable[[dict], None] | None = None,
+        sync: bool = False,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Same as `run()` for a CSV file, with parsing and normalization spread
+        over a process pool. The pool parses row ranges of the file while this
+        process is the single writer: results are consumed in file order, so
+        taxonomy creation, duplicate detection and slugs behave exactly as in
+        the serial import.
+        """
+        chunks = CatalogImportService.iter_parsed_chunks(path, workers=workers, chunk_rows=batch_size)
+        return CatalogImportService._write_chunks(
+            chunks, batch_size=batch_size, on_progress=on_progress, sync=sync, dry_run=dry_run
+        )
+
+    @staticmethod
+    def iter_parsed_chunks(path: str, *, workers: int, chunk_rows: int = BATCH_SIZE) -> Iterator[tuple]:
+        """
+        Parse a CSV file with a process pool, yielding the chunks in file order.
+
+        The file is split into byte ranges of `chunk_rows` rows by a quick scan
+        (no CSV parsing); every worker reads and parses its own range. At most
+        `workers * 2` chunks are in flight, so memory stays bounded when the
+        writer is slower than the parsers.
+
+        Workers are spawned (not forked): they never share the DB connection
+        of this process and only run `parse_row()`.
+
+        Yields:
+            tuple: (parsed, errors, rows) as in the serial import.
+        """
+        if os.path.splitext(path)[1].lower() != '.csv':
+            raise ValueError("El modo paralelo solo admite .csv (un .xlsx no se puede partir sin leerlo entero).")
+
+        columns, ranges = CatalogImportService.split_csv(path, chunk_rows)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as pool:
+            pending = deque()
+            ranges = iter(ranges)
+            for start, end, first_line in islice(ranges, workers * 2):
+                pending.append(pool.submit(_parse_csv_range, path, start, end, first_line, columns))
+            while pending:
+                chunk = pending.popleft().result()
+                for start, end, first_line in islice(ranges, 1):
+                    pending.append(pool.submit(_parse_csv_range, path, start, end, first_line, columns))
+                yield chunk
+
+    @staticmethod
+    def split_csv(path: str, chunk_rows: int) -> tuple[tuple, list[tuple[int, int, int]]]:
+        """
+        Header columns and (start byte, end byte, first row number) of every
+        range of `chunk_rows` rows. Quoted fields with line breaks are kept
+        whole (a line with an odd number of quotes opens or closes a field).
+        """
+        ranges = []
+        with open(path, 'rb') as f:
+            header = f.readline()
+            columns = CatalogImportService._columns(next(csv.reader([header.decode('utf-8-sig')]), []))
+
+            start = offset = len(header)
+            first_line = line = 2
+            rows, inside_quotes = 0, False
+            for raw in f:
+                offset += len(raw)
+                if raw.count(b'"') % 2:
+                    inside_quotes = not inside_quotes
+                if inside_quotes:
+                    continue
+                rows += 1
+                line += 1
+                if rows == chunk_rows:
+                    ranges.append((start, offset, first_line))
+                    start, first_line, rows = offset, line, 0
+            if offset > start:
+                ranges.append((start, offset, first_line))
+        return columns, ranges
+
+    @staticmethod
+    def write_batch(
+        parsed: list[tuple[int, dict]], state: "CatalogImportState", stats: dict, *, sync: bool = False
+    ) -> None:
+        """
+        Write one batch of parsed rows (taxonomy, products, images and search
+        vectors) in one transaction.
+
+        Args:
+            parsed (list[tuple[int, dict]]): (line number, `parse_row()` result).
+            state (CatalogImportState): Taxonomy maps and keys already seen in the file.
+            stats (dict): Counters updated in place.
+            sync (bool): Update the existing SKUs that changed instead of skipping them.
+        """
+        rows = CatalogImportService._drop_duplicates(parsed, state, stats)
+
+        stored = {
+            p["sku"]: p
+            for p in Product.objects.filter(sku__in=[r["sku"] for _, r in rows if r["sku"]])
+            .values(*CatalogImportService.SYNC_VALUES)
+        }
+        new_rows = [(line, r) for line, r in rows if r["sku"] not in stored]
+        changed = []
+        for line, row in rows:
+            old = stored.get(row["sku"])
+            if old is None:
+                continue
+            if not sync:
+                stats["existing"] += 1
+            elif old["import_hash"] == row["hash"]:
+                # la fila del proveedor no cambio desde la ultima importacion: ni se compara
+                stats["unchanged"] += 1
+            else:
+                changed.append((line, row, old))
+
+        new_rows, changed = CatalogImportService._check_names(new_rows, changed, stats)
+        if not new_rows and not changed:
+            return
+
+        with transaction.atomic():
+            state.resolve_taxonomy([row for row in new_rows] + [row for _, row, _ in changed])
+            if new_rows:
+                CatalogImportService._create_products(new_rows, state, stats)
+            if changed:
+                CatalogImportService._update_products(changed, state, stats)
+
+    @staticmethod
+    def new_stats() -> dict[str, Any]:
+        return {
+            "rows": 0, "created": 0, "updated": 0, "unchanged": 0, "existing": 0, "images": 0,
+            "fields": Counter(), "changes": [], "errors": 0, "error_details": [], "elapsed": 0.0,
+        }
+
+    @staticmethod
+    def add_error(stats: dict, line: int, message: str) -> None:
+        stats["errors"] += 1
+        if len(stats["error_details"]) < CatalogImportService.MAX_ERRORS_KEPT:
+            stats["error_details"].append((line, message))
+
+    # -------------------- private methods
+    @staticmethod
+    def _write_chunks(
+        chunks: Iterable[tuple], *, batch_size: int, on_progress: Callable | None, sync: bool, dry_run: bool
+    ) -> dict[str, Any]:
+        stats = CatalogImportService.new_stats()
+        start = time.perf_counter()
+
+        # dry-run: todo en una transaccion que se descarta; si no, una transaccion por lote
+        with transaction.atomic() if dry_run else nullcontext():
+            state = CatalogImportState()
+            for parsed, errors, rows in chunks:
+                for line, message in errors:
+                    CatalogImportService.add_error(stats, line, message)
+                for i in range(0, len(parsed), batch_size):
+                    CatalogImportService.write_batch(parsed[i:i + batch_size], state, stats, sync=sync)
+
+                stats["rows"] += rows
+                stats["elapsed"] = time.perf_counter() - start
+                if on_progress:
+                    on_progress(stats)
+
+            if dry_run:
+                transaction.set_rollback(True)
+
+        # menu de categorias cacheado (navbar): las nuevas tienen que aparecer ya
+        if state.taxonomy_created and not dry_run:
+            cache.delete(CatalogImportService.MENU_CACHE_KEY)
+
+        stats["elapsed"] = time.perf_counter() - start
+        return stats
+
+    @staticmethod
+    def _create_products(rows: list[dict], state: "CatalogImportState", stats: dict) -> None:
+        CatalogImportService._assign_slugs(rows)
+
+        products = Product.objects.bulk_create([
+            Product(
+                sku=row["sku"],
+                import_hash=row["hash"],
+                name=row["name"],
+                normalized_name=row["normalized_name"],
+                slug=row["slug"],
+                price=row["price"],
+                price_list=row["price_list"],
+                stock=row["stock"],
+                discount=row["discount"],
+                available=row["available"],
+                description=row["description"],
+                main_image=row["images"][0] if row["images"] else None,
+                subcategory_id=state.subcategory_id(row["category"], row["subcategory"]),
+                brand_id=state.brand_id(row["brand"]),
+            )
+            for row in rows
+        ])
+
+        images = ProductImage.objects.bulk_create([
+            ProductImage(product_id=product.id, image_url=url, main_image=i == 0)
+            for product, row in zip(products, rows)
+            for i, url in enumerate(row["images"])
+        ])
+
+        # un solo UPDATE por lote, calculado por postgres
+        CatalogImportService._update_search_vectors([product.id for product in products])
+
+        stats["created"] += len(products)
+        stats["images"] += len(images)
+
+    @staticmethod
+    def _update_products(items: list[tuple[int, dict, dict]], state: "CatalogImportState", stats: dict) -> None:
+        """
+        Diff the rows against the stored values and `bulk_update` only the
+        fields that changed, grouped by set of fields (one UPDATE per group).
+
+        Empty optional columns (price_list, description) never clear the stored
+        value. Feed images missing on the product are added; images uploaded
+        by hand are kept.
+        """
+        now = timezone.now()
+        current_images = defaultdict(set)
+        for product_id, url in ProductImage.objects.filter(
+            product_id__in=[old["id"] for _, _, old in items]
+        ).values_list('product_id', 'image_url'):
+            current_images[product_id].add(url)
+
+        diffs, renamed, new_images = [], [], []
+        for _, row, old in items:
+            values = {
+                "name": row["name"],
+                "price": row["price"],
+                "stock": row["stock"],
+                "discount": row["discount"],
+                "available": row["available"],
+                "subcategory_id": state.subcategory_id(row["category"], row["subcategory"]),
+                "brand_id": state.brand_id(row["brand"]),
+            }
+            for field in ("price_list", "description"):
+                if row[field] is not None:
+                    values[field] = row[field]
+            diff = {field: value for field, value in values.items() if value != old[field]}
+
+            missing = [url for url in row["images"] if url not in current_images[old["id"]]]
+            if missing:
+                new_images += [
+                    ProductImage(product_id=old["id"], image_url=url, main_image=not old["main_image"] and i == 0)
+                    for i, url in enumerate(missing)
+                ]
+                if not old["main_image"]:
+                    diff["main_image"] = missing[0]
+                stats["fields"]["images"] += 1
+
+            for field, value in diff.items():
+                stats["fields"][field] += 1
+                if len(stats["changes"]) < CatalogImportService.MAX_CHANGES_KEPT:
+                    stats["changes"].append((row["sku"], field, old[field], value))
+
+            if diff or missing:
+                diff["updated_at"] = now
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1   # solo cambio el hash (ej: espacios), no se toca updated_at
+
+            if "name" in diff:
+                diff["normalized_name"] = row["normalized_name"]
+                if slugify(row["name"])[:120] != old["slug"]:
+                    renamed.append((row, diff))
+
+            diff["import_hash"] = row["hash"]
+            diffs.append((old["id"], diff))
+
+        # mismo criterio que ProductSerializer.update: el slug sigue al nombre
+        if renamed:
+            CatalogImportService._assign_slugs([row for row, _ in renamed])
+            for row, diff in renamed:
+                diff["slug"] = row["slug"]
+
+        groups = defaultdict(list)   # campos modificados -> productos (un UPDATE por grupo)
+        for product_id, diff in diffs:
+            groups[frozenset(diff)].append(Product(id=product_id, **diff))
+        for fields, products in groups.items():
+            Product.objects.bulk_update(products, list(fields))
+
+        ProductImage.objects.bulk_create(new_images)
+        stats["images"] += len(new_images)
+        CatalogImportService._update_search_vectors(
+            [product_id for product_id, diff in diffs if "name" in diff]
+        )
+
+    @staticmethod
+    def _update_search_vectors(ids: list[int]) -> None:
+        if ids:
+            Product.objects.filter(id__in=ids).update(search_vector=SearchVector('normalized_name', weight='A'))
+
+    @staticmethod
+    def _check_names(new_rows: list, changed: list, stats: dict) -> tuple[list, list]:
+        """
+        Product names are unique: drop the new or renamed rows whose name belongs
+        to another product (one query for the batch).
+        """
+        names = [r["name"] for _, r in new_rows] + [r["name"] for _, r, old in changed if r["name"] != old["name"]]
+        owners = dict(Product.objects.filter(name__in=names).values_list('name', 'sku')) if names else {}
+
+        def free(line, row):
+            if row["name"] in owners and (row["sku"] is None or owners[row["name"]] != row["sku"]):
+                CatalogImportService.add_error(stats, line, f"Ya existe un producto llamado {row['name']!r}.")
+                return False
+            return True
+
+        return (
+            [row for line, row in new_rows if free(line, row)],
+            [(line, row, old) for line, row, old in changed if free(line, row)],
+        )
+
+    @staticmethod
+    def _columns(header) -> tuple:
+        names = tuple((str(value).strip().lower() if value is not None else '') for value in header)
+        return names if 'name' in names else CatalogImportService.COLUMNS
+
+    @staticmethod
+    def _drop_duplicates(parsed: list[tuple[int, dict]], state: "CatalogImportState", stats: dict) -> list:
+        """ SKUs and names repeated in the file: the first occurrence wins. """
+        rows = []
+        for line, row in parsed:
+            if row["sku"] and row["sku"] in state.seen_skus:
+                CatalogImportService.add_error(stats, line, f"Código {row['sku']!r} repetido en el archivo.")
+            elif row["name"] in state.seen_names:
+                CatalogImportService.add_error(stats, line, f"Nombre {row['name']!r} repetido en el archivo.")
+            else:
+                if row["sku"]:
+                    state.seen_skus.add(row["sku"])
+                state.seen_names.add(row["name"])
+                rows.append((line, row))
+        return rows
+
+    @staticmethod
+    def _assign_slugs(rows: list[dict]) -> None:
+        """
+        Unique slugs for the whole batch with one query (instead of one `exists()`
+        per candidate): collisions get the sku or a random suffix.
+        """
+        candidates = {row["slug"] for row in rows if row["slug"]}
+        taken = set(Product.objects.filter(slug__in=candidates).values_list('slug', flat=True))
+
+        for row in rows:
+            base = row["slug"] or slugify(row["sku"] or '') or get_random_string(8).lower()
+            slug = base
+            if slug in taken and row["sku"]:
+                slug = f"{base[:100]}-{slugify(row['sku'])}"[:120]
+            while slug in taken:
+                slug = f"{base[:110]}-{get_random_string(6).lower()}"
+            taken.add(slug)
+            row["slug"] = slug
+
+
+class CatalogImportState:
+    """
+    Taxonomy maps (lowercase name -> id) loaded once per import, plus the keys
+    already seen in the file.
+    """
+
+    def __init__(self):
+        self.categories = {name.lower(): id for id, name in Category.objects.values_list('id', 'name')}
+        self.brands = {name.lower(): id for id, name in Brand.objects.values_list('id', 'name')}
+        self.subcategories = {
+            (category_id, name.lower()): id
+            for id, name, category_id in Subcategory.objects.values_list('id', 'name', 'category_id')
+        }
+        self.default_subcategory_id = (
+            Subcategory.objects.filter(is_default=True).order_by('id').values_list('id', flat=True).first()
+        )
+        self.default_brand_id = Brand.objects.filter(is_default=True).order_by('id').values_list('id', flat=True).first()
+
+        self.seen_skus = set()
+        self.seen_names = set()
+        self.taxonomy_created = False   # se creo alguna categoria o subcategoria
+
+    def subcategory_id(self, category: str | None, subcategory: str | None) -> int:
+        # sin categoria o sin subcategoria -> subcategoria por defecto (igual que load_excel)
+        if not category or not subcategory:
+            return self.default_subcategory_id
+        return self.subcategories[(self.categories[category.lower()], subcategory.lower())]
+
+    def brand_id(self, brand: str | None) -> int:
+        return self.brands[brand.lower()] if brand else self.default_brand_id
+
+    def resolve_taxonomy(self, rows: list[dict]) -> None:
+        """ Create (in bulk) the categories, subcategories and brands of the batch that do not exist yet. """
+        categories = [r["category"] for r in rows if r["category"] and r["subcategory"]]
+        if self._create_missing(Category, self.categories, categories, lambda name: Category(name=name)):
+            self.taxonomy_created = True
+
+        brands = [r["brand"] for r in rows if r["brand"]]
+        self._create_missing(Brand, self.brands, brands, lambda name: Brand(name=name))
+
+        missing = {}
+        for r in rows:
+            if r["category"] and r["subcategory"]:
+                key = (self.categories[r["category"].lower()], r["subcategory"].lower())
+                if key not in self.subcategories:
+                    missing.setdefault(key, r["subcategory"])
+        if missing:
+            self.taxonomy_created = True
+            self._bulk_create_with_slugs(
+                Subcategory, [Subcategory(name=name, category_id=key[0]) for key, name in missing.items()],
+                lambda obj: f"{obj.category_id}-{obj.name}",
+            )
+            self.subcategories.update({
+                (category_id, name.lower()): id
+                for id, name, category_id in Subcategory.objects.filter(
+                    category_id__in={key[0] for key in missing}
+                ).values_list('id', 'name', 'category_id')
+            })
+
+    # -------------------- private methods
+    def _create_missing(self, model, mapping: dict, names: list, build: Callable) -> bool:
+        """ Returns True if there were missing names (rows were inserted). """
+        # una sola forma por nombre (case-insensitive), gana la primera del archivo
+        missing = {}
+        for name in names:
+            missing.setdefault(name.lower(), name)
+        missing = {key: name for key, name in missing.items() if key not in mapping}
+        if not missing:
+            return False
+
+        self._bulk_create_with_slugs(model, [build(name) for name in missing.values()], lambda obj: obj.name)
+        mapping.update({
+            name.lower(): id
+            for id, name in model.objects.filter(name__in=missing.values()).values_list('id', 'name')
+        })
+        return True
+
+    @staticmethod
+    def _bulk_create_with_slugs(model, objs: list, slug_source: Callable) -> None:
+        """
+        One bulk_create for all the new rows. Slugs already used (or repeated in
+        the batch) are left null; name conflicts (another import created the same
+        name meanwhile) are ignored and picked up by the re-query.
+        """
+        for obj in objs:
+            obj.slug = slugify(slug_source(obj))[:32] or None
+        taken = set(model.objects.filter(slug__in=[o.slug for o in objs if o.slug]).values_list('slug', flat=True))
+        for obj in objs:
+            if obj.slug in taken:
+                obj.slug = None
+            elif obj.slug:
+                taken.add(obj.slug)
+        model.objects.bulk_create(objs, ignore_conflicts=True)
+
+
+# -------------------- parsing (también corre en los workers del modo paralelo)
+def _parse_numbered(numbered_rows) -> tuple[list, list, int]:
+    """ [(line, raw)] -> (parsed [(line, row)], errors [(line, message)], rows) """
+    parsed, errors, count = [], [], 0
+    for line, raw in numbered_rows:
+        count += 1
+        try:
+            parsed.append((line, CatalogImportService.parse_row(raw)))
+        except ValueError as e:
+            errors.append((line, str(e)))
+    return parsed, errors, count
+
+
+def _parse_csv_range(path: str, start: int, end: int, first_line: int, columns: tuple) -> tuple[list, list, int]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start).decode('utf-8')
+    rows = (dict(zip(columns, values)) for values in csv.reader(io.StringIO(data, newline='')))
+    return _parse_numbered(enumerate(rows, start=first_line))
+
+
+# -------------------- parsing helpers
+INT4_MAX = 2147483647   # stock / discount son PositiveIntegerField / IntegerField (int4)
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)   # codigos numericos de excel: 1234.0 -> '1234'
+    value = str(value).strip()
+    return value or None
+
+
+def _decimal(value, field: str) -> Decimal | None:
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = value.strip().replace('$', '').replace(' ', '')
+        if ',' in value:
+            value = value.replace('.', '').replace(',', '.')   # "30.000,50" -> "30000.50"
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field} no es un número válido: {value!r}")
+    if not number.is_finite():   # "nan", "inf" (o floats de excel)
+        raise ValueError(f"{field} no es un número válido: {value!r}")
+    number = number.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    if number < 0 or number >= Decimal('100000000'):
+        raise ValueError(f"{field} fuera de rango: {value!r}")
+    return number
+
+
+def _integer(value, field: str) -> int:
+    """
+    Non negative int4 (PositiveIntegerField). Empty -> 0. Decimals like "1.7"
+    (or "1.500" with a thousands separator) are rejected instead of truncated.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{field} no es un entero válido: {value!r}")
+    value = str(value).strip() if value is not None else ''
+    if not value:
+        return 0
+    try:
+        number = Decimal(value)
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field} no es un entero válido: {value!r}")
+    if not number.is_finite() or number != number.to_integral_value():
+        raise ValueError(f"{field} no es un entero válido: {value!r}")
+    if number < 0:
+        raise ValueError(f"{field} no puede ser negativo.")
+    if number > INT4_MAX:
+        raise ValueError(f"{field} fuera de rango: {value!r}")
+    return int(number)
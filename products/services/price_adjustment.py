@@ -0,0 +1,219 @@
+# products/services/price_adjustment.py
+from decimal import Decimal
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Q, QuerySet, Value, When
+from django.db.models.functions import Greatest, Round
+from django.utils import timezone
+
+from products.models.product import Product
+
+# app audit
+from audit.services.audit_service import AuditService
+
+
+class PriceAdjustmentService:
+    """
+    Percentage or fixed price adjustments for every product of a category,
+    subcategory and/or brand (e.g. inflation updates).
+
+    The new price is a database expression over `F('price')`:
+        percent: price * (1 + value / 100)
+        fixed:   price + value
+    rounded to a multiple of `rounding` (0.01, 1, 10 or 100), so the whole
+    adjustment is one `UPDATE`, and the preview annotates the very same
+    expression (what you preview is what gets written).
+
+    Empty prices (price_list NULL) are left empty. An adjustment that would
+    round a priced product below one rounding step (e.g. $3 with rounding 10
+    -> $0) is rejected, like one that overflows the column.
+    """
+
+    MODE_PERCENT = 'percent'
+    MODE_FIXED = 'fixed'
+    MODES = (MODE_PERCENT, MODE_FIXED)
+
+    ROUNDING_STEPS = ('0.01', '1', '10', '100')
+    FIELDS = ('price', 'price_list')
+
+    MAX_PRICE = Decimal('99999999.99')   # max_digits=10, decimal_places=2
+    MIN_PERCENT = Decimal('-90')
+    MAX_PERCENT = Decimal('500')
+    SAMPLE_SIZE = 20
+
+    @staticmethod
+    def preview(
+        *,
+        mode: str,
+        value: Decimal,
+        rounding: str = '0.01',
+        fields: tuple = ('price',),
+        category: int | None = None,
+        subcategory: int | None = None,
+        brand: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Affected products and a sample of the new prices, without writing.
+
+        Returns:
+            dict: {"affected", "sample": [{"id", "name", "<field>", "new_<field>"}], "over_max", "under_min"}
+                where over_max counts the products whose new price would not
+                fit in the column and under_min the ones that would drop below
+                one rounding step (the adjustment is rejected if either is > 0).
+        """
+        qs = PriceAdjustmentService._queryset(category=category, subcategory=subcategory, brand=brand)
+        new_values = PriceAdjustmentService._new_values(mode, value, rounding, fields)
+
+        annotated = qs.annotate(**{f"new_{field}": expr for field, expr in new_values.items()})
+        sample = list(
+            annotated
+            .order_by('id')
+            .values('id', 'name', *fields, *(f"new_{field}" for field in fields))[:PriceAdjustmentService.SAMPLE_SIZE]
+        )
+        for row in sample:
+            for field in fields:
+                if row[f"new_{field}"] is not None:
+                    row[f"new_{field}"] = Decimal(row[f"new_{field}"]).quantize(Decimal('0.01'))
+
+        return {
+            "affected": qs.count(),
+            "sample": sample,
+            "over_max": PriceAdjustmentService._over_max(annotated, fields),
+            "under_min": PriceAdjustmentService._under_min(annotated, fields, rounding),
+        }
+
+    @staticmethod
+    def apply(
+        *,
+        mode: str,
+        value: Decimal,
+        rounding: str = '0.01',
+        fields: tuple = ('price',),
+        category: int | None = None,
+        subcategory: int | None = None,
+        brand: int | None = None,
+        user=None,
+        ip: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Apply the adjustment with one UPDATE and log every changed product
+        with batched audit INSERTs, all in one transaction.
+
+        Returns:
+            dict: {"affected", "changed", "audit_rows"}
+
+        Raises:
+            ValueError: If any new price would overflow the column or drop below
+                one rounding step.
+        """
+        qs = PriceAdjustmentService._queryset(category=category, subcategory=subcategory, brand=brand)
+        new_values = PriceAdjustmentService._new_values(mode, value, rounding, fields)
+        values = ('id', *fields)
+
+        with transaction.atomic():
+            # bloquea las filas y guarda los valores previos para la auditoria
+            locked = qs.select_for_update(of=('self',)).values_list(*values)
+            old = {row[0]: row[1:] for row in locked.iterator(chunk_size=5000)}
+            if not old:
+                return {"affected": 0, "changed": 0, "audit_rows": 0}
+
+            # productos creados despues del SELECT quedan afuera (no estan auditados)
+            qs = qs.filter(id__lte=max(old))
+            annotated = qs.annotate(**{f"new_{field}": expr for field, expr in new_values.items()})
+            if over_max := PriceAdjustmentService._over_max(annotated, fields):
+                raise ValueError(
+                    f"{over_max} productos superarían el precio máximo ({PriceAdjustmentService.MAX_PRICE})."
+                )
+            if under_min := PriceAdjustmentService._under_min(annotated, fields, rounding):
+                raise ValueError(
+                    f"{under_min} productos quedarían por debajo de {rounding} con este redondeo; "
+                    "use un redondeo menor o excluya esos productos."
+                )
+
+            affected = qs.update(**new_values, updated_at=timezone.now())
+
+            changes = []
+            for product_id, *new in qs.values_list(*values).iterator(chunk_size=5000):
+                before = old.get(product_id)
+                if before is None:
+                    continue
+                changed = [i for i, field in enumerate(fields) if before[i] != new[i]]
+                if changed:
+                    changes.append((
+                        product_id,
+                        {fields[i]: before[i] for i in changed},
+                        {fields[i]: new[i] for i in changed},
+                    ))
+
+            audit_rows = AuditService.log_product_bulk_update(user=user, changes=changes, ip=ip)
+
+        return {"affected": affected, "changed": len(changes), "audit_rows": audit_rows}
+
+    # -------------------- private methods
+    @staticmethod
+    def _queryset(*, category: int | None, subcategory: int | None, brand: int | None) -> QuerySet:
+        if not (category or subcategory or brand):
+            raise ValueError("Indique al menos una categoría, subcategoría o marca.")
+
+        qs = Product.objects.all()
+        if category:
+            qs = qs.filter(subcategory__category_id=category)
+        if subcategory:
+            qs = qs.filter(subcategory_id=subcategory)
+        if brand:
+            qs = qs.filter(brand_id=brand)
+        return qs
+
+    @staticmethod
+    def _new_values(mode: str, value: Decimal, rounding: str, fields: tuple) -> dict:
+        """ {field: expression} for the UPDATE / annotate. """
+        if mode not in PriceAdjustmentService.MODES:
+            raise ValueError(f"Modo '{mode}' no soportado. Use percent o fixed.")
+        if rounding not in PriceAdjustmentService.ROUNDING_STEPS:
+            raise ValueError(f"Redondeo '{rounding}' no soportado. Use 0.01, 1, 10 o 100.")
+        if not fields or set(fields) - set(PriceAdjustmentService.FIELDS):
+            raise ValueError("Los campos a ajustar deben ser price y/o price_list.")
+
+        value = Decimal(value)
+        if mode == PriceAdjustmentService.MODE_PERCENT and not (
+            PriceAdjustmentService.MIN_PERCENT <= value <= PriceAdjustmentService.MAX_PERCENT
+        ):
+            raise ValueError(
+                f"El porcentaje debe estar entre {PriceAdjustmentService.MIN_PERCENT} "
+                f"y {PriceAdjustmentService.MAX_PERCENT}."
+            )
+        if mode == PriceAdjustmentService.MODE_FIXED and abs(value) > PriceAdjustmentService.MAX_PRICE:
+            raise ValueError("El monto fijo está fuera de rango.")
+
+        step = Value(Decimal(rounding))
+        output = DecimalField(max_digits=20, decimal_places=4)
+        new_values = {}
+        for field in fields:
+            if mode == PriceAdjustmentService.MODE_PERCENT:
+                expr = F(field) * Value(1 + value / 100)
+            else:
+                expr = F(field) + Value(value)
+            # round(x / step) * step: redondeo al multiplo (mitad hacia arriba en postgres)
+            expr = Round(ExpressionWrapper(expr / step, output_field=output)) * step
+            expr = Greatest(ExpressionWrapper(expr, output_field=output), Value(Decimal('0')))
+            # GREATEST ignora los NULL: sin el Case un price_list vacio quedaba en 0
+            new_values[field] = Case(
+                When(**{f"{field}__isnull": True}, then=F(field)), default=expr, output_field=output
+            )
+        return new_values
+
+    @staticmethod
+    def _over_max(annotated: QuerySet, fields: tuple) -> int:
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f"new_{field}__gt": PriceAdjustmentService.MAX_PRICE})
+        return annotated.filter(condition).count()
+
+    @staticmethod
+    def _under_min(annotated: QuerySet, fields: tuple, rounding: str) -> int:
+        """ Priced products that the rounding would leave below one step (e.g. $0). """
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f"new_{field}__lt": Decimal(rounding), f"{field}__gt": 0})
+        return annotated.filter(condition).count()
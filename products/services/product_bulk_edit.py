@@ -0,0 +1,357 @@
+# products/services/product_bulk_edit.py
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from products.models.product import Product
+from products.models.subcategory import Subcategory
+from products.models.brand import Brand
+
+from core.utils import utils_basic
+
+# app audit
+from audit.services.audit_service import AuditService
+
+
+class ProductBulkEditService:
+    """
+    Edits of many products at once (dashboard grid), e.g.:
+        [{"id": 10, "price": "1500", "stock": 3}, {"id": 11, "available": false}]
+
+    - Products are loaded with one `in_bulk`, subcategories and brands with
+      one query each and name collisions are checked with one query.
+    - Every row goes through a light validator with the same rules as
+      ProductSerializer (no serializer instance, no images in context).
+    - Sellers keep their restrictions: price, price_list and discount are
+      ignored for them, as in ProductSerializer.update.
+    - Numbers are checked against their columns (price < 1e8, stock int4).
+      The grid sends JSON, so in a string "." is the decimal point ("1500.50");
+      it is only a thousands separator next to a decimal comma ("1.500,50"),
+      as in the catalog import (`parse_number` alone reads "1500.50" as 150050).
+    - All or nothing: if any row is invalid nothing is saved. Otherwise the
+      products are written with `bulk_update` of only the changed fields
+      (one UPDATE per group of products that changed the same fields) and
+      audited with one batched INSERT.
+    """
+
+    FIELDS = (
+        'name', 'price', 'price_list', 'stock', 'discount', 'available', 'description',
+        'subcategory', 'brand',
+    )
+    SELLER_RESTRICTED_FIELDS = ('price', 'price_list', 'discount')
+    # campos que se leen de la db (los editables + lo necesario para slug)
+    LOAD_FIELDS = (
+        'id', 'name', 'slug', 'normalized_name', 'price', 'price_list', 'stock', 'discount',
+        'available', 'description', 'subcategory_id', 'brand_id',
+    )
+    MAX_ITEMS = 1000
+    MAX_ERRORS = 100
+    BATCH_SIZE = 1000
+    MAX_PRICE = Decimal('100000000')   # max_digits=10, decimal_places=2
+    MAX_STOCK = 2147483647             # PositiveIntegerField (int4)
+
+    @staticmethod
+    def edit(items: list, *, user, ip: str | None = None) -> dict[str, Any]:
+        """
+        Validate and save the edits.
+
+        Args:
+            items (list[dict]): One dict per product with "id" and the fields to change.
+            user (CustomUser): User that makes the change (role decides the editable fields).
+            ip (str | None): Client ip for the audit trail.
+
+        Returns:
+            dict: {"success", "updated", "unchanged", "ignored", "errors"} where
+                ignored lists the fields dropped by role ({"id", "fields"}) and
+                errors the invalid rows ({"id", "field", "detail"}); if there
+                are errors nothing was saved.
+        """
+        errors = []
+        items = ProductBulkEditService._check_items(items, errors)
+        if errors:
+            return ProductBulkEditService._result(errors=errors)
+
+        products = (
+            Product.objects
+            .only(*ProductBulkEditService.LOAD_FIELDS)
+            .in_bulk([item["id"] for item in items])
+        )
+        lookups = ProductBulkEditService._load_lookups(items)
+
+        is_seller = getattr(user, 'role', None) == 'seller'
+        diffs, ignored = [], []
+        for item in items:
+            product = products.get(item["id"])
+            if product is None:
+                errors.append({"id": item["id"], "field": "id", "detail": "No existe el producto."})
+                continue
+
+            if is_seller:
+                dropped = [field for field in ProductBulkEditService.SELLER_RESTRICTED_FIELDS if field in item]
+                if dropped:
+                    ignored.append({"id": product.id, "fields": dropped})
+                    item = {k: v for k, v in item.items() if k not in dropped}
+
+            diff = ProductBulkEditService._clean_item(item, product, lookups, errors)
+            if diff:
+                diffs.append((product, diff))
+
+        ProductBulkEditService._check_names(diffs, errors)
+        if errors:
+            return ProductBulkEditService._result(errors=errors, ignored=ignored)
+
+        with transaction.atomic():
+            ProductBulkEditService._save(diffs)
+            AuditService.log_product_bulk_update(
+                user=user,
+                changes=[
+                    (product.id, {field: old for field, (old, new) in diff.items()},
+                     {field: new for field, (old, new) in diff.items()})
+                    for product, diff in diffs
+                ],
+                ip=ip,
+            )
+
+        return ProductBulkEditService._result(
+            updated=len(diffs), unchanged=len(items) - len(diffs), ignored=ignored
+        )
+
+    # -------------------- private methods
+    @staticmethod
+    def _check_items(items, errors: list) -> list[dict]:
+        """ Payload shape: list of dicts with a valid, non repeated "id". """
+        if not isinstance(items, list) or not items:
+            errors.append({"id": None, "field": "products", "detail": "Se esperaba una lista de productos."})
+            return []
+        if len(items) > ProductBulkEditService.MAX_ITEMS:
+            errors.append({
+                "id": None, "field": "products",
+                "detail": f"Máximo {ProductBulkEditService.MAX_ITEMS} productos por envío.",
+            })
+            return []
+
+        cleaned, seen = [], set()
+        for item in items:
+            product_id = utils_basic.valid_id_or_None(item.get("id")) if isinstance(item, dict) else None
+            if product_id is None:
+                errors.append({"id": None, "field": "id", "detail": "Cada fila necesita un 'id' válido."})
+            elif product_id in seen:
+                errors.append({"id": product_id, "field": "id", "detail": "Producto repetido en el envío."})
+            else:
+                seen.add(product_id)
+                unknown = set(item) - {"id", "category", *ProductBulkEditService.FIELDS}
+                if unknown:
+                    errors.append({
+                        "id": product_id, "field": sorted(unknown)[0],
+                        "detail": f"Campos no editables: {', '.join(sorted(unknown))}.",
+                    })
+                cleaned.append({**item, "id": product_id})
+        return cleaned
+
+    @staticmethod
+    def _load_lookups(items: list[dict]) -> dict[str, Any]:
+        """ {"subcategory": {id: category_id}, "brand": {ids}} of the referenced ids (one query each). """
+        ids = defaultdict(set)
+        for item in items:
+            for key in ('subcategory', 'brand'):
+                value = utils_basic.valid_id_or_None(item.get(key))
+                if value:
+                    ids[key].add(value)
+
+        return {
+            "subcategory": dict(
+                Subcategory.objects.filter(id__in=ids["subcategory"]).values_list('id', 'category_id')
+            ) if ids["subcategory"] else {},
+            "brand": set(
+                Brand.objects.filter(id__in=ids["brand"]).values_list('id', flat=True)
+            ) if ids["brand"] else set(),
+        }
+
+    @staticmethod
+    def _clean_item(item: dict, product: Product, lookups: dict, errors: list) -> dict[str, tuple]:
+        """
+        Validate one row against its product.
+
+        Returns:
+            dict: {field: (old, new)} of the fields that really change
+                (FK fields as `<field>_id`).
+        """
+        new = {}
+        try:
+            for field in ProductBulkEditService.FIELDS:
+                if field not in item:
+                    continue
+                value = item[field]
+                if field == 'name':
+                    value = (value or '').strip() if isinstance(value, str) else ''
+                    if len(value) <= 2 or len(value) > 120:
+                        raise _FieldError(field, "El nombre debe tener entre 3 y 120 caracteres.")
+                    new['name'] = value
+                elif field == 'price':
+                    new['price'] = _price(value, field, "Precio", allow_zero=False)
+                elif field == 'price_list':
+                    new['price_list'] = (
+                        None if value in (None, '')
+                        else _price(value, field, "Precio de lista", allow_zero=True)
+                    )
+                elif field == 'stock':
+                    new['stock'] = _integer(value, field, "Stock")
+                    if new['stock'] > ProductBulkEditService.MAX_STOCK:
+                        raise _FieldError(field, "El Stock supera el máximo permitido.")
+                elif field == 'discount':
+                    new['discount'] = _integer(value, field, "Descuento")
+                    if new['discount'] > 100:
+                        raise _FieldError(field, "El Descuento debe estar entre 0 y 100.")
+                elif field == 'available':
+                    new['available'] = utils_basic.get_valid_bool(value, field='available')
+                elif field == 'description':
+                    new['description'] = utils_basic.sanitize_text(value)
+                elif field == 'subcategory':
+                    subcategory_id = utils_basic.valid_id_or_None(value)
+                    category_id = lookups["subcategory"].get(subcategory_id)
+                    if category_id is None:
+                        raise _FieldError(field, "No existe la subcategoría.")
+                    expected = utils_basic.valid_id_or_None(item.get('category'))
+                    if expected and expected != category_id:
+                        raise _FieldError(field, "La subcategoría no pertenece a la categoría indicada.")
+                    new['subcategory_id'] = subcategory_id
+                elif field == 'brand':
+                    brand_id = utils_basic.valid_id_or_None(value)
+                    if brand_id not in lookups["brand"]:
+                        raise _FieldError(field, "No existe la marca.")
+                    new['brand_id'] = brand_id
+        except _FieldError as e:
+            errors.append({"id": product.id, "field": e.field, "detail": e.detail})
+            return {}
+        except serializers.ValidationError as e:
+            errors.append({"id": product.id, "field": field, "detail": str(e.detail[0])})
+            return {}
+
+        return {
+            field: (getattr(product, field), value)
+            for field, value in new.items()
+            if getattr(product, field) != value
+        }
+
+    @staticmethod
+    def _check_names(diffs: list, errors: list) -> None:
+        """ Unique names: against the other rows of the payload and against the db (one query). """
+        renamed = {diff['name'][1]: product.id for product, diff in diffs if 'name' in diff}
+        if len(renamed) < sum('name' in diff for _, diff in diffs):
+            errors.append({"id": None, "field": "name", "detail": "Hay nombres repetidos en el envío."})
+            return
+        if not renamed:
+            return
+
+        taken = (
+            Product.objects
+            .filter(name__in=list(renamed))
+            .exclude(id__in=list(renamed.values()))
+            .values_list('name', flat=True)
+        )
+        for name in taken:
+            # el nombre puede quedar libre si otra fila del envio renombra a ese producto,
+            # pero un UPDATE por grupo no garantiza el orden: se rechaza igual
+            errors.append({
+                "id": renamed[name], "field": "name", "detail": f"Ya existe un producto llamado {name!r}.",
+            })
+
+    @staticmethod
+    def _save(diffs: list) -> None:
+        now = timezone.now()
+        renamed = [(product, diff) for product, diff in diffs if 'name' in diff]
+        if renamed:
+            ProductBulkEditService._assign_slugs(renamed)
+
+        groups = defaultdict(list)   # campos modificados -> productos (un UPDATE por grupo)
+        for product, diff in diffs:
+            for field, (old, new) in diff.items():
+                setattr(product, field, new)
+            fields = set(diff)
+            if 'name' in diff:
+                # slug y normalized_name acompañan al nombre (search_vector lo mantiene el trigger)
+                product.normalized_name = utils_basic.normalize_or_None(product.name)
+                fields |= {'slug', 'normalized_name'}
+            product.updated_at = now
+            groups[frozenset(fields)].append(product)
+
+        for fields, products in groups.items():
+            Product.objects.bulk_update(
+                products, [*fields, 'updated_at'], batch_size=ProductBulkEditService.BATCH_SIZE
+            )
+
+    @staticmethod
+    def _assign_slugs(renamed: list) -> None:
+        """ slugify(name); if taken by another product, suffix with the id (one query). """
+        slugs = {product.id: slugify(diff['name'][1])[:120] or None for product, diff in renamed}
+        taken = set(
+            Product.objects
+            .filter(slug__in=[slug for slug in slugs.values() if slug])
+            .exclude(id__in=list(slugs))
+            .values_list('slug', flat=True)
+        )
+        used = set()
+        for product, diff in renamed:
+            slug = slugs[product.id]
+            if slug and (slug in taken or slug in used):
+                slug = f"{slug[:120 - len(str(product.id)) - 1]}-{product.id}"
+            used.add(slug)
+            product.slug = slug
+
+    @staticmethod
+    def _result(
+        *, errors: list | None = None, ignored: list | None = None, updated: int = 0, unchanged: int = 0
+    ) -> dict[str, Any]:
+        errors = errors or []
+        return {
+            "success": not errors,
+            "updated": updated,
+            "unchanged": unchanged,
+            "ignored": ignored or [],
+            "errors": errors[:ProductBulkEditService.MAX_ERRORS],
+        }
+
+
+def _plain_number(value, field: str, label: str):
+    """
+    JSON-style numbers to Decimal before `parse_number`, which would drop the
+    "." of "1500.50". Texts with a decimal comma ("1.500,50") and invalid ones
+    are passed through, `parse_number` handles them.
+    """
+    if isinstance(value, bool):
+        raise _FieldError(field, f"El {label} debe ser un número válido.")
+    if isinstance(value, float) or (isinstance(value, str) and ',' not in value):
+        try:
+            value = Decimal(str(value).strip())
+        except InvalidOperation:
+            return value
+        if not value.is_finite():
+            raise _FieldError(field, f"El {label} debe ser un número válido.")
+    return value
+
+
+def _price(value, field: str, label: str, *, allow_zero: bool) -> Decimal:
+    price = utils_basic.parse_number(_plain_number(value, field, label), label, allow_zero=allow_zero)
+    if price >= ProductBulkEditService.MAX_PRICE:
+        raise _FieldError(field, f"El {label} supera el máximo permitido.")
+    return price
+
+
+def _integer(value, field: str, label: str) -> int:
+    value = _plain_number(value, field, label)
+    # parse_number haria int(): "1.7" no se trunca a 1
+    if isinstance(value, Decimal) and value != value.to_integral_value():
+        raise _FieldError(field, f"El {label} debe ser un número entero válido.")
+    return utils_basic.parse_number(value, label, allow_zero=True)
+
+
+class _FieldError(Exception):
+    def __init__(self, field: str, detail: str):
+        super().__init__(detail)
+        self.field = field
+        self.detail = detail
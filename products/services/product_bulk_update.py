@@ -0,0 +1,265 @@
+# products/services/product_bulk_update.py
+import csv
+import io
+import json
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import islice
+from typing import Any
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from products.models.product import Product
+
+# app audit
+from audit.services.audit_service import AuditService
+
+
+class ProductBulkUpdateService:
+    """
+    Price and stock updates for many products at once.
+
+    Input: CSV (with header) or JSON lines, one product per row:
+        {"id" | "sku", "price", "price_list", "stock", "discount"}
+    Omitted / empty fields are not modified.
+
+    The whole payload is validated first (ids and skus resolved with one
+    query each); if any row is invalid nothing is applied. Then every batch
+    is applied with a single `UPDATE ... FROM (VALUES ...)` that only touches
+    the rows whose values actually change, and returns old and new values
+    for the audit trail, written with one batched INSERT.
+    """
+
+    FIELDS = ('price', 'price_list', 'stock', 'discount')
+    BATCH_SIZE = 5000
+    MAX_ROWS = 100_000
+    MAX_ERRORS = 100
+    MAX_PRICE = Decimal('100000000')   # max_digits=10, decimal_places=2
+
+    @staticmethod
+    def parse(content: str, fmt: str | None = None) -> list[dict]:
+        """
+        Read the rows of a CSV or JSON lines payload.
+
+        Args:
+            content (str): Payload.
+            fmt (str | None): 'csv' or 'jsonl'; sniffed from the first character if None.
+
+        Returns:
+            list[dict]: Raw rows, with the line number in "_line".
+
+        Raises:
+            ValueError: If the payload cannot be read.
+        """
+        content = content.lstrip('\ufeff')   # BOM de Excel
+        if fmt is None:
+            fmt = 'jsonl' if content.lstrip().startswith('{') else 'csv'
+
+        rows = []
+        if fmt == 'jsonl':
+            for line, text in enumerate(content.splitlines(), start=1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                except json.JSONDecodeError:
+                    raise ValueError(f"Línea {line}: JSON inválido.")
+                if not isinstance(row, dict):
+                    raise ValueError(f"Línea {line}: se esperaba un objeto JSON.")
+                rows.append({**row, "_line": line})
+        elif fmt == 'csv':
+            reader = csv.DictReader(io.StringIO(content))
+            if not reader.fieldnames or not {'id', 'sku'} & {f.strip().lower() for f in reader.fieldnames}:
+                raise ValueError("El CSV necesita encabezado con columna 'id' o 'sku'.")
+            for line, row in enumerate(reader, start=2):
+                rows.append({**{k.strip().lower(): v for k, v in row.items() if k}, "_line": line})
+        else:
+            raise ValueError(f"Formato '{fmt}' no soportado. Use csv o jsonl.")
+
+        if len(rows) > ProductBulkUpdateService.MAX_ROWS:
+            raise ValueError(f"Máximo {ProductBulkUpdateService.MAX_ROWS} filas por envío.")
+        return rows
+
+    @staticmethod
+    def validate(rows: list[dict]) -> tuple[list[tuple], list[dict]]:
+        """
+        Validate and resolve all the rows.
+
+        Returns:
+            tuple: (updates, errors) where updates is a list of
+                (product_id, price, price_list, stock, discount) with None for
+                the fields that must not change, and errors a list of
+                {"line", "detail"} (at most MAX_ERRORS).
+        """
+        errors = []
+        cleaned = []
+        for row in rows:
+            try:
+                cleaned.append(ProductBulkUpdateService._clean_row(row))
+            except ValueError as e:
+                errors.append({"line": row["_line"], "detail": str(e)})
+
+        # ids y skus de todo el envio, una consulta cada uno
+        skus = {r["sku"] for r in cleaned if r["sku"] is not None}
+        ids = {r["id"] for r in cleaned if r["id"] is not None}
+        by_sku = dict(Product.objects.filter(sku__in=skus).values_list('sku', 'id')) if skus else {}
+        known_ids = set(Product.objects.filter(id__in=ids).values_list('id', flat=True)) if ids else set()
+
+        updates, seen = [], set()
+        for r in cleaned:
+            product_id = r["id"] if r["id"] is not None else by_sku.get(r["sku"])
+            if product_id is None or (r["id"] is not None and product_id not in known_ids):
+                errors.append({"line": r["line"], "detail": f"No existe el producto {r['id'] or r['sku']!r}."})
+            elif product_id in seen:
+                errors.append({"line": r["line"], "detail": f"Producto {product_id} repetido en el envío."})
+            else:
+                seen.add(product_id)
+                updates.append((product_id, *(r[field] for field in ProductBulkUpdateService.FIELDS)))
+
+        errors.sort(key=lambda e: e["line"])
+        return updates, errors[:ProductBulkUpdateService.MAX_ERRORS]
+
+    @staticmethod
+    def apply(updates: list[tuple], *, user=None, ip: str | None = None) -> dict[str, Any]:
+        """
+        Apply validated updates in batches, all in one transaction, and write
+        the audit trail.
+
+        Returns:
+            dict: {"received", "updated", "unchanged", "audit_rows"}
+        """
+        changes = []
+        with transaction.atomic():
+            it = iter(updates)
+            while batch := list(islice(it, ProductBulkUpdateService.BATCH_SIZE)):
+                changes += ProductBulkUpdateService._update_batch(batch)
+            audit_rows = AuditService.log_product_bulk_update(user=user, changes=changes, ip=ip)
+
+        return {
+            "received": len(updates),
+            "updated": len(changes),
+            "unchanged": len(updates) - len(changes),
+            "audit_rows": audit_rows,
+        }
+
+    # -------------------- private methods
+    @staticmethod
+    def _update_batch(batch: list[tuple]) -> list[tuple[int, dict, dict]]:
+        """
+        One statement for the whole batch. The `old` CTE locks the rows and, as
+        every part of the statement sees the same snapshot, returns the values
+        before the UPDATE, so old and new values come back together.
+
+        Returns:
+            list[tuple[int, dict, dict]]: (product_id, old_data, new_data) of the
+                products that changed, with only the changed fields.
+        """
+        table = Product._meta.db_table
+        values_sql = ", ".join(["(%s::bigint, %s::numeric, %s::numeric, %s::integer, %s::integer)"] * len(batch))
+        params = [value for row in batch for value in row]
+
+        sql = f"""
+            WITH v (id, price, price_list, stock, discount) AS (VALUES {values_sql}),
+            old AS (
+                SELECT p.id, p.price, p.price_list, p.stock, p.discount
+                FROM {table} p JOIN v ON v.id = p.id
+                FOR UPDATE OF p
+            )
+            UPDATE {table} p SET
+                price = COALESCE(v.price, p.price),
+                price_list = COALESCE(v.price_list, p.price_list),
+                stock = COALESCE(v.stock, p.stock),
+                discount = COALESCE(v.discount, p.discount),
+                updated_at = %s
+            FROM v JOIN old ON old.id = v.id
+            WHERE p.id = v.id AND (
+                (v.price IS NOT NULL AND v.price <> p.price)
+                OR (v.price_list IS NOT NULL AND v.price_list IS DISTINCT FROM p.price_list)
+                OR (v.stock IS NOT NULL AND v.stock IS DISTINCT FROM p.stock)
+                OR (v.discount IS NOT NULL AND v.discount <> p.discount)
+            )
+            RETURNING p.id, old.price, old.price_list, old.stock, old.discount,
+                      p.price, p.price_list, p.stock, p.discount
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [timezone.now()])
+            returned = cursor.fetchall()
+
+        fields = ProductBulkUpdateService.FIELDS
+        changes = []
+        for product_id, *values in returned:
+            old, new = values[:4], values[4:]
+            changed = [i for i in range(4) if old[i] != new[i]]
+            changes.append((
+                product_id,
+                {fields[i]: old[i] for i in changed},
+                {fields[i]: new[i] for i in changed},
+            ))
+        return changes
+
+    @staticmethod
+    def _clean_row(row: dict) -> dict:
+        line = row["_line"]
+        product_id = _value(row.get('id'))
+        sku = _value(row.get('sku'))
+        if product_id is None and sku is None:
+            raise ValueError("Falta 'id' o 'sku'.")
+        if product_id is not None:
+            try:
+                product_id = int(product_id)
+            except (TypeError, ValueError):
+                raise ValueError(f"id inválido: {product_id!r}")
+            if product_id <= 0:
+                raise ValueError(f"id inválido: {product_id!r}")
+
+        cleaned = {
+            "line": line,
+            "id": product_id,
+            "sku": str(sku) if sku is not None else None,
+            "price": _price(row.get('price'), 'price'),
+            "price_list": _price(row.get('price_list'), 'price_list'),
+            "stock": _integer(row.get('stock'), 'stock'),
+            "discount": _integer(row.get('discount'), 'discount'),
+        }
+        if cleaned["discount"] is not None and cleaned["discount"] > 100:
+            raise ValueError("discount debe estar entre 0 y 100.")
+        if all(cleaned[field] is None for field in ProductBulkUpdateService.FIELDS):
+            raise ValueError("No hay campos para actualizar (price, price_list, stock, discount).")
+        return cleaned
+
+
+def _value(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in (None, '') else value
+
+
+def _price(value, field: str) -> Decimal | None:
+    value = _value(value)
+    if value is None:
+        return None
+    try:
+        number = Decimal(str(value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field} no es un número válido: {value!r}")
+    if number.is_nan():   # quantize deja pasar "nan" y la comparacion lanza InvalidOperation
+        raise ValueError(f"{field} no es un número válido: {value!r}")
+    if number < 0 or number >= ProductBulkUpdateService.MAX_PRICE:
+        raise ValueError(f"{field} fuera de rango: {value!r}")
+    return number
+
+
+def _integer(value, field: str) -> int | None:
+    value = _value(value)
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{field} no es un entero válido: {value!r}")
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field} no es un entero válido: {value!r}")
+    if number != number.to_integral_value() or number < 0 or number > 2147483647:
+        raise ValueError(f"{field} debe ser un entero positivo: {value!r}")
+    return int(number)
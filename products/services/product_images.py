@@ -0,0 +1,228 @@
+# products/services/product_images.py
+import logging
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import close_old_connections, connection, transaction
+
+from products.models.product import Product
+from products.models.product_image import ProductImage
+
+from core.utils.image_store import find_upload, register_upload
+from core.utils.utils_image import get_url_from_imgbb
+
+logger = logging.getLogger(__name__)
+
+
+class ProductImageUploadService:
+    """
+    Uploads several product images to ImgBB at once and attaches them to the product.
+
+    The remote uploads run concurrently in a bounded thread pool (the request
+    waits for the slowest file instead of the sum of all of them), and all the
+    uploaded urls are stored with a single `bulk_create` of ProductImage rows.
+
+    Files are deduplicated by content (`core.utils.image_store`): an image
+    that was already uploaded is not sent to ImgBB again, its url is reused
+    and the new row references the same `StoredImage`.
+
+    Async mode: `start_job()` copies the files to memory, runs the same upload
+    in a small background pool and returns a job id right away; the admin UI
+    polls `get_job()` (state kept in the cache, so any worker can answer it
+    when the cache is Redis).
+    """
+
+    UPLOAD_WORKERS = 4      # uploads simultaneos por request
+    JOB_WORKERS = 2         # jobs async simultaneos por proceso
+    MAX_FILES = 20
+    MAX_FILE_SIZE = 32 * 1024 * 1024   # limite de ImgBB
+    JOB_TTL = 60 * 60       # seconds
+
+    JOB_PENDING = "pending"
+    JOB_RUNNING = "running"
+    JOB_DONE = "done"
+    JOB_FAILED = "failed"
+
+    _job_pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="product-images")
+
+    @staticmethod
+    def upload_and_attach(product: Product, files: list) -> dict[str, Any]:
+        """
+        Upload the files concurrently and create their ProductImage rows.
+
+        Args:
+            product (Product): Product the images belong to (only `id` is needed).
+            files (list[UploadedFile]): Image files from the request.
+
+        Returns:
+            dict: {
+                "success": bool,
+                "uploaded_images": list[str],
+                "errors": list[str] | None,
+                "total_uploaded": int,
+                "main_image": str | None,   # nueva imagen principal, si cambió
+                "results": [{"name", "url", "stored_image_id", "duplicate", "error"}]   # same order as `files`
+            }
+        """
+        results = ProductImageUploadService._upload_files(files)
+        urls = [r["url"] for r in results if r["url"]]
+
+        main_image = ProductImageUploadService._attach_images(product, results) if urls else None
+        errors = [f"{r['name']}: {r['error']}" for r in results if r["error"]]
+
+        return {
+            "success": bool(urls),
+            "uploaded_images": urls,
+            "errors": errors or None,
+            "total_uploaded": len(urls),
+            "main_image": main_image,
+            "results": results,
+        }
+
+    @staticmethod
+    def start_job(product: Product, files: list) -> str:
+        """
+        Queue the upload in the background and return its job id.
+
+        The request files are copied to memory first: Django closes (and deletes
+        the temporary files of) the uploads when the request ends.
+        """
+        job_id = uuid.uuid4().hex
+        copies = [
+            SimpleUploadedFile(f.name, f.read(), content_type=getattr(f, "content_type", None))
+            for f in files
+        ]
+
+        ProductImageUploadService._set_job(job_id, {
+            "status": ProductImageUploadService.JOB_PENDING,
+            "product_id": product.id,
+            "total": len(copies),
+            "result": None,
+        })
+        ProductImageUploadService._job_pool.submit(ProductImageUploadService._run_job, job_id, product.id, copies)
+        return job_id
+
+    @staticmethod
+    def get_job(job_id: str) -> dict[str, Any] | None:
+        return cache.get(ProductImageUploadService._job_key(job_id))
+
+    # -------------------- private methods
+    @staticmethod
+    def _upload_files(files: list) -> list[dict[str, Any]]:
+        """
+        Validate, dedupe and upload the files; one result per file, in order.
+
+        Only the ImgBB POST runs in the thread pool: the hashing and the
+        StoredImage queries stay in the calling thread, so the pool threads
+        never open DB connections and the rows are written in the caller's
+        transaction.
+        """
+        results = [
+            {"name": f.name, "url": None, "stored_image_id": None, "duplicate": False, "error": None}
+            for f in files
+        ]
+
+        # hash del contenido; solo los archivos nuevos se suben a ImgBB
+        pending = []
+        for result, image_file in zip(results, files):
+            try:
+                content_hash, ext, existing = find_upload(image_file, ProductImageUploadService.MAX_FILE_SIZE)
+            except Exception as e:
+                result["error"] = ProductImageUploadService._error_message(e)
+                continue
+            if existing:
+                result.update(url=existing.url, stored_image_id=existing.id, duplicate=True)
+            else:
+                pending.append((result, image_file, content_hash, ext))
+
+        if not pending:
+            return results
+
+        def upload(image_file):
+            try:
+                return get_url_from_imgbb(image_file), None
+            except Exception as e:
+                return None, ProductImageUploadService._error_message(e)
+
+        workers = min(ProductImageUploadService.UPLOAD_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            uploads = list(pool.map(upload, [image_file for _, image_file, _, _ in pending]))
+
+        for (result, image_file, content_hash, ext), (url, error) in zip(pending, uploads):
+            if error:
+                result["error"] = error
+                continue
+            try:
+                stored, created = register_upload(image_file, content_hash, ext, path="", url=url)
+            except Exception as e:
+                result["error"] = ProductImageUploadService._error_message(e)
+                continue
+            result.update(url=stored.url, stored_image_id=stored.id, duplicate=not created)
+        return results
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        return str(error) if isinstance(error, ValueError) else f"Error inesperado - {error}"
+
+    @staticmethod
+    def _attach_images(product: Product, results: list[dict]) -> str | None:
+        """
+        Insert all the ProductImage rows of the successful uploads in one query.
+        If the product had no main image, the first uploaded one becomes the
+        main image.
+
+        Returns:
+            str | None: The new main image url, None if it did not change.
+        """
+        with transaction.atomic():
+            # lock del producto: dos uploads simultaneos no pueden marcar dos principales
+            Product.objects.select_for_update().filter(id=product.id).values_list('id', flat=True).first()
+            has_main = ProductImage.objects.filter(product_id=product.id, main_image=True).exists()
+
+            uploaded = [r for r in results if r["url"]]
+            ProductImage.objects.bulk_create([
+                ProductImage(
+                    product_id=product.id, image_url=r["url"], stored_image_id=r["stored_image_id"],
+                    main_image=not has_main and i == 0,
+                )
+                for i, r in enumerate(uploaded)
+            ])
+
+            if has_main:
+                return None
+            Product.objects.filter(id=product.id).update(main_image=uploaded[0]["url"])
+            return uploaded[0]["url"]
+
+    @staticmethod
+    def _run_job(job_id: str, product_id: int, files: list) -> None:
+        cls = ProductImageUploadService
+        close_old_connections()
+        try:
+            cls._set_job(job_id, {
+                "status": cls.JOB_RUNNING, "product_id": product_id, "total": len(files), "result": None,
+            })
+            product = Product.objects.only('id').get(id=product_id)
+            result = cls.upload_and_attach(product, files)
+            cls._set_job(job_id, {
+                "status": cls.JOB_DONE, "product_id": product_id, "total": len(files), "result": result,
+            })
+        except Exception as e:
+            logger.exception("Product images job %s failed", job_id)
+            cls._set_job(job_id, {
+                "status": cls.JOB_FAILED, "product_id": product_id, "total": len(files),
+                "result": {"success": False, "detail": str(e)},
+            })
+        finally:
+            connection.close()   # conexion propia del hilo del pool
+
+    @staticmethod
+    def _set_job(job_id: str, data: dict) -> None:
+        cache.set(ProductImageUploadService._job_key(job_id), data, ProductImageUploadService.JOB_TTL)
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"product_images_job:{job_id}"
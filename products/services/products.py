@@ -53,6 +53,12 @@ class ProductService:
         'description', 'discount', 'updated_at', 'main_image'
     )
 
+    # columnas del export del catalogo (CSV / JSON lines)
+    VALUES_EXPORT = (
+        'id', 'sku', 'name', 'slug', 'price', 'price_list', 'discount', 'stock', 'available',
+        'category_name', 'subcategory_name', 'brand_name', 'main_image', 'description', 'updated_at',
+    )
+
     
     @staticmethod
     def for_detail(*, entity_id: int, entity_slug: str) -> Product:
@@ -150,6 +156,27 @@ class ProductService:
             filters=filters, values=ProductService.VALUES_DASHBOARD_PRODUCTS, sorted_by=('name', 'id')
         )
 
+    @staticmethod
+    def qs_for_export(*, filters: dict) -> QuerySet:
+        """
+        Catalog export rows (VALUES_EXPORT keys), ordered by id.
+
+        Same filters as the listings except the text search; category,
+        subcategory and brand come as names (`*_name`). Meant to be consumed with
+        `.iterator()`, see core/utils/utils_export.py.
+        """
+        filters = {**filters, 'query': '', 'top_query': ''}
+        return (
+            ProductService._get_qs_products_filters(filters=filters, values=('id',), sorted_by=('id',))
+            .values(
+                'id', 'sku', 'name', 'slug', 'price', 'price_list', 'discount', 'stock', 'available',
+                'main_image', 'description', 'updated_at',
+                category_name=F('subcategory__category__name'),
+                subcategory_name=F('subcategory__name'),
+                brand_name=F('brand__name'),
+            )
+        )
+
     @staticmethod
     def serializer_list_add_flags(*, products: list[dict], user=None) -> list[dict]:
         # solo buscar en favorites client si hay user...
@@ -0,0 +1,113 @@
+# products/services/search_index.py
+import unicodedata
+
+from functools import lru_cache
+
+from django.db import connection
+
+from products.models.product import Product
+
+
+class SearchIndexService:
+    """
+    Set-based maintenance of `Product.normalized_name` and `search_vector`
+    (PostgreSQL only).
+
+    The normalization runs in SQL with the same steps as
+    `utils_basic.normalize_or_None` ('+' -> space, accents removed, symbols
+    removed, spaces collapsed, lowercase), so no row travels to Python.
+    Every PK range is one UPDATE that only writes the rows whose
+    normalized_name or search_vector differ from the recomputed values.
+
+    Accents are removed with `translate()` and a map built from the same NFD
+    rule used in Python (so 'æ' and 'ß' are kept, like normalize_or_None
+    does). The `unaccent` extension is not used: its rules differ ('æ' ->
+    'ae', 'ß' -> 'ss').
+    """
+
+    BATCH_SIZE = 20_000
+
+    @staticmethod
+    def check_backend() -> None:
+        """
+        Raises:
+            RuntimeError: If the database is not PostgreSQL.
+        """
+        if connection.vendor != 'postgresql':
+            raise RuntimeError("El mantenimiento del índice de búsqueda requiere PostgreSQL.")
+
+    @staticmethod
+    def id_bounds() -> tuple[int | None, int | None]:
+        """ (min id, max id) of the products, (None, None) if there are none. """
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT min(id), max(id) FROM {Product._meta.db_table}")
+            return cursor.fetchone()
+
+    @staticmethod
+    def reindex_range(start: int, end: int, *, dry_run: bool = False) -> int:
+        """
+        Recompute the products with `start <= id < end`.
+
+        Args:
+            dry_run (bool): Only count the stale rows.
+
+        Returns:
+            int: Stale rows (updated unless dry_run).
+        """
+        table = Product._meta.db_table
+        normalized, params = SearchIndexService._normalized_sql('name')
+        # igual que SearchVector('normalized_name', weight='A')
+        vector = "setweight(to_tsvector(COALESCE(src.nn, '')), 'A')"
+        stale = f"(p.normalized_name IS DISTINCT FROM src.nn OR p.search_vector IS DISTINCT FROM {vector})"
+
+        if dry_run:
+            sql = f"""
+                SELECT count(*)
+                FROM {table} p
+                JOIN (SELECT id, {normalized} AS nn FROM {table} WHERE id >= %s AND id < %s) src ON src.id = p.id
+                WHERE {stale}
+            """
+        else:
+            sql = f"""
+                UPDATE {table} p
+                SET normalized_name = src.nn, search_vector = {vector}
+                FROM (SELECT id, {normalized} AS nn FROM {table} WHERE id >= %s AND id < %s) src
+                WHERE p.id = src.id AND {stale}
+            """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, start, end])
+            return cursor.fetchone()[0] if dry_run else cursor.rowcount
+
+    # -------------------- private methods
+    @staticmethod
+    def _normalized_sql(column: str) -> tuple[str, list]:
+        """ SQL expression (and params) equivalent to normalize_or_None(<column>). """
+        text = f"replace({column}, '+', ' ')"
+        # translate() recorre el mapa por cada caracter: los nombres solo ASCII se lo saltan
+        text = f"CASE WHEN octet_length({column}) = char_length({column}) THEN {text} ELSE translate({text}, %s, %s) END"
+        params = list(_accent_map())
+        # espacios colapsados antes del btrim: equivale a strip() + re.sub(r'\s+', ' ')
+        text = rf"btrim(regexp_replace(regexp_replace({text}, '[^\w\s]', '', 'g'), '\s+', ' ', 'g'))"
+        # normalize_or_None solo devuelve None si el texto viene vacio
+        return f"CASE WHEN {column} = '' THEN NULL ELSE lower({text}) END", params
+
+
+# latin-1, latin extendido A/B, griego, cirilico, latin extendido adicional (vietnamita) y griego extendido
+ACCENT_RANGES = ((0x00C0, 0x0250), (0x0370, 0x0530), (0x1E00, 0x2000))
+
+
+@lru_cache(maxsize=1)
+def _accent_map() -> tuple[str, str]:
+    """
+    ('áéạ...', 'aea...'): letters with a diacritic -> base letter (NFD without
+    marks, as normalize_or_None) for the scripts in ACCENT_RANGES.
+    """
+    source, target = [], []
+    for code in (code for first, last in ACCENT_RANGES for code in range(first, last)):
+        char = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFD', char) if unicodedata.category(c) != 'Mn')
+        if base != char and len(base) == 1:
+            source.append(char)
+            target.append(base)
+    return ''.join(source), ''.join(target)
@@ -75,6 +75,12 @@ function renderCards(product, isSwiper=false) {
     // Use a fallback image if the product image is not an absolute URL
     const imgSrc = prod.main_image.startsWith('http') ? prod.main_image : 'default-image.jpg';
 
+    // Resized WebP variants (only for images stored by us, ImgBB urls have none)
+    const variants = prod.main_image_variants;
+    const srcset = variants
+        ? `${variants.thumb.webp} 160w, ${variants.card.webp} 400w, ${variants.detail.webp} 1200w`
+        : '';
+
     // Construct the HTML string for a single product card
     const cardHTML = /*html*/`
         <article class="product__card w-100 relative ${(isSwiper) ? 'swiper-slide' : ''}">
@@ -85,6 +91,7 @@ function renderCards(product, isSwiper=false) {
             <div class="d-grid h-100 w-100 product-card__info">
                 <a href="${urlDetail}" class="cont-img-100">
                     <img class="img-scale-down" src="${imgSrc}" alt="${prod.name}"
+                    ${srcset ? `srcset="${srcset}" sizes="(max-width: 600px) 50vw, 400px"` : ''}
                     loading="lazy" width="100" height="100">
                 </a>
 
@@ -0,0 +1,129 @@
+import csv
+import pytest
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from products.models.product import Product
+from products.services.catalog_import import CatalogImportService, _parse_numbered
+
+
+def raw_row(**fields):
+    row = {
+        "id": "SKU-1", "name": "Peluche Pikachu", "price": "1.500,50", "available": "si",
+        "stock": "10", "category": "Peluches", "subcategory": "Pokemon", "brand": "Nintendo",
+        "discount": "", "description": "Suave", "image_url": "https://example.com/a.png", "image_url2": "",
+    }
+    row.update(fields)
+    return row
+
+
+# -------------------- parse_row
+def test_parse_row_cleans_values():
+    row = CatalogImportService.parse_row(raw_row(stock=12.0, discount=" 15 "))
+
+    assert row["sku"] == "SKU-1"
+    assert row["price"] == Decimal("1500.50")
+    assert (row["stock"], row["discount"], row["available"]) == (12, 15, True)
+    assert row["slug"] == "peluche-pikachu"
+    assert row["images"] == ["https://example.com/a.png"]
+    assert CatalogImportService.parse_row(raw_row())["hash"] == CatalogImportService.parse_row(raw_row())["hash"]
+
+
+@pytest.mark.parametrize("stock", ["1.7", "inf", float("inf"), "nan", "-1", "2147483648", True, "1.500"])
+def test_parse_row_rejects_invalid_integers(stock):
+    with pytest.raises(ValueError):
+        CatalogImportService.parse_row(raw_row(stock=stock))
+
+
+@pytest.mark.parametrize("fields", [
+    {"name": ""}, {"discount": "101"}, {"price": "nan"}, {"price": "Infinity"}, {"price": "100000000"},
+])
+def test_parse_row_rejects_invalid_rows(fields):
+    with pytest.raises(ValueError):
+        CatalogImportService.parse_row(raw_row(**fields))
+
+
+# -------------------- import
+@pytest.mark.django_db
+def test_existing_skus_are_skipped_without_sync():
+    first = CatalogImportService.run([raw_row()])
+    second = CatalogImportService.run([raw_row(price="999")])
+
+    assert (first["created"], second["created"], second["existing"]) == (1, 0, 1)
+    assert Product.objects.get(sku="SKU-1").price == Decimal("1500.50")
+
+
+@pytest.mark.django_db
+def test_sync_updates_only_changed_fields():
+    CatalogImportService.run([raw_row(), raw_row(id="SKU-2", name="Peluche Eevee")])
+    product = Product.objects.get(sku="SKU-1")
+
+    stats = CatalogImportService.run(
+        [raw_row(price="2000", stock="3"), raw_row(id="SKU-2", name="Peluche Eevee")], sync=True
+    )
+
+    assert (stats["updated"], stats["unchanged"]) == (1, 1)
+    assert dict(stats["fields"]) == {"price": 1, "stock": 1}
+    assert ("SKU-1", "price", Decimal("1500.50"), Decimal("2000.00")) in stats["changes"]
+    product.refresh_from_db()
+    assert (product.price, product.stock, product.description) == (Decimal("2000.00"), 3, "Suave")
+
+
+@pytest.mark.django_db
+def test_sync_skips_unchanged_hashes():
+    CatalogImportService.run([raw_row()])
+    updated_at = Product.objects.get(sku="SKU-1").updated_at
+
+    stats = CatalogImportService.run([raw_row()], sync=True)
+
+    assert (stats["updated"], stats["unchanged"]) == (0, 1)
+    assert not stats["changes"]
+    assert Product.objects.get(sku="SKU-1").updated_at == updated_at
+
+
+@pytest.mark.django_db
+def test_dry_run_rolls_back():
+    stats = CatalogImportService.run([raw_row(), raw_row(id="SKU-2", name="Peluche Eevee")], dry_run=True)
+
+    assert stats["created"] == 2
+    assert not Product.objects.filter(sku__in=["SKU-1", "SKU-2"]).exists()
+
+
+@pytest.mark.django_db
+def test_new_categories_invalidate_the_menu_cache():
+    cache.set(CatalogImportService.MENU_CACHE_KEY, {"stale": True})
+    CatalogImportService.run([raw_row(category="Cartas", subcategory="TCG")], dry_run=True)
+    assert cache.get(CatalogImportService.MENU_CACHE_KEY) == {"stale": True}
+
+    CatalogImportService.run([raw_row(category="Cartas", subcategory="TCG")])
+    assert cache.get(CatalogImportService.MENU_CACHE_KEY) is None
+
+    # nada nuevo en la taxonomia: el cache se conserva
+    cache.set(CatalogImportService.MENU_CACHE_KEY, {"fresh": True})
+    CatalogImportService.run([raw_row(id="SKU-2", name="Peluche Eevee", category="Cartas", subcategory="TCG")])
+    assert cache.get(CatalogImportService.MENU_CACHE_KEY) == {"fresh": True}
+
+
+
+# -------------------- csv paralelo
+def test_split_csv_keeps_quoted_newlines(tmp_path):
+    path = tmp_path / "catalogo.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CatalogImportService.COLUMNS)
+        for i in range(7):
+            description = f"linea 1\nlinea 2 \"comillas\"\n{i}" if i % 2 else "simple"
+            writer.writerow(raw_row(id=f"SKU-{i}", name=f"Producto {i}", description=description, stock=str(i)).values())
+        writer.writerow(raw_row(id="SKU-X", name="Producto X", stock="1.7").values())   # error en la ultima fila
+
+    serial = _parse_numbered(enumerate(CatalogImportService.iter_file(str(path)), start=2))
+    _, ranges = CatalogImportService.split_csv(str(path), chunk_rows=2)
+    chunks = list(CatalogImportService.iter_parsed_chunks(str(path), workers=2, chunk_rows=2))
+
+    assert [first_line for _, _, first_line in ranges] == [2, 4, 6, 8]
+    assert [line for line, _ in serial[0]] == list(range(2, 9))
+    assert [p for chunk in chunks for p in chunk[0]] == serial[0]
+    assert [e for chunk in chunks for e in chunk[1]] == serial[1] == [(9, serial[1][0][1])]
+    assert sum(chunk[2] for chunk in chunks) == serial[2] == 8
+    assert serial[0][1][1]["description"] == "linea 1\nlinea 2 \"comillas\"\n1"
@@ -0,0 +1,63 @@
+import pytest
+from decimal import Decimal
+
+from products.models.brand import Brand
+from products.models.product import Product
+from products.services.price_adjustment import PriceAdjustmentService
+
+
+@pytest.fixture
+def brand(db):
+    return Brand.objects.create(name="Nintendo")
+
+
+@pytest.fixture
+def products(brand):
+    return [
+        Product.objects.create(name="Peluche Pikachu", brand=brand, price=Decimal("1000"), price_list=Decimal("1200")),
+        Product.objects.create(name="Peluche Eevee", brand=brand, price=Decimal("2499"), price_list=None),
+    ]
+
+
+@pytest.fixture
+def cheap(brand):
+    return Product.objects.create(name="Sticker Pikachu", brand=brand, price=Decimal("3"), price_list=None)
+
+
+def test_preview_keeps_empty_price_list(products):
+    result = PriceAdjustmentService.preview(
+        mode="percent", value=Decimal("10"), rounding="1", fields=("price", "price_list"), brand=products[0].brand_id
+    )
+
+    assert (result["affected"], result["over_max"], result["under_min"]) == (2, 0, 0)
+    pikachu, eevee = result["sample"]
+    assert (pikachu["new_price"], pikachu["new_price_list"]) == (Decimal("1100.00"), Decimal("1320.00"))
+    assert (eevee["new_price"], eevee["new_price_list"]) == (Decimal("2749.00"), None)
+
+
+def test_preview_counts_prices_rounded_below_one_step(products, cheap):
+    result = PriceAdjustmentService.preview(mode="percent", value=Decimal("-10"), rounding="10", brand=cheap.brand_id)
+
+    assert result["under_min"] == 1
+
+
+def test_apply_writes_the_preview_and_keeps_nulls(products):
+    result = PriceAdjustmentService.apply(
+        mode="fixed", value=Decimal("100"), fields=("price", "price_list"), brand=products[0].brand_id
+    )
+
+    assert result == {"affected": 2, "changed": 2, "audit_rows": 2}
+    stored = {p.name: (p.price, p.price_list) for p in Product.objects.filter(brand=products[0].brand)}
+    assert stored == {
+        "Peluche Pikachu": (Decimal("1100.00"), Decimal("1300.00")),
+        "Peluche Eevee": (Decimal("2599.00"), None),
+    }
+
+
+def test_apply_rejects_prices_rounded_to_zero(products, cheap):
+    with pytest.raises(ValueError):
+        PriceAdjustmentService.apply(mode="percent", value=Decimal("-10"), rounding="10", brand=cheap.brand_id)
+
+    cheap.refresh_from_db()
+    assert cheap.price == Decimal("3.00")
+    assert Product.objects.get(id=products[0].id).price == Decimal("1000.00")
@@ -0,0 +1,111 @@
+import pytest
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from products.models.product import Product
+from products.services.product_bulk_edit import ProductBulkEditService
+
+User = get_user_model()
+URL = reverse("api_product_bulk_edit")
+
+
+@pytest.fixture
+def admin(db):
+    return User.objects.create_user(email="admin@test.com", password="1234", role="admin")
+
+
+@pytest.fixture
+def seller(db):
+    return User.objects.create_user(email="seller@test.com", password="1234", role="seller")
+
+
+@pytest.fixture
+def products(db):
+    return [
+        Product.objects.create(name="Peluche Pikachu", price=Decimal("1000"), stock=5, discount=0),
+        Product.objects.create(name="Peluche Eevee", price=Decimal("2000"), stock=3, discount=0),
+    ]
+
+
+def patch(api_client, user, items):
+    api_client.force_authenticate(user)
+    return api_client.patch(URL, {"products": items}, format="json")
+
+
+def test_bulk_edit_updates_changed_fields(api_client, admin, products):
+    pikachu, eevee = products
+
+    response = patch(api_client, admin, [
+        {"id": pikachu.id, "price": "1500.50", "stock": 7},   # "." decimal, no separador de miles
+        {"id": eevee.id, "price": "2.000,00", "stock": "3"},   # sin cambios
+    ])
+
+    assert response.status_code == 200, response.data
+    assert (response.data["updated"], response.data["unchanged"]) == (1, 1)
+    pikachu.refresh_from_db()
+    assert (pikachu.price, pikachu.stock) == (Decimal("1500.50"), 7)
+
+
+def test_bulk_edit_is_all_or_nothing(api_client, admin, products):
+    pikachu, eevee = products
+
+    response = patch(api_client, admin, [
+        {"id": pikachu.id, "price": "1200"},
+        {"id": eevee.id, "stock": "1.7"},
+        {"id": eevee.id + 1000, "stock": 1},
+    ])
+
+    assert response.status_code == 400
+    assert {(e["id"], e["field"]) for e in response.data["errors"]} == {
+        (eevee.id, "stock"), (eevee.id + 1000, "id")
+    }
+    pikachu.refresh_from_db()
+    assert pikachu.price == Decimal("1000.00")
+
+
+@pytest.mark.parametrize("field, value", [
+    ("price", "100000000"), ("price", 1e300), ("price", "nan"), ("price_list", True),
+    ("stock", "2147483648"), ("stock", -1), ("discount", "101"),
+])
+def test_bulk_edit_checks_column_ranges(api_client, admin, products, field, value):
+    response = patch(api_client, admin, [{"id": products[0].id, field: value}])
+
+    assert response.status_code == 400
+    assert response.data["errors"][0]["field"] == field
+
+
+def test_bulk_edit_rejects_name_collisions(api_client, admin, products):
+    pikachu, eevee = products
+
+    taken = patch(api_client, admin, [{"id": eevee.id, "name": "Peluche Pikachu"}])
+    repeated = patch(api_client, admin, [
+        {"id": pikachu.id, "name": "Peluche Nuevo"}, {"id": eevee.id, "name": "Peluche Nuevo"},
+    ])
+
+    assert taken.status_code == repeated.status_code == 400
+    assert taken.data["errors"][0] == {
+        "id": eevee.id, "field": "name", "detail": "Ya existe un producto llamado 'Peluche Pikachu'.",
+    }
+    assert repeated.data["errors"][0]["detail"] == "Hay nombres repetidos en el envío."
+    assert set(Product.objects.values_list("name", flat=True)) >= {"Peluche Pikachu", "Peluche Eevee"}
+
+
+def test_sellers_cannot_use_the_endpoint(api_client, seller, products):
+    response = patch(api_client, seller, [{"id": products[0].id, "stock": 1}])
+
+    assert response.status_code == 403
+
+
+def test_seller_price_fields_are_ignored(seller, products):
+    pikachu = products[0]
+
+    result = ProductBulkEditService.edit(
+        [{"id": pikachu.id, "price": "1", "discount": 50, "stock": 9}], user=seller
+    )
+
+    assert result["success"]
+    assert result["ignored"] == [{"id": pikachu.id, "fields": ["price", "discount"]}]
+    pikachu.refresh_from_db()
+    assert (pikachu.price, pikachu.discount, pikachu.stock) == (Decimal("1000.00"), 0, 9)
@@ -0,0 +1,99 @@
+import pytest
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from products.models.product import Product
+from products.services.product_bulk_update import ProductBulkUpdateService
+
+User = get_user_model()
+URL = reverse("api_product_bulk_update")
+
+
+@pytest.fixture
+def products(db):
+    return [
+        Product.objects.create(name="Peluche Pikachu", sku="PK-1", price=Decimal("1000"), stock=5, discount=0),
+        Product.objects.create(name="Peluche Eevee", sku="PK-2", price=Decimal("2000"), stock=3, discount=10),
+        Product.objects.create(name="Peluche Snorlax", sku="PK-3", price=Decimal("3000"), stock=1, discount=0),
+    ]
+
+
+def test_validate_resolves_ids_and_skus(products):
+    rows = ProductBulkUpdateService.parse(
+        f"id,sku,price,stock\n{products[0].id},,1500,\n,PK-2,,7\n,NOPE,10,\n{products[2].id},,nan,\n"
+    )
+
+    updates, errors = ProductBulkUpdateService.validate(rows)
+
+    assert updates == [
+        (products[0].id, Decimal("1500.00"), None, None, None),
+        (products[1].id, None, None, 7, None),
+    ]
+    assert [e["line"] for e in errors] == [4, 5]
+
+
+def test_apply_returns_old_and_new_values_and_skips_unchanged(products, django_assert_num_queries):
+    pikachu, eevee, snorlax = products
+    updates = [
+        (pikachu.id, Decimal("1500.00"), None, None, None),   # cambia el precio
+        (eevee.id, Decimal("2000.00"), None, 3, 10),         # mismos valores
+        (snorlax.id, None, Decimal("3500.00"), 0, None),     # price_list y stock
+    ]
+    before = {p.id: p.updated_at for p in products}
+
+    with django_assert_num_queries(1):   # un UPDATE por lote (el audit se escribe al commit)
+        changes = ProductBulkUpdateService._update_batch(updates)
+
+    assert sorted(changes) == sorted([
+        (pikachu.id, {"price": Decimal("1000.00")}, {"price": Decimal("1500.00")}),
+        (snorlax.id, {"price_list": None, "stock": 1}, {"price_list": Decimal("3500.00"), "stock": 0}),
+    ])
+
+    stored = {p.id: p for p in Product.objects.filter(id__in=before)}
+    assert stored[pikachu.id].price == Decimal("1500.00")
+    assert (stored[snorlax.id].price, stored[snorlax.id].stock) == (Decimal("3000.00"), 0)
+    assert stored[eevee.id].updated_at == before[eevee.id]   # la fila sin cambios no se escribe
+    assert stored[pikachu.id].updated_at > before[pikachu.id]
+
+
+def test_apply_reports_counts(products):
+    result = ProductBulkUpdateService.apply([
+        (products[0].id, Decimal("1000.00"), None, 9, None),
+        (products[1].id, None, None, 3, None),
+    ])
+
+    assert result == {"received": 2, "updated": 1, "unchanged": 1, "audit_rows": 1}
+
+
+
+@pytest.fixture
+def admin(db):
+    return User.objects.create_user(email="admin@test.com", password="1234", role="admin")
+
+
+def test_view_reads_the_format_from_the_query_param(api_client, admin, products):
+    api_client.force_authenticate(admin)
+    jsonl = f'{{"id": {products[0].id}, "stock": 9}}\n'
+
+    response = api_client.post(f"{URL}?input=jsonl", data=jsonl, content_type="text/plain")
+    assert response.status_code == 200, response.content
+    assert response.json()["updated"] == 1
+    assert Product.objects.get(id=products[0].id).stock == 9
+
+    # el parametro manda sobre el contenido: JSON lines leido como CSV no tiene columna id
+    response = api_client.post(f"{URL}?input=csv", data=jsonl, content_type="text/plain")
+    assert response.status_code == 400
+    assert "encabezado" in response.json()["detail"]
+
+
+def test_view_reads_the_format_from_the_content_type(api_client, admin, products):
+    api_client.force_authenticate(admin)
+
+    response = api_client.post(URL, data="sku,stock\nPK-2,4\n", content_type="text/csv; charset=utf-8")
+    assert response.status_code == 200, response.content
+    assert Product.objects.get(sku="PK-2").stock == 4
+
+    response = api_client.post(URL, data="sku,stock\nPK-2,4\n", content_type="application/x-ndjson")
+    assert response.status_code == 400
@@ -0,0 +1,51 @@
+import pytest
+import threading
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from products.models.product import Product
+from products.models.product_image import ProductImage
+from products.services import product_images
+from products.services.product_images import ProductImageUploadService
+
+
+def png(color="red"):
+    buffer = BytesIO()
+    Image.new("RGB", (40, 40), color).save(buffer, "PNG")
+    return SimpleUploadedFile(f"{color}.png", buffer.getvalue(), content_type="image/png")
+
+
+@pytest.fixture
+def imgbb(monkeypatch):
+    """ ImgBB stand-in: records the thread of each upload and fails the 'black' images. """
+    threads = []
+
+    def upload(image_file):
+        threads.append(threading.get_ident())
+        if image_file.name.startswith("black"):
+            raise ValueError("Error en ImgBB: rechazada")
+        return f"https://i.ibb.co/{image_file.name}"
+
+    monkeypatch.setattr(product_images, "get_url_from_imgbb", upload)
+    return threads
+
+
+@pytest.mark.django_db
+def test_upload_and_attach_dedupes_and_keeps_file_order(imgbb):
+    product = Product.objects.create(name="Peluche Pikachu", price=Decimal("1000"))
+
+    result = ProductImageUploadService.upload_and_attach(product, [png("red"), png("blue"), png("black")])
+    again = ProductImageUploadService.upload_and_attach(product, [png("red")])
+
+    assert [r["url"] for r in result["results"]] == ["https://i.ibb.co/red.png", "https://i.ibb.co/blue.png", None]
+    assert result["errors"] == ["black.png: Error en ImgBB: rechazada"]
+    assert result["main_image"] == "https://i.ibb.co/red.png"
+    # el mismo contenido no se vuelve a subir
+    assert again["results"][0]["duplicate"] is True
+    assert len(imgbb) == 3
+    # solo el POST corre en el pool, las filas se escriben en el hilo del request
+    assert threading.get_ident() not in imgbb
+    assert ProductImage.objects.filter(product=product).count() == 3
@@ -0,0 +1,62 @@
+import pytest
+from decimal import Decimal
+
+from django.db import connection
+
+from core.utils.utils_basic import normalize_or_None
+from products.models.brand import Brand
+from products.models.product import Product
+from products.services.search_index import ACCENT_RANGES, SearchIndexService
+
+
+NAMES = [
+    "Pokémon Ñandú",
+    "Ærø Straße",
+    "Bạn thân Việt",
+    "Ψυχή Йогурт",
+    "  Carta++Holo   Edición!  ",
+    "Kit — N°1 (¿oferta?)",
+    "é combinada",
+    "",
+]
+
+
+def sql_normalize(texts: list[str]) -> list[str | None]:
+    normalized, params = SearchIndexService._normalized_sql('name')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {normalized} FROM unnest(%s::text[]) WITH ORDINALITY AS t(name, n) ORDER BY n",
+            [*params, texts],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.mark.django_db
+def test_sql_matches_normalize_or_none():
+    assert sql_normalize(NAMES) == [normalize_or_None(name) for name in NAMES]
+
+
+@pytest.mark.django_db
+def test_sql_matches_normalize_or_none_for_every_mapped_character():
+    chars = [chr(code) for first, last in ACCENT_RANGES for code in range(first, last)]
+    texts = [f"x{char}x" for char in chars]
+
+    mismatches = [
+        (char, expected, got)
+        for char, expected, got in zip(chars, [normalize_or_None(text) for text in texts], sql_normalize(texts))
+        if expected != got
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.django_db
+def test_reindex_range_writes_python_normalization():
+    brand = Brand.objects.create(name="Nintendo")
+    products = [Product.objects.create(name=name, brand=brand, price=Decimal("1000")) for name in NAMES if name]
+    Product.objects.update(normalized_name=None, search_vector=None)
+    ids = [p.id for p in products]
+
+    assert SearchIndexService.reindex_range(min(ids), max(ids) + 1) == len(products)
+    assert SearchIndexService.reindex_range(min(ids), max(ids) + 1, dry_run=True) == 0
+    stored = dict(Product.objects.filter(id__in=ids).values_list('name', 'normalized_name'))
+    assert stored == {p.name: normalize_or_None(p.name) for p in products}
@@ -1,7 +1,11 @@
 from django.urls import path
 from products.views.api.product_api import ProductAPIView
+from products.views.api.product_bulk_api import (
+    ProductBulkUpdateAPIView, ProductPriceAdjustmentAPIView, ProductBulkEditAPIView
+)
+from products.views.api.product_export_api import ProductExportAPIView
 from products.views.api.categories_api import CategoryAPIView, SubcategoryAPIView, BrandAPIView
-from products.views.api.product_images_api import ProductImagesView
+from products.views.api.product_images_api import ProductImagesView, ProductImagesJobView
 
 
 # ==============================================================================
@@ -13,10 +17,19 @@ urlpatterns = [
     # url para actualizar productos
     path('api/product/', ProductAPIView.as_view(), name='api_product_list_create'), # POST for create
     path('api/product/<int:product_id>/', ProductAPIView.as_view(), name='api_product_detail'), # GET, PUT, PATCH, DELETE
+    # precios y stock masivos (CSV / JSON lines)
+    path('api/product/bulk-update/', ProductBulkUpdateAPIView.as_view(), name='api_product_bulk_update'), # POST
+    # edicion de varios productos a la vez (grilla del dashboard)
+    path('api/product/bulk/', ProductBulkEditAPIView.as_view(), name='api_product_bulk_edit'), # PATCH
+    # ajuste de precios por categoria / subcategoria / marca (% o monto fijo)
+    path('api/product/price-adjustment/', ProductPriceAdjustmentAPIView.as_view(), name='api_product_price_adjustment'), # POST
+    # export del catalogo en streaming (csv / jsonl)
+    path('api/product/export/<str:fmt>/', ProductExportAPIView.as_view(), name='api_product_export'), # GET
     
     # endpoints images    # url para actualizar imgenes
     path('products-images/<int:product_id>/', ProductImagesView.as_view(), name='prod-images'),
     path('api/product/<int:product_id>/images/', ProductImagesView.as_view(), name='product-images-api'),
+    path('api/product/images/jobs/<str:job_id>/', ProductImagesJobView.as_view(), name='product-images-job-api'),
     
     # urls endpoints para manejar category, subcategory, brand
     path('api/category/', CategoryAPIView.as_view(), name='pcategory-create-api'),  # POST for create
@@ -65,53 +65,8 @@ def get_url_from_imgbb(image_file):
         raise ValueError("Error al procesar la imagen")
     
 
-import os
-from PIL import Image
-from io import BytesIO
-def validate_and_prepare_image(file):
-    """Valida la imagen y la prepara para subida. Retorna (file_obj, content_type)."""
-    # Validación básica: nombre y tamaño
-    if not getattr(file, 'name', None):
-        raise ValueError("El archivo no tiene nombre")
-    if file.size == 0:
-        raise ValueError("El archivo está vacío")
-
-    # Obtener extensión y tipo MIME
-    ext = os.path.splitext(file.name)[1][1:].lower() if file.name else 'jpg'
-    content_type = getattr(file, 'content_type', f'image/{ext}' if ext else 'image/jpeg')
-
-    # Validar extensión permitida
-    ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
-    if ext not in ALLOWED_EXTENSIONS:
-        raise ValueError(f"Formato '{ext}' no soportado. Use: {', '.join(ALLOWED_EXTENSIONS)}")
-
-    # Validar tamaño máximo (32MB)
-    if file.size > 32 * 1024 * 1024:
-        raise ValueError("El archivo excede el límite de 32MB")
-
-    # Si el tipo MIME es sospechoso (ej: application/octet-stream), validar con Pillow
-    if not content_type.startswith('image/'):
-        try:
-            # Abrir y verificar integridad de la imagen
-            img = Image.open(file)
-            img.verify()  # Lanza excepción si la imagen está corrupta
-            
-            # Convertir a BytesIO para garantizar compatibilidad
-            output = BytesIO()
-            img = Image.open(file)  # Reabrir porque verify() cierra el archivo
-            img.save(output, format='JPEG' if ext in ('jpg', 'jpeg') else ext.upper())
-            output.seek(0)
-            
-            # Actualizar content_type basado en la extensión
-            content_type = f'image/{ext if ext in ALLOWED_EXTENSIONS else "jpeg"}'
-            return output, content_type
-
-        except Exception as e:
-            raise ValueError(f"Archivo no es una imagen válida: {str(e)}")
-
-    # Si el archivo ya es válido, retornarlo tal cual (reiniciando cursor)
-    file.seek(0)
-    return file, content_type
+# validacion por header (magic bytes + Pillow), sin decodificar ni re-encodear
+from core.utils.utils_image import validate_and_prepare_image
 
 
 import uuid
@@ -0,0 +1,131 @@
+import time
+
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.parsers import BaseParser, MultiPartParser
+
+from core.permissions import IsAdminOrSuperUser
+from products.serializers.price_adjustment_serializer import PriceAdjustmentSerializer
+from products.services.price_adjustment import PriceAdjustmentService
+from products.services.product_bulk_edit import ProductBulkEditService
+from products.services.product_bulk_update import ProductBulkUpdateService
+
+
+class PlainTextParser(BaseParser):
+    """ CSV o JSON lines en el body, se devuelve el texto sin parsear. """
+    media_type = '*/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read().decode('utf-8-sig')
+
+
+class ProductBulkUpdateAPIView(APIView):
+    """
+    Bulk price / stock update.
+
+    Body: CSV (`text/csv`) or JSON lines (`application/x-ndjson`), or a
+    multipart `file`. Columns / keys: id | sku, price, price_list, stock, discount.
+    The format is taken from `?input=csv|jsonl`, then from the Content-Type,
+    otherwise sniffed from the content (`?format=` is DRF's renderer override).
+
+    All or nothing: if any row is invalid returns 400 with the errors and
+    nothing is applied.
+    """
+    permission_classes = [IsAdminOrSuperUser]
+    parser_classes = [MultiPartParser, PlainTextParser]
+    CONTENT_TYPES = {'text/csv': 'csv', 'application/x-ndjson': 'jsonl', 'application/jsonl': 'jsonl'}
+
+    def post(self, request):
+        start = time.perf_counter()
+        try:
+            content = self._get_content(request)
+            fmt = request.query_params.get('input') or self.CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+            rows = ProductBulkUpdateService.parse(content, fmt)
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"success": False, "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not rows:
+            return Response({"success": False, "detail": "No se enviaron filas."}, status=status.HTTP_400_BAD_REQUEST)
+
+        updates, errors = ProductBulkUpdateService.validate(rows)
+        if errors:
+            return Response(
+                {"success": False, "detail": "Hay filas inválidas, no se aplicó ningún cambio.", "errors": errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = ProductBulkUpdateService.apply(updates, user=request.user, ip=request.META.get('REMOTE_ADDR'))
+        return Response({
+            "success": True,
+            **result,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000),
+        }, status=status.HTTP_200_OK)
+
+    def _get_content(self, request) -> str:
+        if request.content_type.startswith('multipart/'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                raise ValueError("Falta el archivo 'file'.")
+            return upload.read().decode('utf-8-sig')
+        return request.data if isinstance(request.data, str) else ''
+
+
+class ProductPriceAdjustmentAPIView(APIView):
+    """
+    Percentage or fixed price adjustment for a category / subcategory / brand
+    (see PriceAdjustmentSerializer for the payload).
+
+    With "preview": true returns the affected count and a sample of the new
+    prices without writing anything.
+    """
+    permission_classes = [IsAdminOrSuperUser]
+
+    def post(self, request):
+        serializer = PriceAdjustmentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = dict(serializer.validated_data)
+        preview = data.pop('preview')
+        start = time.perf_counter()
+        try:
+            if preview:
+                result = PriceAdjustmentService.preview(**data)
+            else:
+                result = PriceAdjustmentService.apply(
+                    **data, user=request.user, ip=request.META.get('REMOTE_ADDR')
+                )
+        except ValueError as e:
+            return Response({"success": False, "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "preview": preview,
+            **result,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000),
+        }, status=status.HTTP_200_OK)
+
+
+class ProductBulkEditAPIView(APIView):
+    """
+    PATCH {"products": [{"id": 10, "price": "1500", "stock": 3}, {"id": 11, "available": false}, ...]}
+
+    Dashboard grid edits of many products in one request (name, price,
+    price_list, stock, discount, available, description, category +
+    subcategory, brand). All or nothing: returns 400 with the invalid rows.
+    """
+    permission_classes = [IsAdminOrSuperUser]
+
+    def patch(self, request):
+        start = time.perf_counter()
+        items = request.data.get('products') if isinstance(request.data, dict) else None
+
+        result = ProductBulkEditService.edit(items, user=request.user, ip=request.META.get('REMOTE_ADDR'))
+        if not result["success"]:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            **result,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000),
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,41 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from core.permissions import IsAdminOrSuperUser
+from core.utils.utils_basic import valid_id_or_None
+from core.utils.utils_export import EXPORT_FORMATS, iter_rows, streaming_export_response
+from products.services.products import ProductService
+
+
+class ProductExportAPIView(APIView):
+    """
+    GET api/product/export/<csv|jsonl>/
+
+    Full catalog dump streamed row by row (server-side cursor), memory stays
+    constant for any catalog size.
+
+    Optional filters: ?category=&subcategory=&brand= (ids),
+    ?available=0|1|2 (2 = all, default) and ?stock=1 (only with stock).
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrSuperUser]
+
+    def get(self, request, fmt):
+        if fmt not in EXPORT_FORMATS:
+            return Response(
+                {"success": False, "detail": f"Formato '{fmt}' no soportado. Use csv o jsonl."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        available = request.GET.get('available', '2')
+        filters = {
+            'category': valid_id_or_None(request.GET.get('category')),
+            'subcategory': valid_id_or_None(request.GET.get('subcategory')),
+            'brand': valid_id_or_None(request.GET.get('brand')),
+            'stock': request.GET.get('stock') == '1',
+            'available': available == '1',
+            'get_all': available == '2',
+        }
+        qs = ProductService.qs_for_export(filters=filters)
+        return streaming_export_response(iter_rows(qs), ProductService.VALUES_EXPORT, fmt, 'catalogo')
@@ -9,7 +9,7 @@ from products.models.product import Product
 
 from core.permissions import IsAdminOrSuperUser
 from core.utils.utils_basic import valid_id_or_None
-from core.utils.utils_image import get_url_from_imgbb
+from products.services.product_images import ProductImageUploadService
 
 
 
@@ -37,46 +37,27 @@ class ProductImagesView(APIView):
         if error:
             return error
 
-        images = ProductImage.objects.filter(product=product)
-        
-        # 3. Procesar imágenes
-        uploaded_urls = []
-        errors = []
-        has_main = any(img.main_image for img in images)    # return True or False
-        
-        for img in request.FILES.getlist('images'):
-            try:
-                url = get_url_from_imgbb(img)  # Validaciones de ImgBB and return img_url
-                
-                # la logica es se guarda como True si no tenía main images
-                ProductImage.objects.create(product=product, image_url=url, main_image=not has_main)
-                
-                # Si no hay otra imagen marcada como principal, esta se marca como main con metodo del modelo
-                if not has_main:
-                    product.update_main_image(url=url) 
-                    has_main = True
-                
-                uploaded_urls.append(url)
-                
-            # si get_url_from_imgbb devolviera algun problema lo almacenamos para mostrar despues
-            except ValueError as e:
-                errors.append(f"{img.name}: {str(e)}")
-                continue
-            except Exception as e:
-                errors.append(f"{img.name}: Error inesperado - {str(e)}")
-                continue
+        files = request.FILES.getlist('images')
+        if not files:
+            return Response({"detail": "El campo 'images' está vacío."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(files) > ProductImageUploadService.MAX_FILES:
+            return Response(
+                {"detail": f"Máximo {ProductImageUploadService.MAX_FILES} imágenes por envío."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # 3. Construir respuesta
-        response_data = {
-            "success": True if uploaded_urls else False,
-            "uploaded_images": uploaded_urls,
-            "errors": errors if errors else None,
-            "total_uploaded": len(uploaded_urls)
-        }
-        
-        print(response_data)
+        # modo async: devuelve un job id y el front consulta ProductImagesJobView
+        if str(request.data.get('async', '')).lower() == 'true':
+            job_id = ProductImageUploadService.start_job(product, files)
+            return Response({"success": True, "job_id": job_id}, status=status.HTTP_202_ACCEPTED)
+
+        # subidas concurrentes a ImgBB + un solo bulk_create de ProductImage
+        response_data = ProductImageUploadService.upload_and_attach(product, files)
 
-        return Response(response_data, status=status.HTTP_201_CREATED if uploaded_urls else status.HTTP_207_MULTI_STATUS)
+        return Response(
+            response_data,
+            status=status.HTTP_201_CREATED if response_data["success"] else status.HTTP_207_MULTI_STATUS
+        )
         
     def delete(self, request, product_id):
         # 1. Validación de imágenes a eliminar
@@ -174,4 +155,17 @@ class ProductImagesView(APIView):
             product = (Product.objects.only(*values).get(id=product_id))
             return product, None
         except Product.DoesNotExist:
-            return None, Response({"success": False, "detail": "No existe el producto."}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            return None, Response({"success": False, "detail": "No existe el producto."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ProductImagesJobView(APIView):
+    """
+    GET: state of an async image upload started with `ProductImagesView.post` (async=true).
+    """
+    permission_classes = [IsAdminOrSuperUser]
+
+    def get(self, request, job_id):
+        job = ProductImageUploadService.get_job(job_id)
+        if job is None:
+            return Response({"success": False, "detail": "No existe el job o ya expiró."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"success": True, "job_id": job_id, **job}, status=status.HTTP_200_OK)
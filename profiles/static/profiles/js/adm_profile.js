@@ -205,6 +205,9 @@ function ordersTabEvents(container, tabId) {
         }
 
         const params = new URLSearchParams(formData).toString();
+        
+        // filters are kept for the "load more" button (see tab_orders.js)
+        container.dataset.params = params;
         await getTabContentAJAX({ container, tabId, params, isPanel: false })
 
         // clean form after update
@@ -213,10 +216,10 @@ function ordersTabEvents(container, tabId) {
 
     /**
      * Handle changes in the status dropdown.
-     * When a select element named 'status' is changed, submit the form automatically.
+     * When the status select or a date input changes, submit the form automatically.
      */
     container.addEventListener('change', (e) => {
-        if (e.target.matches("select[name='status']")) {
+        if (e.target.matches("select[name='status'], input[type='date']")) {
             const form = e.target.closest('form');
             if (form) form.requestSubmit(); // Submit the form programmatically
         }
@@ -33,11 +33,24 @@ function renderOrderTabInit(isAdmin) {
                     </button>
                 </div>
                 <select class="w-min select-orders" name="status"></select>
+                <div class="d-flex align-center gap-1">
+                    <input type="date" name="date_from" title="Desde">
+                    <input type="date" name="date_to" title="Hasta">
+                </div>
             </form>
         `.trim() : '',
 
         // Add an empty container where the orders table will be rendered dynamically
-        /*html*/`<div class="d-grid cont-table-orders mt-2 bolder font-md"></div>`
+        /*html*/`<div class="d-grid cont-table-orders mt-2 bolder font-md"></div>`,
+
+        // Button to load the next page (keyset pagination, hidden when there is no next_cursor)
+        /*html*/`
+            <div class="d-flex justify-center mt-2">
+                <button class="btn btn-main btn-more-orders px-2 py-1 bolder font-md" type="button" hidden>
+                    Ver más pedidos
+                </button>
+            </div>
+        `.trim()
     ];
 
     // Create a temporary container element and insert the HTML string
@@ -71,12 +84,18 @@ function renderOrderTabInit(isAdmin) {
  *     - id: The order ID.
  *     - created_at: The creation date string of the order.
  *     - total: The total amount of the order.
- *     - status__name: The status name of the order.
+ *     - status_name: The status name of the order.
+ * @param {boolean} [append=false] - If true, rows are added after the existing ones (next page).
  */
-function renderOrderTable(container, orders) {
+function renderOrderTable(container, orders, append = false) {
     const hasOrders = (orders.length > 0);
     let tableRows = '';
 
+    if (append) {
+        container.insertAdjacentHTML('beforeend', renderOrderRows(orders));
+        return;
+    }
+
     if (hasOrders) {
         // Create table header
         tableRows += /*html*/`
@@ -88,24 +107,7 @@ function renderOrderTable(container, orders) {
         `.trim();
 
         // Create table rows for each order
-        const tableHtml = orders.map(ord => {
-            const order = deepEscape(ord); // Basic front-end sanitization
-            const url = window.TEMPLATE_URLS.orderDetail.replace('{order_id}', `${order.id}`);
-            const dateFormat = shortDate(`${order.created_at}`);
-            return /*html*/`
-                <a class="text-center row-order bold-main underline-anim" 
-                    href="${url}"># ${order.id}
-                </a>
-                <div class="text-start row-order bolder d-desktop-block">${dateFormat}</div>
-                <div class="text-center row-order bold-orange text-truncate">${order.status__name}</div>
-                <div class="text-center row-order bolder">$ ${order.total}</div>
-                <a class="text-start row-order bold-main underline-anim d-desktop-block" href="${url}">
-                    Ver Orden
-                </a>
-            `;
-        }).join('');
-
-        tableRows += tableHtml;
+        tableRows += renderOrderRows(orders);
     } else {
         // If no orders, show a friendly message with a link to browse products
         const url = window.TEMPLATE_URLS.productList;
@@ -125,6 +127,79 @@ function renderOrderTable(container, orders) {
     container.innerHTML = tableRows;
 }
 
+/**
+ * Builds the HTML rows (one per order) used by renderOrderTable.
+ *
+ * @param {Array<Object>} orders - Array of order objects (see renderOrderTable).
+ * @returns {string} HTML string with the rows.
+ */
+function renderOrderRows(orders) {
+    return orders.map(ord => {
+        const order = deepEscape(ord); // Basic front-end sanitization
+        const url = window.TEMPLATE_URLS.orderDetail.replace('{order_id}', `${order.id}`);
+        const dateFormat = shortDate(`${order.created_at}`);
+        return /*html*/`
+            <a class="text-center row-order bold-main underline-anim" 
+                href="${url}"># ${order.id}
+            </a>
+            <div class="text-start row-order bolder d-desktop-block">${dateFormat}</div>
+            <div class="text-center row-order bold-orange text-truncate">${order.status_name}</div>
+            <div class="text-center row-order bolder">$ ${order.total}</div>
+            <a class="text-start row-order bold-main underline-anim d-desktop-block" href="${url}">
+                Ver Orden
+            </a>
+        `;
+    }).join('');
+}
+
+
+/**
+ * Updates the "load more" button with the cursor of the next page.
+ * The button is hidden when the current page is the last one.
+ *
+ * @param {HTMLElement} container - The orders tab container.
+ * @param {string|null} nextCursor - Cursor returned by the server (data.next_cursor).
+ */
+function updateOrdersCursor(container, nextCursor) {
+    const btnMore = container.querySelector('.btn-more-orders');
+    if (!btnMore) return;
+
+    btnMore.dataset.cursor = nextCursor || '';
+    btnMore.hidden = !nextCursor;
+}
+
+
+/**
+ * Fetches the next page of orders using the stored cursor and appends the rows.
+ * Uses the same filters of the last request (container.dataset.params).
+ *
+ * @async
+ * @param {HTMLElement} container - The orders tab container.
+ * @param {HTMLButtonElement} btnMore - The "load more" button (holds the cursor).
+ */
+async function loadMoreOrders(container, btnMore) {
+    const params = new URLSearchParams(container.dataset.params || '');
+    params.set('cursor', btnMore.dataset.cursor);
+
+    const base_url = window.TEMPLATE_URLS.profileTabs.replace('{tab_name}', 'orders-tab');
+    btnMore.disabled = true;
+
+    try {
+        const response = await fetch(`${base_url}?${params.toString()}`);
+        const data = await response.json();
+
+        const containerTable = container.querySelector('.cont-table-orders');
+        if (containerTable) renderOrderTable(containerTable, data.orders || [], true);
+        updateOrdersCursor(container, data.next_cursor);
+
+    } catch (error) {
+        console.error('Error loading orders:', error);
+    } finally {
+        btnMore.disabled = false;
+    }
+}
+
+
 /**
  * Renders a <select> element's options based on a list of order statuses.
  * 
@@ -159,7 +234,8 @@ function renderOrderSelect(container, ordersStatus, statusId) {
  * @param {HTMLElement} container - The DOM element where the orders table will be inserted.
  * @param {Object} data - The data object containing orders and status information.
  *   Expected properties:
- *     - orders: Array of order objects to be rendered in the table.
+ *     - orders: Array of order objects to be rendered in the table (first page).
+ *     - next_cursor: Cursor of the next page or null.
  *     - is_admin: Boolean indicating if the current user is an admin (to show filters).
  *     - status_orders: Array of status objects used to populate the status filter select.
  *     - status_id: The currently selected status id (optional).
@@ -179,6 +255,13 @@ function createTabOrders(container, data) {
 
         container.appendChild(htmlToAppend); // Append the fragment to the container
         container._hasInit = true;
+        updateOrdersCursor(container, data.next_cursor);
+
+        // "load more" button (next page by cursor)
+        container.addEventListener('click', (e) => {
+            const btnMore = e.target.closest('.btn-more-orders');
+            if (btnMore && btnMore.dataset.cursor) loadMoreOrders(container, btnMore);
+        });
         return;
     }
 
@@ -190,5 +273,6 @@ function createTabOrders(container, data) {
         // if is null get 2, default
         renderOrderSelect(containerSelect, data.status_orders || [], data.status_id || 2); 
     }
+    updateOrdersCursor(container, data.next_cursor);
 }
 
@@ -8,23 +8,22 @@ from products.filters import VALUES_CARDS_LIST
 from products.utils import valid_id_or_None
 
 from home.models import Store
-from orders.models import Order, ItemOrder
 from orders.models import ShipmentMethod, PaymentMethod, StatusOrder
 from users.models import CustomUser
+from orders.services.orders import OrderService
+
+from core.utils.utils_basic import valid_date_or_None
 
 
 from products.serializers import ProductListSerializer
 
 
-def profile_tabs_user(user, tab_name):
+def profile_tabs_user(user, tab_name, cursor=None):
     if tab_name == 'orders-tab':
-        orders = (
-            Order.objects.filter(user=user)
-            .values('id', 'created_at', 'total', 'status__name')
-            .order_by('-updated_at')
-        )
+        page = OrderService.get_user_orders(user, cursor=cursor)
         return { 
-            'orders': list(orders),
+            'orders': page['orders'],
+            'next_cursor': page['next_cursor'],
             'is_admin': False
         }
     
@@ -61,9 +60,12 @@ def profile_tabs_admin(request, tab_name):
         Tab behaviors:
 
         1. 'orders-tab':
-            - Optionally filters orders by order ID or status ID from GET parameters.
+            - Optionally filters orders by order ID, status ID and creation date range
+              (`date_from` / `date_to` as YYYY-MM-DD) from GET parameters.
+            - Paginated by cursor (`cursor` GET parameter), see OrderService.get_admin_orders.
             - Returns:
-                - 'orders': list of orders (each order is a dict with id, created_at, total, status name).
+                - 'orders': one page of orders (each order is a dict with id, created_at, total, status_name).
+                - 'next_cursor': cursor for the next page (or None on the last page).
                 - 'status_orders': list of possible order statuses (id and name).
                 - 'status_id': currently selected status ID (or None).
                 - 'is_admin': always True, indicating admin privileges.
@@ -90,20 +92,23 @@ def profile_tabs_admin(request, tab_name):
         order_id = valid_id_or_None(request.GET.get('order_id', None))
         status_id = valid_id_or_None(request.GET.get('status', None))
         
-        orders = Order.objects.all()
-        if order_id:
-            orders = orders.filter(id=order_id)
-        if status_id and not order_id:
-            orders = orders.filter(status_id=status_id)
-            
-        # get a dict values for orders
-        orders = orders.values('id', 'created_at', 'total', 'status__name').order_by('-updated_at')
+        date_from = valid_date_or_None(request.GET.get('date_from'))
+        date_to = valid_date_or_None(request.GET.get('date_to'))
+        
+        page = OrderService.get_admin_orders(
+            order_id=order_id,
+            status_id=status_id,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=request.GET.get('cursor'),
+        )
 
         # get a dict values for status_orders
         status_orders = StatusOrder.objects.values('id', 'name').order_by('id')
         
         return { 
-            'orders': list(orders),    # convert a list to responseJson
+            'orders': page['orders'],
+            'next_cursor': page['next_cursor'],
             'status_orders': list(status_orders),
             'status_id': status_id,
             'is_admin': True 
@@ -147,4 +152,4 @@ def profile_tabs_admin(request, tab_name):
             'users': list(users),
             'choices': dict(CustomUser.ROLE_CHOICES),
             'choice': role,   # Para que tu <select> quede marcado
-        }
\ No newline at end of file
+        }
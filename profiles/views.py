@@ -32,7 +32,7 @@ def profile_tabs(request, tab_name):
         return JsonResponse({'detail': 'No estás registrado..'}, status=404)
     
     if user.role == 'buyer':
-        response = utils_tabs.profile_tabs_user(user, tab_name)
+        response = utils_tabs.profile_tabs_user(user, tab_name, cursor=request.GET.get('cursor'))
         if response:
             return JsonResponse(response, status=200)
     